@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Script to compare the time per frame using pcolormesh and the raster renderer"""
+
+import io
+import time
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+from plopm.utils.mapping import get_rectilinear_edges
+from plopm.utils.write_twod import draw_raster
+
+matplotlib.use("Agg")
+
+DPI = 300
+cmap = matplotlib.colormaps["jet"]
+
+print(f"{'cells':>12} {'pcolormesh [s]':>16} {'raster [s]':>12}")
+for size in [50, 100, 200, 400, 800, 1600]:
+    edges = np.linspace(0, 1000, size + 1)
+    doubled = np.repeat(edges, 2)[1:-1]
+    xc, yc = np.meshgrid(doubled, doubled)
+    quaa = np.full((2 * size - 1, 2 * size - 1), np.nan)
+    quaa[::2, ::2] = np.random.default_rng(7).random((size, size))
+    timings = []
+    for raster in [False, True]:
+        fig, axis = plt.subplots(1, 1)
+        tic = time.perf_counter()
+        if raster:
+            rectilinear = get_rectilinear_edges(xc, yc, 1e-6, 1e-6)
+            assert rectilinear is not None
+            draw_raster(axis, *rectilinear, quaa[::2, ::2], cmap)
+        else:
+            axis.pcolormesh(xc, yc, quaa, shading="flat", cmap=cmap)
+        fig.savefig(io.BytesIO(), format="png", dpi=DPI)
+        timings.append(time.perf_counter() - tic)
+        plt.close(fig)
+    print(f"{size * size:>12} {timings[0]:>16.3f} {timings[1]:>12.3f}")
@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""In-memory Python interface returning arrays and figures
+
+The readers of the deck are opened once per session and reused by the
+queries, e.g.::
+
+    from plopm.api import Session
+
+    session = Session("examples/SPE11B")
+    pressure = session.slice("pressure", restart=5, slide=",1,")
+    time, fgip = session.summary("FGIP")
+    figures = session.figures("-v", "sgas", "-r", "5")
+
+The options are the ones of the plopm executable, and the arrays are read
+from the OPM Flow output files without writing to disk.
+"""
+
+import argparse
+from dataclasses import replace
+
+import numpy as np
+from matplotlib.figure import Figure
+from numpy.typing import NDArray
+from opm.io.ecl import ESmry as OpmSummary
+
+from plopm.config.config import ConfigPlopm, ReadData
+from plopm.core.plopm import check_cmdargs, load_parser, make_outputs
+from plopm.utils.initialization import ini_cfg, ini_properties
+from plopm.utils.mapping import (
+    handle_slide_x,
+    handle_slide_y,
+    handle_slide_z,
+    map_xycoords,
+    map_xzcoords,
+    map_yzcoords,
+)
+from plopm.utils.readers import get_porv, get_quantity, get_readers
+
+
+class Session:
+    """Deck readers and parsed options shared by the queries"""
+
+    def __init__(self, deck: str, *options: str) -> None:
+        self.deck = deck
+        self.options = list(options)
+        self.configs: dict[tuple[str, ...], ConfigPlopm] = {}
+        self.reader: ReadData | None = None
+        self.smry: OpmSummary | None = None
+
+    def config(self, *options: str) -> ConfigPlopm:
+        """Parsed options, cached by the given values"""
+        key = tuple(self.options + list(options))
+        if key not in self.configs:
+            cfg = parse_options(self.deck, list(key))
+            ini_properties(cfg)
+            self.configs[key] = cfg
+        return self.configs[key]
+
+    def read(self) -> ReadData:
+        """Readers of the INIT, UNRST, and EGRID for all report steps"""
+        if self.reader is None:
+            cfg = self.config()
+            self.reader = get_readers(
+                self.deck, True, False, cfg.vrs, [-1], cfg.filter, 0, cfg.precision
+            )
+        return self.reader
+
+    def restarts(self) -> list[int]:
+        """Available report steps"""
+        return list(self.read().restart)
+
+    def times(self) -> NDArray:
+        """Simulation time of the report steps in days"""
+        return np.array(self.read().tnrst, dtype=float)
+
+    def values(self, var: str, restart: int = -1) -> NDArray:
+        """Variable for the active cells at the report step"""
+        read = self.read()
+        cfg = self.config("-v", var)
+        _, quan = get_quantity(
+            self.deck,
+            read,
+            var,
+            read.restart[restart] if restart < 0 else restart,
+            float(cfg.adjust[0]),
+            cfg.mass,
+            cfg.mass + cfg.xmass,
+            cfg.caprock,
+            cfg.stress,
+            False,
+            cfg.vmin[0],
+            cfg.vmax[0],
+            cfg.csvs[0],
+        )
+        return np.asarray(quan)
+
+    def slice(self, var: str, restart: int = -1, slide: str = ",1,") -> NDArray:
+        """Variable on the slide, indexed [k, i], [k, j], or [j, i]"""
+        read = self.read()
+        cfg = self.config("-v", var, "-s", slide)
+        quan = self.values(var, restart)
+        nrst = read.restart[restart] if restart < 0 else restart
+        read = replace(read, porv=get_porv(read, var, nrst, cfg.filter[0]))
+        if cfg.slide[0][0][0] != -2:
+            _, _, _, _, mx, my, _, _ = handle_slide_x(cfg, read, 0)
+            quaa = map_yzcoords(cfg, read, var, quan, 0, mx, my)
+        elif cfg.slide[0][1][0] != -2:
+            _, _, _, _, mx, my, _, _ = handle_slide_y(cfg, read, 0)
+            quaa = map_xzcoords(cfg, read, var, quan, 0, mx, my)
+        else:
+            _, _, _, _, mx, my, _, _ = handle_slide_z(cfg, read, 0)
+            return map_xycoords(cfg, read, var, quan, 0, mx, my).reshape(my, mx)[
+                ::2, ::2
+            ]
+        return np.flipud(quaa.reshape(my, mx)[::2, ::2])
+
+    def series(self, var: str, cell: tuple[int, int, int]) -> NDArray:
+        """Variable in the cell (i, j, k starting at 1) for all report steps"""
+        read = self.read()
+        i, j, k = cell
+        ind = (i - 1) + (j - 1) * read.nx + (k - 1) * read.nx * read.ny
+        if read.porv[ind] <= 0:
+            raise ValueError(f"The cell {cell} is not active.")
+        return np.array(
+            [self.values(var, nrst)[read.actind[ind]] for nrst in read.restart]
+        )
+
+    def summary(self, vector: str) -> tuple[NDArray, NDArray]:
+        """Time in days and values of the summary vector"""
+        if self.smry is None:
+            self.smry = OpmSummary(f"{self.deck}.SMSPEC")
+        return np.array(self.smry["TIME"]), np.array(self.smry[vector.upper()])
+
+    def figures(self, *options: str) -> list[Figure]:
+        """Figures of the plopm executable for the options, without saving them"""
+        cmdargs = parse_cmdargs(self.deck, self.options + list(options))
+        cfg = ini_cfg(cmdargs)
+        if not cfg.png:
+            raise ValueError("Only the png mode returns figures.")
+        cfg.figures = []
+        make_outputs(cfg, cmdargs)
+        return cfg.figures
+
+
+def parse_cmdargs(deck: str, options: list[str]) -> argparse.Namespace:
+    """Validated options of the plopm executable for the deck"""
+    cmdargs = load_parser(["-i", deck, *options])
+    check_cmdargs(cmdargs)
+    return cmdargs
+
+
+def parse_options(deck: str, options: list[str]) -> ConfigPlopm:
+    """Configuration for the deck and the options of the plopm executable"""
+    return ini_cfg(parse_cmdargs(deck, options))
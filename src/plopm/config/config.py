@@ -13,6 +13,18 @@ from opm.io.ecl import EGrid as OpmGrid
 from opm.io.ecl import ERst as OpmRestart
 
 
+@dataclass(slots=True)
+class PlanData:
+    """Merged nodes of the task graph of the maps, computed once per run"""
+
+    readers: dict = field(default_factory=dict)
+    grids: dict = field(default_factory=dict)
+    quantities: dict = field(default_factory=dict)
+    slides: dict = field(default_factory=dict)
+    tables: dict = field(default_factory=dict)
+    nbytes: int = 0
+
+
 @dataclass(slots=True)
 class ConfigPlopm:
     """Plopm dataclass"""
@@ -21,16 +33,24 @@ class ConfigPlopm:
     csv: bool = False
     png: bool = False
     vtk: bool = False
+    stats: bool = False
+    tensor: bool = False
+    similarity: bool = False
     scale: bool = False
     delax: bool = False
     printv: bool = False
     loop: bool = False
+    giflossy: int = 0
     step: bool = False
+    raster: bool = False
+    lod: bool = False
     global_: bool = False
     rst_range: bool = False
     sensor: bool = False
     layer: bool = False
     csvsummary: bool = False
+    incremental: bool = False
+    plan: bool = False
     discrete: bool = True
     size: float = 0.0
     maskthr: float = 0.0
@@ -40,12 +60,19 @@ class ConfigPlopm:
     yskl: float = 1.0
     ensemble: int = 0
     numc: int = 1
+    manifest: dict = field(default_factory=dict)
+    figures: list | None = None
+    graph: PlanData = field(default_factory=PlanData)
+    shard: list = field(default_factory=list)
+    partials: dict = field(default_factory=dict)
     clogthks: list = field(default_factory=list)
     namens: list = field(default_factory=list)
     names: list = field(default_factory=list)
     dual: list = field(default_factory=list)
     subfigs: list = field(default_factory=list)
     vrs: list = field(default_factory=list)
+    sweep: list = field(default_factory=list)
+    section: list = field(default_factory=list)
     filter: list = field(default_factory=list)
     title: list = field(default_factory=list)
     bounds: list = field(default_factory=list)
@@ -105,6 +132,14 @@ class ConfigPlopm:
     linestyle_default: list = field(default_factory=list)
     cbsfax: tuple[float, float, float, float] = (-1.0, -1.0, -1.0, -1.0)
     diff: str = ""
+    diffmode: str = ""
+    video: str = ""
+    binary: str = ""
+    vcodec: str = ""
+    crf: str = ""
+    optionshash: str = ""
+    regions: str = ""
+    precision: str = "float64"
     colors_raw: str = ""
     output: str = ""
     name: str = ""
@@ -122,6 +157,29 @@ class ConfigPlopm:
     yunit: str = ""
 
 
+@dataclass(slots=True)
+class SectionData:
+    """Cells crossed by the -section polyline, computed once per grid"""
+
+    xc: NDArray = field(default_factory=lambda: np.array([]))
+    yc: NDArray = field(default_factory=lambda: np.array([]))
+    cells: NDArray = field(default_factory=lambda: np.array([], dtype=int))
+    index: NDArray = field(default_factory=lambda: np.array([], dtype=int))
+    mx: int = 0
+    my: int = 0
+
+
+@dataclass(slots=True)
+class TableData:
+    """Saturation function tables of the INIT, decoded once per deck"""
+
+    swfn: list = field(default_factory=list)
+    sgfn: list = field(default_factory=list)
+    sofn: list = field(default_factory=list)
+    regions: list = field(default_factory=list)
+    imbibition: dict = field(default_factory=dict)
+
+
 @dataclass(slots=True)
 class ReadData:
     """Reading the OPM output files"""
@@ -142,3 +200,18 @@ class ReadData:
     nx: int = 0
     ny: int = 0
     nz: int = 0
+    dtype: type[np.floating] = np.float64
+    dates: dict = field(default_factory=dict)
+    section: SectionData | None = None
+
+
+@dataclass(slots=True)
+class DiffData:
+    """Reference deck for the differences, read one step at a time"""
+
+    read: ReadData = field(default_factory=ReadData)
+    steps: NDArray = field(default_factory=lambda: np.array([], dtype=int))
+    times: NDArray = field(default_factory=lambda: np.array([]))
+    slides: dict = field(default_factory=dict)
+    mx: int = 0
+    my: int = 0
@@ -9,28 +9,82 @@ import re
 import shlex
 import shutil
 import subprocess
+import sys
 from typing import NoReturn
 
+from plopm.config.config import ConfigPlopm
+from plopm.utils.follow import follow
 from plopm.utils.initialization import (
+    check_restarts,
     ini_cfg,
     ini_properties,
     ini_summary,
     is_summary,
 )
-from plopm.utils.write_oned import make_plots
-from plopm.utils.write_twod import make_maps
+from plopm.utils.planner import print_plan
+from plopm.utils.readers import STATS
+from plopm.utils.satfunc import SATFUNC
+from plopm.utils.shards import merge_shards, save_shard
+from plopm.utils.write_oned import make_plots, make_regions, make_stats
+from plopm.utils.write_similarity import METRICS, make_similarity
+from plopm.utils.write_tensor import make_tensors
+from plopm.utils.write_twod import make_maps, make_sweep
 from plopm.utils.write_vtk import make_vtks
 
 
 def main(argv: list[str] | None = None) -> None:
     """Main function for the plopm executable"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["merge"]:
+        print("\nExecuting plopm merge, please wait.")
+        cfg = merge_shards(argv[1:])
+        print(
+            "\nThe execution of plopm succeeded. "
+            + f"The generated files have been written to {cfg.output}\n"
+        )
+        return
     cmdargs = load_parser(argv)
     check_cmdargs(cmdargs)
-    cfg = ini_cfg(cmdargs)
     print("\nExecuting plopm, please wait.")
+    if cmdargs.follow:
+        interval, idle = (float(value) for value in cmdargs.follow.split(","))
+        if (
+            cmdargs.mode in ["png", "csv", "npz", "feather", "vtk"]
+            and cmdargs.vtkfile == "vtu"
+            and not cmdargs.subfigs
+        ):
+            cmdargs.incremental = "1"
+        cfg = ini_cfg(cmdargs)
+        follow(
+            lambda: write_outputs(cmdargs),
+            cfg.names[0] + ([cfg.diff] if cfg.diff else []),
+            interval,
+            idle,
+        )
+    else:
+        cfg = write_outputs(cmdargs)
+    print(
+        "\nThe execution of plopm succeeded. "
+        + f"The generated files have been written to {cfg.output}\n"
+    )
+
+
+def write_outputs(cmdargs: argparse.Namespace) -> ConfigPlopm:
+    """Read the decks and write the figures, csvs, or vtks"""
+    cfg = ini_cfg(cmdargs)
+    make_outputs(cfg, cmdargs)
+    return cfg
+
+
+def make_outputs(cfg: ConfigPlopm, cmdargs: argparse.Namespace) -> None:
+    """Dispatch to the output of the mode (kept in cfg.figures if it is a list)"""
     if cfg.vtk:
+        check_restarts(cfg)
         make_vtks(
             cmdargs.path,
+            cmdargs.vtkgrid,
+            cmdargs.vtkfile,
+            int(cmdargs.vtkparts),
             cfg.names,
             cfg.output,
             cfg.save,
@@ -46,7 +100,9 @@ def main(argv: list[str] | None = None) -> None:
             cfg.mass + cfg.xmass,
             cfg.caprock,
             cfg.stress,
-            cfg.filter,
+            cfg.incremental,
+            cfg.optionshash,
+            cfg.precision,
         )
     else:
         if shutil.which("latex") is None:
@@ -56,16 +112,29 @@ def main(argv: list[str] | None = None) -> None:
                 "following the instructions in the plopm's "
                 "documentation."
             )
-        if is_summary(cfg):
+        if cfg.stats:
+            make_stats(cfg)
+        elif cfg.tensor:
+            make_tensors(cfg)
+        elif cfg.similarity:
+            make_similarity(cfg)
+        elif cfg.regions:
+            make_regions(cfg)
+        elif is_summary(cfg):
             ini_summary(cfg)
-            make_plots(cfg)
+            if cfg.shard:
+                save_shard(cfg, cmdargs)
+            else:
+                make_plots(cfg)
         else:
+            check_restarts(cfg)
             ini_properties(cfg)
-            make_maps(cfg)
-    print(
-        "\nThe execution of plopm succeeded. "
-        + f"The generated files have been written to {cfg.output}\n"
-    )
+            if cfg.plan:
+                print_plan(cfg)
+            elif cfg.sweep:
+                make_sweep(cfg)
+            else:
+                make_maps(cfg)
 
 
 def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
@@ -92,7 +161,8 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         default="poro,permx,permz,porv,fipnum,satnum",
         help="Specify variable(s) to plot, including standard variables, special "
         "variables (grid, wells, faults), and expressions "
-        'e.g. "pressure - 0pressure"',
+        'e.g. "pressure - 0pressure"; a saturation function ending in * is '
+        'plotted for all regions, e.g. "krw*"',
     )
     parser.add_argument(
         "-o",
@@ -105,9 +175,24 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         "-m",
         "--mode",
         type=str.strip,
-        choices=["png", "gif", "csv", "vtk"],
+        choices=[
+            "png",
+            "gif",
+            "mp4",
+            "webm",
+            "csv",
+            "npz",
+            "feather",
+            "vtk",
+            "stats",
+            "tensor",
+            "similarity",
+        ],
         default="png",
-        help="Select output format",
+        help="Select output format ('npz' and 'feather' for the csv outputs as binary "
+        "columns, 'stats' for the per-restart statistics of the whole model, "
+        "'tensor' for the variables as (time, k, j, i) arrays, 'similarity' for "
+        "the pairwise rmse or correlation of the fields of the members)",
     )
     parser.add_argument(
         "-s",
@@ -115,7 +200,8 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         type=str.strip,
         default=",1,",
         help="Select slice or location using i,j,k format "
-        'e.g. "10,," (xz plane), ",,5:10" (range), "2,4,9" (cell over time)',
+        'e.g. "10,," (xz plane), ",,5:10" (range), "2,4,9" (cell over time), '
+        '",,1:200:1-each" (one map per plane)',
     )
     parser.add_argument(
         "-r",
@@ -508,6 +594,32 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         default="flow",
         help="Set path to flow executable",
     )
+    parser.add_argument(
+        "-vtkgrid",
+        "--vtkgrid",
+        type=str.strip,
+        default="egrid",
+        choices=["egrid", "flow"],
+        help="Build the vtk grid from the EGRID corner points or with an OPM Flow "
+        "dry run using -p ('egrid' by default)",
+    )
+    parser.add_argument(
+        "-vtkfile",
+        "--vtkfile",
+        type=str.strip,
+        default="vtu",
+        choices=["vtu", "vtkhdf"],
+        help="Write one .vtu per restart and a .pvd collection, or a single "
+        "transient .vtkhdf file with the geometry stored once ('vtu' by default)",
+    )
+    parser.add_argument(
+        "-vtkparts",
+        "--vtkparts",
+        type=str.strip,
+        default="1",
+        help="Split the vtu output in this number of spatially coherent pieces, "
+        "written in parallel and collected in a .pvtu per restart ('1' by default)",
+    )
     parser.add_argument(
         "-vtkformat",
         "--vtkformat",
@@ -529,6 +641,14 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         default="",
         help="Provide input file for difference computation",
     )
+    parser.add_argument(
+        "-diffmode",
+        "--diffmode",
+        default="nearest",
+        choices=["step", "nearest", "interp"],
+        help="Pair the steps of the inputs and the -diff reference by report step, "
+        "nearest simulation time, or linear interpolation in time ('nearest' by default)",
+    )
     parser.add_argument(
         "-ncolor",
         "--ncolor",
@@ -579,7 +699,23 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         "--interval",
         type=str.strip,
         default="1000",
-        help="Set GIF frame interval in milliseconds",
+        help="Set GIF, MP4, and WebM frame interval in milliseconds",
+    )
+    parser.add_argument(
+        "-vcodec",
+        "--vcodec",
+        type=str.strip,
+        default="",
+        help="ffmpeg video codec for '-m mp4' and '-m webm' ('libx264' and "
+        "'libvpx-vp9' by default)",
+    )
+    parser.add_argument(
+        "-crf",
+        "--crf",
+        type=str.strip,
+        default="",
+        help="ffmpeg constant rate factor for '-m mp4' and '-m webm', lower "
+        "values give better quality and larger files ('23' and '31' by default)",
     )
     parser.add_argument(
         "-loop",
@@ -588,6 +724,15 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         default="0",
         help="Enable infinite GIF looping",
     )
+    parser.add_argument(
+        "-giflossy",
+        "--giflossy",
+        type=str.strip,
+        default="0",
+        help="Keep the previous GIF color of the pixels that changed by at most "
+        "this value (0-255) in each RGB channel, giving smaller files ('0' by "
+        "default, lossless)",
+    )
     parser.add_argument(
         "-step",
         "--step",
@@ -596,6 +741,86 @@ def load_parser(argv: list[str] | None = None) -> argparse.Namespace:
         default="0",
         help="Use ax.step instead of ax.plot",
     )
+    parser.add_argument(
+        "-raster",
+        "--raster",
+        type=str.strip,
+        choices=["0", "1"],
+        default="1",
+        help="Draw rectilinear slides as images instead of using pcolormesh",
+    )
+    parser.add_argument(
+        "-lod",
+        "--lod",
+        type=str.strip,
+        choices=["0", "1"],
+        default="1",
+        help="Aggregate 2D slides with more cells than output pixels using -how",
+    )
+    parser.add_argument(
+        "-incremental",
+        "--incremental",
+        type=str.strip,
+        choices=["0", "1"],
+        default="0",
+        help="Write only the missing or stale per-restart outputs, tracked in "
+        "plopm-manifest.json in the output folder",
+    )
+    parser.add_argument(
+        "-precision",
+        "--precision",
+        type=str.strip,
+        choices=["float64", "float32"],
+        default="float64",
+        help="Floating point precision of the computed quantities; float32 "
+        "halves the memory of the cell arrays for large grids",
+    )
+    parser.add_argument(
+        "-regions",
+        "--regions",
+        type=str.strip,
+        default="",
+        help="Aggregate the variables per region of the given integer INIT array "
+        "(e.g. fipnum) over the restarts, plotting the '-how' statistic (sum, "
+        "mean, or pvmean) and writing all of them as csv",
+    )
+    parser.add_argument(
+        "-follow",
+        "--follow",
+        type=str.strip,
+        default="",
+        help="Keep updating the outputs while the simulation runs, polling the "
+        "size of the .UNRST and .UNSMRY every given seconds and exiting after "
+        'the given seconds without growth, e.g. "10,600"',
+    )
+    parser.add_argument(
+        "-plan",
+        "--plan",
+        type=str.strip,
+        choices=["0", "1"],
+        default="0",
+        help="Print the task graph of the maps (arrays, grids, quantities, "
+        "slides, colorbar ranges, and figures) and an estimate of the bytes to "
+        "read, without writing the figures",
+    )
+    parser.add_argument(
+        "-section",
+        "--section",
+        type=str.strip,
+        default="",
+        help="Vertical section along a polyline given by its x,y points, e.g., "
+        "'0,0 500,300 1200,300', instead of the '-s' slide",
+    )
+    parser.add_argument(
+        "-shard",
+        "--shard",
+        type=str.strip,
+        default="",
+        help="Read only every N-th member of the '-ensemble' starting in the "
+        "i-th one, e.g., '2/4', and write their partial statistics to a .npz "
+        "instead of the figure; 'plopm merge' combines the files of all shards "
+        "into the figure",
+    )
     return parser.parse_args(argv)
 
 
@@ -647,6 +872,7 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
     mode = cmdargs.mode
     vtk_mode = mode == "vtk"
     gif_mode = mode == "gif"
+    video_mode = mode in ["mp4", "webm"]
     number = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?"
     positive_integer = r"[1-9]\d*"
     non_negative_integer = r"\d+"
@@ -762,7 +988,20 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
                 )
 
     aggregation_methods = cmdargs.how
-    if aggregation_methods:
+    if aggregation_methods and mode == "stats":
+        method_entries = aggregation_methods.split(",")
+        if any(method not in STATS for method in method_entries):
+            fail(
+                f"Invalid value '-how {aggregation_methods}' for '-m stats', valid "
+                f"statistics are {', '.join(STATS)}."
+            )
+    elif aggregation_methods and mode == "similarity":
+        if aggregation_methods not in METRICS:
+            fail(
+                f"Invalid value '-how {aggregation_methods}' for '-m similarity', "
+                f"valid metrics are {', '.join(METRICS)}."
+            )
+    elif aggregation_methods:
         valid_aggregation_methods = [
             "min",
             "max",
@@ -781,11 +1020,53 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
                 f"{', '.join(valid_aggregation_methods)}."
             )
 
+    if cmdargs.regions:
+        if mode not in ["png", "csv"]:
+            fail(
+                f"Invalid option for '-m {mode}', '-regions' can only be used "
+                "with '-m png' or '-m csv'."
+            )
+        if cmdargs.how.split(",")[0] not in ["", "sum", "mean", "pvmean"]:
+            fail(
+                f"Invalid value '-how {cmdargs.how}' for '-regions', valid "
+                "methods are sum, mean, pvmean."
+            )
+
     slide = cmdargs.slide
     slides = slide.split()
     slide_entry_pattern = re.compile(
         rf"(?:{positive_integer}|" rf"{positive_integer}:{positive_integer}|:)?"
     )
+    if "-each" in slide:
+        sweep = re.fullmatch(
+            rf",*({positive_integer}):({positive_integer})"
+            rf"(?::{positive_integer})?-each,*",
+            slide,
+        )
+        if sweep is None or slide.count(",") != 2:
+            fail(
+                f"Invalid value '-s {slide}', expected a sweep of slides as one "
+                "'start:end[:step]-each' entry and two empty entries, e.g., "
+                "',,1:200:1-each'."
+            )
+        if int(sweep.group(1)) > int(sweep.group(2)):
+            fail(
+                f"Invalid value '-s {slide}', the end must not be smaller than "
+                "the start."
+            )
+        if (
+            mode not in ["png", "csv", "npz", "feather"]
+            or cmdargs.subfigs
+            or cmdargs.diff
+            or cmdargs.incremental == "1"
+            or cmdargs.follow
+        ):
+            fail(
+                f"Invalid option '-s {slide}', a sweep of slides can only be used "
+                "with '-m png' or the csv outputs, and not with '-subfigs', '-diff', "
+                "'-incremental', or '-follow'."
+            )
+        slides = [slide.replace(slide.strip(","), sweep.group(1))]
     if not slides:
         fail("Invalid value for '-s', the slide selection cannot be empty.")
 
@@ -1036,8 +1317,24 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
             f"formats are {', '.join(valid_vtk_formats)}."
         )
 
+    if not re.fullmatch(positive_integer, cmdargs.vtkparts):
+        fail(
+            f"Invalid value '-vtkparts {cmdargs.vtkparts}', expected a positive "
+            "integer."
+        )
+    if cmdargs.vtkparts != "1" and cmdargs.vtkfile != "vtu":
+        fail("Invalid option '-vtkparts', it can only be used with '-vtkfile vtu'.")
+    if cmdargs.vtkparts != "1" and cmdargs.vtkgrid == "flow":
+        fail(
+            "Invalid option '-vtkparts', the pieces are split from the .EGRID, "
+            "so it cannot be combined with '-vtkgrid flow'."
+        )
+
     vtk_options = {
         "-p": ("path", "flow"),
+        "-vtkgrid": ("vtkgrid", "egrid"),
+        "-vtkfile": ("vtkfile", "vtu"),
+        "-vtkparts": ("vtkparts", "1"),
         "-vtkformat": ("vtkformat", "Float64"),
         "-vtknames": ("vtknames", ""),
     }
@@ -1052,7 +1349,11 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
                 f"Invalid option for '-m {mode}', the following options can "
                 f"only be used with '-m vtk': {', '.join(invalid_options)}."
             )
-    else:
+    elif (
+        cmdargs.vtkgrid == "flow"
+        and cmdargs.vtkfile == "vtu"
+        and cmdargs.vtkparts == "1"
+    ):
         try:
             flow_arguments = shlex.split(cmdargs.path)
         except ValueError:
@@ -1077,11 +1378,132 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
                 "available or not working."
             )
 
+    if cmdargs.incremental == "1":
+        if mode not in ["png", "csv", "npz", "feather", "vtk"]:
+            fail(
+                f"Invalid option for '-m {mode}', '-incremental' can only be used "
+                "with '-m png', '-m csv', '-m npz', '-m feather', or '-m vtk'."
+            )
+        if cmdargs.vtkfile != "vtu" or cmdargs.subfigs:
+            fail(
+                "Invalid option '-incremental', it cannot be combined with "
+                "'-vtkfile vtkhdf' or '-subfigs'."
+            )
+
+    if cmdargs.follow:
+        interval, idle = parse_number_list("-follow", cmdargs.follow, 2)
+        if interval <= 0 or idle < 0:
+            fail(
+                f"Invalid value '-follow {cmdargs.follow}', expected a positive "
+                "poll interval and a non-negative idle time in seconds."
+            )
+
+    if cmdargs.plan == "1" and (
+        mode in ["vtk", "stats", "tensor", "similarity"]
+        or cmdargs.regions
+        or cmdargs.follow
+    ):
+        fail(
+            "Invalid option '-plan', it can only be used for the 2D maps, not "
+            "with '-m vtk', '-m stats', '-m tensor', '-m similarity', '-regions', "
+            "or '-follow'."
+        )
+
+    if cmdargs.section:
+        point = rf"{number},{number}"
+        if not re.fullmatch(rf"{point}(?:\s+{point})+", cmdargs.section):
+            fail(
+                f"Invalid value '-section {cmdargs.section}', expected at least "
+                "two x,y points separated by spaces, e.g., '0,0 500,300'."
+            )
+        if (
+            mode in ["vtk", "stats", "tensor", "similarity"]
+            or cmdargs.regions
+            or cmdargs.csv
+        ):
+            fail(
+                "Invalid option '-section', it cannot be combined with '-m vtk', "
+                "'-m stats', '-m tensor', '-m similarity', '-regions', or '-csv'."
+            )
+        if "-each" in slide or {"wells", "faults"} & set(cmdargs.variable.split(",")):
+            fail(
+                "Invalid option '-section', it cannot be combined with the "
+                "'-each' slides or the wells and faults."
+            )
+
+    regions = [
+        name
+        for name in cmdargs.variable.lower().split(",")
+        if (match := SATFUNC.match(name)) and match.group(2) == "*"
+    ]
+    if regions and (
+        len(cmdargs.input.split()) > 1
+        or cmdargs.input[-1] in [".", "/"]
+        or cmdargs.ensemble != "0"
+    ):
+        fail(
+            f"Invalid variable '{regions[0]}', the saturation functions of all "
+            "regions can only be plotted for one deck, not for several decks, "
+            "folders, or '-ensemble'."
+        )
+
+    if cmdargs.shard:
+        shard = re.fullmatch(r"(\d+)/(\d+)", cmdargs.shard)
+        if not shard or not 1 <= int(shard.group(1)) <= int(shard.group(2)):
+            fail(
+                f"Invalid value '-shard {cmdargs.shard}', expected the shard i "
+                "and number of shards N as i/N with 1 <= i <= N, e.g., '2/4'."
+            )
+        if (
+            cmdargs.ensemble == "0"
+            or mode != "png"
+            or cmdargs.subfigs
+            or cmdargs.follow
+        ):
+            fail(
+                "Invalid combination, '-shard' requires '-ensemble' with "
+                "'-m png', and it cannot be combined with '-subfigs' or '-follow'."
+            )
+
+    if mode in ["stats", "tensor", "similarity"] and cmdargs.diff:
+        fail(f"Invalid option '-diff', it cannot be combined with '-m {mode}'.")
+
+    if mode == "similarity" and re.search(r"[,:]", cmdargs.restart):
+        fail(
+            f"Invalid value '-r {cmdargs.restart}' for '-m similarity', the "
+            "fields of the members are compared at one restart."
+        )
+
+    if video_mode:
+        if shutil.which("ffmpeg") is None:
+            fail(f"'-m {mode}' requires ffmpeg, which is not available.")
+        if cmdargs.crf and not re.fullmatch(non_negative_integer, cmdargs.crf):
+            fail(
+                f"Invalid value '-crf {cmdargs.crf}', expected a non-negative "
+                "integer."
+            )
+    elif cmdargs.vcodec or cmdargs.crf:
+        fail(
+            f"Invalid option for '-m {mode}', '-vcodec' and '-crf' can only be "
+            "used with '-m mp4' or '-m webm'."
+        )
+
+    if not re.fullmatch(non_negative_integer, cmdargs.giflossy) or (
+        int(cmdargs.giflossy) > 255
+    ):
+        fail(
+            f"Invalid value '-giflossy {cmdargs.giflossy}', expected an integer "
+            "between 0 and 255."
+        )
+
     if not gif_mode:
         gif_options = {
             "-interval": ("interval", "1000"),
             "-loop": ("loop", "0"),
+            "-giflossy": ("giflossy", "0"),
         }
+        if video_mode:
+            del gif_options["-interval"]
         invalid_options = [
             option
             for option, (name, default) in gif_options.items()
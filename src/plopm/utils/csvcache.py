@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utility methods to read the columns of the csv files, parsing each one once
+
+The parsed columns are kept in a binary sidecar next to the csv, which is
+valid while the modification time and size of the csv do not change."""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from plopm.utils.metadata import file_state
+from plopm.utils.planner import WORKERS
+
+SIDECAR = "plopm.npz"
+
+
+def parse_columns(fname: str, columns: list[int]) -> dict[int, NDArray]:
+    """Columns of the csv, using genfromtxt only if there are empty fields"""
+    try:
+        values = np.loadtxt(fname, delimiter=",", skiprows=1, usecols=columns, ndmin=2)
+    except ValueError:
+        values = np.genfromtxt(
+            fname, delimiter=",", skip_header=1, usecols=columns
+        ).reshape(-1, len(columns))
+    return {col: values[:, j] for j, col in enumerate(columns)}
+
+
+def open_sidecar(fname: str, values: bool) -> dict[int, NDArray | None]:
+    """Columns in the sidecar of the csv if it is still valid, with their values
+    only if requested"""
+    cache = f"{fname}.{SIDECAR}"
+    if not os.path.isfile(cache):
+        return {}
+    try:
+        with np.load(cache) as data:
+            if not np.array_equal(data["state"], file_state(fname)):
+                return {}
+            return {
+                int(key[1:]): data[key] if values else None
+                for key in data.files
+                if key != "state"
+            }
+    except OSError:
+        return {}
+    except ValueError:
+        return {}
+    except KeyError:
+        return {}
+
+
+def read_sidecar(fname: str) -> dict[int, NDArray]:
+    """Columns in the sidecar of the csv if it is still valid"""
+    return {
+        col: values
+        for col, values in open_sidecar(fname, True).items()
+        if values is not None
+    }
+
+
+def sidecar_columns(fname: str) -> set[int]:
+    """Columns in the sidecar of the csv if it is still valid, without reading them"""
+    return set(open_sidecar(fname, False))
+
+
+def load_columns(fname: str, columns: list[int]) -> NDArray:
+    """Columns (zero based) of the csv, parsing only the ones not in the sidecar"""
+    stored = read_sidecar(fname)
+    missing = [col for col in dict.fromkeys(columns) if col not in stored]
+    if missing:
+        stored.update(parse_columns(fname, missing))
+        temp = f"{fname}.{os.getpid()}.{threading.get_ident()}.{SIDECAR}"
+        try:
+            arrays: dict[str, Any] = {
+                f"c{col}": values for col, values in stored.items()
+            }
+            np.savez(temp, state=np.array(file_state(fname)), **arrays)
+            os.replace(temp, f"{fname}.{SIDECAR}")
+        except OSError:
+            # e.g., read-only folders, the csv is then parsed each time
+            pass
+    return np.column_stack([stored[col] for col in columns])
+
+
+def cache_columns(fname: str, columns: list[int]) -> None:
+    """Write the sidecar of the csv, without sending the columns back"""
+    load_columns(fname, columns)
+
+
+def preload_columns(fnames: list[str], columns: list[int]) -> None:
+    """Parse the csv files without a valid sidecar in parallel processes"""
+    pending = [
+        fname
+        for fname in dict.fromkeys(fnames)
+        if os.path.isfile(fname) and not set(columns) <= sidecar_columns(fname)
+    ]
+    workers = min(WORKERS, len(pending))
+    if workers < 2:
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        list(executor.map(cache_columns, pending, [columns] * len(pending)))
@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utility methods to follow running simulations"""
+
+import os
+import time
+from collections.abc import Callable
+
+
+def deck_sizes(names: list[str]) -> dict:
+    """Size of the restart and summary files that grow during the simulation"""
+    sizes = {}
+    for name in names:
+        for ext in ["UNRST", "UNSMRY"]:
+            if os.path.isfile(f"{name}.{ext}"):
+                sizes[f"{name}.{ext}"] = os.path.getsize(f"{name}.{ext}")
+    return sizes
+
+
+def follow(
+    update: Callable[[], object], names: list[str], interval: float, idle: float
+) -> None:
+    """Run update each time the files grow, until idle seconds without growth"""
+    written: dict = {}
+    previous = deck_sizes(names)
+    last = time.monotonic()
+    while True:
+        current = deck_sizes(names)
+        if current != previous:
+            last = time.monotonic()
+        elif current != written:
+            # The files did not change during the last interval, so the last
+            # report step is completely written
+            update()
+            written = current
+            print(f"\nUpdated the outputs at {time.strftime('%H:%M:%S')}.")
+        elif time.monotonic() - last >= idle:
+            return
+        previous = current
+        time.sleep(interval)
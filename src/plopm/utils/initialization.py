@@ -13,10 +13,12 @@ from typing import cast
 
 import matplotlib
 import matplotlib.pyplot as plt
-from opm.io.ecl import EclFile as OpmFile
 from opm.io.ecl import ESmry as OpmSummary
 
 from plopm.config.config import ConfigPlopm
+from plopm.utils.manifest import options_hash
+from plopm.utils.metadata import load_metadata
+from plopm.utils.satfunc import SATFUNC, expand_regions
 
 
 def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
@@ -49,10 +51,42 @@ def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
     names = [var.split(" ") for var in names]
     cfg.namens = names
 
-    for name in ["gif", "csv", "png", "vtk"]:
+    for name in [
+        "gif",
+        "csv",
+        "png",
+        "vtk",
+        "stats",
+        "tensor",
+        "similarity",
+    ]:
         setattr(cfg, name, cmdargs.mode == name)
 
+    if cmdargs.mode in ["mp4", "webm"]:
+        cfg.gif = True
+        cfg.video = cmdargs.mode
+        cfg.vcodec = cmdargs.vcodec
+        cfg.crf = cmdargs.crf
+
+    if cmdargs.mode in ["npz", "feather"]:
+        cfg.csv = True
+        cfg.binary = cmdargs.mode
+
     cfg.diff = cmdargs.diff
+    cfg.diffmode = cmdargs.diffmode
+    cfg.incremental = cmdargs.incremental == "1"
+    cfg.plan = cmdargs.plan == "1"
+    cfg.shard = (
+        [int(value) for value in cmdargs.shard.split("/")] if cmdargs.shard else []
+    )
+    cfg.section = [
+        [float(value) for value in point.split(",")]
+        for point in cmdargs.section.split()
+    ]
+    cfg.regions = cmdargs.regions.lower()
+    cfg.giflossy = int(cmdargs.giflossy)
+    cfg.precision = cmdargs.precision
+    cfg.optionshash = options_hash(cmdargs)
     cfg.ensemble = int(cmdargs.ensemble)
 
     if cfg.diff:
@@ -73,7 +107,8 @@ def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
 
     cfg.names = names
     cfg.name = names[0][0]
-    cfg.vrs = cmdargs.variable.lower().split(",")
+    variables = cmdargs.variable.lower().split(",")
+    cfg.vrs = expand_regions(cfg, variables)
     handle_blocks(cfg)
     cfg.stress = float(cmdargs.stress)
 
@@ -176,10 +211,13 @@ def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
     cfg.fc = cmdargs.facecolor
     cfg.labels = cmdargs.labels.split("   ")
     cfg.labels = [var.split("  ") for var in cfg.labels]
+    if not cfg.labels[0][0] and cfg.vrs != variables:
+        # the saturation functions of all regions are told apart by the table
+        cfg.labels = [cfg.vrs]
     cfg.rm = [int(val) for val in cmdargs.remove.split(",")]
     cfg.global_ = int(cmdargs.global_) == 1
 
-    for name in ["scale", "delax", "loop", "printv", "step"]:
+    for name in ["scale", "delax", "loop", "printv", "step", "raster", "lod"]:
         setattr(cfg, name, int(getattr(cmdargs, name)) == 1)
 
     for name in [
@@ -249,6 +287,15 @@ def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
         )
 
     cfg.slide = cmdargs.slide.split(" ")
+    if "-each" in cmdargs.slide:
+        entries = cmdargs.slide.split(",")
+        axis = [bool(entry) for entry in entries].index(True)
+        start, end, *step = (int(val) for val in entries[axis][:-5].split(":"))
+        cfg.sweep = [
+            (axis, index) for index in range(start, end + 1, step[0] if step else 1)
+        ]
+        entries[axis] = str(start)
+        cfg.slide = [",".join(entries)]
     cfg.slide = [
         [val if val else [-2, -2] for val in var.split(",")] for var in cfg.slide
     ]
@@ -347,8 +394,8 @@ def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
     if len(cfg.bounds) < len(cfg.vrs):
         cfg.bounds = [cfg.bounds[0]] * len(cfg.vrs)
 
-    if cfg.diff and len(cfg.rotate) < 2:
-        cfg.rotate = [cfg.rotate[0]] * 2
+    if cfg.diff and len(cfg.rotate) < max(2, len(cfg.names[0])):
+        cfg.rotate = [cfg.rotate[0]] * max(2, len(cfg.names[0]))
     elif len(cfg.rotate) < len(cfg.names[0]):
         cfg.rotate = [cfg.rotate[0]] * len(cfg.names[0])
 
@@ -394,8 +441,8 @@ def ini_cfg(cmdargs: argparse.Namespace) -> ConfigPlopm:
         cfg.save = [cmdargs.save]
 
     if cfg.diff:
-        cfg.how = [cfg.how[0]] * 2
-        cfg.filter = [cfg.filter[0]] * 2
+        cfg.how = [cfg.how[0]] * max(2, len(cfg.names[0]))
+        cfg.filter = [cfg.filter[0]] * max(2, len(cfg.names[0]))
 
     for val in [
         "xformat",
@@ -546,41 +593,35 @@ def is_summary(cfg: ConfigPlopm) -> bool:
     name = cfg.name
     vrs = cfg.vrs
     first_var = vrs[0] if vrs else ""
-    ntot = 0
     if cfg.printv:
-        for ext, what in (("init", "init"), ("unrst", "restart")):
-            file = f"{name}.{ext.upper()}"
-            if os.path.isfile(file):
-                reader = OpmFile(file)
+        meta = load_metadata(name)
+        for ext, what in (("INIT", "init"), ("UNRST", "restart")):
+            if ext in meta:
                 keys = [
-                    var[0]
-                    for var in reader.arrays
-                    if var[0]
-                    not in ["INTEHEAD", "LOGIHEAD", "DOUBHEAD", "TABDIMS", "TAB"]
+                    key
+                    for key in meta[ext]["arrays"]
+                    if key not in ["INTEHEAD", "LOGIHEAD", "DOUBHEAD", "TABDIMS", "TAB"]
                 ]
-                if ext == "unrst":
-                    ntot = reader.count("PRESSURE")
                 print(f"The {what} available variables for {name} are:")
                 print(keys)
-                if ext == "unrst":
+                if ext == "UNRST":
                     print(f"The available restarts for {name} are:")
-                    print(list(range(ntot)))
+                    print(meta[ext]["steps"])
     if cfg.sensor or cfg.layer or cfg.distance[0] or cfg.histogram[0] or cfg.csvsummary:
         return True
     if (
-        first_var[:3] in ["krw", "krg"]
-        or first_var[:4] in ["krow", "krog", "pcow", "pcog", "pcwg"]
+        SATFUNC.match(first_var)
         or first_var[:6] == "pcfact"
         or first_var[:8] == "permfact"
     ):
         return True
     smspec_file = f"{name}.SMSPEC"
     if os.path.isfile(smspec_file):
-        summary = OpmSummary(smspec_file).keys()
         if cfg.printv:
             print(f"The summary available variables for {name} are:")
-            print(summary)
+            print(load_metadata(name)["SMSPEC"]["keys"])
             sys.exit(0)
+        summary = OpmSummary(smspec_file).keys()
         smass = cfg.smass
         for name_v in vrs:
             base = name_v.split(" ")[0].upper()
@@ -591,6 +632,22 @@ def is_summary(cfg: ConfigPlopm) -> bool:
     return False
 
 
+def check_restarts(cfg: ConfigPlopm) -> None:
+    """Exit if a selected restart is not in the .UNRST of the decks"""
+    if cfg.restart[0] == -1:
+        return
+    for deck in cfg.names[0]:
+        if os.path.isfile(f"{deck}.UNRST"):
+            steps = load_metadata(deck)["UNRST"]["steps"]
+            missing = sorted(set(cfg.restart) - set(steps))
+            if missing:
+                print(
+                    f"Invalid restart(s) {missing} for {deck}, the available "
+                    f"restarts are {steps}."
+                )
+                sys.exit()
+
+
 def ini_summary(cfg: ConfigPlopm) -> None:
     """Initialize the needed objects for the summary plots"""
     vrs = cfg.vrs
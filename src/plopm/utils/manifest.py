@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utility methods to skip the outputs whose inputs have not changed"""
+
+import argparse
+import hashlib
+import json
+import os
+import zlib
+
+MANIFEST = "plopm-manifest.json"
+# Bytes of the restart file compared to detect a rewritten (not appended) file
+WINDOW = 65536
+
+
+def options_hash(cmdargs: argparse.Namespace) -> str:
+    """Hash of the command options that change the content of the outputs"""
+    options = {
+        key: value
+        for key, value in vars(cmdargs).items()
+        if key not in ("restart", "incremental", "follow")
+    }
+    return hashlib.sha1(json.dumps(options, sort_keys=True).encode("utf8")).hexdigest()
+
+
+def window_crc(fname: str, end: int) -> int:
+    """Checksum of the bytes of the file before the given position"""
+    with open(fname, "rb") as file:
+        file.seek(max(0, end - WINDOW))
+        return zlib.crc32(file.read(end - max(0, end - WINDOW)))
+
+
+def deck_state(case: str, restart: int | None = None) -> dict:
+    """Modification time and size of the deck files
+
+    The csv inputs (-csv) are included, with PLOPM in the name replaced by the
+    restart number for the files written per restart."""
+    files = {ext: f"{case}.{ext}" for ext in ["INIT", "EGRID", "UNRST", "csv"]}
+    if not os.path.isfile(files["csv"]) and restart is not None:
+        files["csv"] = f"{case.replace('PLOPM', str(restart))}.csv"
+    state = {}
+    for ext, fname in files.items():
+        if os.path.isfile(fname):
+            stat = os.stat(fname)
+            state[ext] = [stat.st_mtime_ns, stat.st_size]
+    if "UNRST" in state:
+        state["UNRST"].append(window_crc(f"{case}.UNRST", state["UNRST"][1]))
+    return state
+
+
+def same_deck(old: dict, new: dict, case: str) -> bool:
+    """The unified restart may only have grown since the output was written"""
+    if old.keys() != new.keys():
+        return False
+    for ext, values in old.items():
+        if ext == "UNRST":
+            if values[1] > new[ext][1]:
+                return False
+            if values[1] < new[ext][1]:
+                if window_crc(f"{case}.UNRST", values[1]) != values[2]:
+                    return False
+            elif values != new[ext]:
+                return False
+        elif values != new[ext]:
+            return False
+    return True
+
+
+def load_manifest(output: str) -> dict:
+    """Read the manifest of the output folder"""
+    if not os.path.isfile(f"{output}/{MANIFEST}"):
+        return {}
+    with open(f"{output}/{MANIFEST}", encoding="utf8") as file:
+        return json.load(file)
+
+
+def save_manifest(output: str, manifest: dict) -> None:
+    """Write the manifest of the output folder"""
+    with open(f"{output}/{MANIFEST}", "w", encoding="utf8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+
+
+def make_entry(cases: list[str], options: str, **inputs) -> dict:
+    """Inputs that produced an output file"""
+    return {
+        "decks": {case: deck_state(case, inputs.get("restart")) for case in cases},
+        "options": options,
+        **inputs,
+    }
+
+
+def is_current(manifest: dict, fname: str, entry: dict) -> bool:
+    """The output exists and was written from the same inputs"""
+    old = manifest.get(os.path.basename(fname))
+    if not old or not os.path.isfile(fname):
+        return False
+    if {key: val for key, val in old.items() if key != "decks"} != {
+        key: val for key, val in entry.items() if key != "decks"
+    } or old["decks"].keys() != entry["decks"].keys():
+        return False
+    return all(
+        same_deck(old["decks"][case], state, case)
+        for case, state in entry["decks"].items()
+    )
+
+
+def record(manifest: dict, fname: str, entry: dict) -> None:
+    """Store the inputs of the written output"""
+    manifest[os.path.basename(fname)] = entry
@@ -4,11 +4,19 @@
 
 """Utility function for the grid and locations in the geological models"""
 
+import math
+import warnings
+
 import numpy as np
 from numpy.typing import NDArray
 
 from plopm.config.config import ConfigPlopm, ReadData
-from plopm.utils.readers import get_xycoords, get_xzcoords, get_yzcoords
+from plopm.utils.readers import (
+    get_xycoords,
+    get_xzcoords,
+    get_yzcoords,
+    resolve_slide,
+)
 
 
 def handle_slide_x(
@@ -18,7 +26,6 @@ def handle_slide_x(
     slide_range = cfg.slide[n][0]
     nx = read.nx
     if slide_range[0] == ":":
-        cfg.slide[n][0] = [0, nx]
         slidet = f", slide i=0:{nx}"
         sliden = f"0:{nx},j,k"
     elif slide_range[0] == slide_range[1] - 1:
@@ -45,7 +52,6 @@ def handle_slide_y(
     slide_range = cfg.slide[n][1]
     ny = read.ny
     if slide_range[0] == ":":
-        cfg.slide[n][1] = [0, ny]
         slidet = f", slide j=0:{ny}"
         sliden = f"i,0:{ny},k"
     elif slide_range[0] == slide_range[1] - 1:
@@ -72,7 +78,6 @@ def handle_slide_z(
     slide_range = cfg.slide[n][2]
     nz = read.nz
     if slide_range[0] == ":":
-        cfg.slide[n][2] = [0, nz]
         slidet = f", slide k={1}:{nz}"
         sliden = f"i,j,{1}:{nz}"
     elif slide_range[0] == slide_range[1] - 1:
@@ -92,6 +97,44 @@ def handle_slide_z(
     return xc, yc, slidet, sliden, mx, my, xname, yname
 
 
+def handle_section(
+    read: ReadData,
+) -> tuple[NDArray, NDArray, str, str, int, int, str, str]:
+    """Processing the -section polyline to obtain the grid properties"""
+    section = read.section
+    assert section is not None
+    return (
+        section.xc,
+        section.yc,
+        ", section",
+        "section",
+        section.mx,
+        section.my,
+        "distance",
+        "z",
+    )
+
+
+def map_section(read: ReadData, var: str, quan: NDArray) -> NDArray:
+    """Gather the properties of the cells crossed by the -section polyline"""
+    section = read.section
+    assert section is not None
+    mapped_values = np.full(section.mx * section.my, np.nan)
+    cells = section.cells[read.porv[section.cells] > 0]
+    if var == "grid":
+        values = np.ones(cells.size)
+    elif var == "index_i":
+        values = cells % read.nx + 1
+    elif var == "index_j":
+        values = cells // read.nx % read.ny + 1
+    elif var == "index_k":
+        values = cells // (read.nx * read.ny) + 1
+    else:
+        values = np.asarray(quan)[read.actind[cells]]
+    mapped_values[section.index[read.porv[section.cells] > 0]] = values
+    return mapped_values
+
+
 def rotate_grid(
     cfg: ConfigPlopm, n: int, xc: NDArray, yc: NDArray
 ) -> tuple[NDArray, NDArray]:
@@ -130,7 +173,7 @@ def map_xzcoords(
     nx = read.nx
     ny = read.ny
     nz = read.nz
-    slide_start, slide_end = cfg.slide[n][1]
+    slide_start, slide_end = resolve_slide(cfg.slide[n], read)[1]
     layer_size = nx * ny
     porv = read.porv
     actind_array = read.actind
@@ -289,7 +332,7 @@ def map_yzcoords(
     nx = read.nx
     ny = read.ny
     nz = read.nz
-    slide_start, slide_end = cfg.slide[n][0]
+    slide_start, slide_end = resolve_slide(cfg.slide[n], read)[0]
     layer_size = nx * ny
     porv = read.porv
     actind_array = read.actind
@@ -450,7 +493,7 @@ def map_xycoords(
     ny_total = read.ny
     dual = cfg.dual[n] == "1" if n < len(cfg.dual) else False
     ny = int((ny_total - 1) / 2) if dual else ny_total
-    slide_start, slide_end = cfg.slide[n][2]
+    slide_start, slide_end = resolve_slide(cfg.slide[n], read)[2]
     layer_size = nx * ny_total
     porv = read.porv
     actind_array = read.actind
@@ -648,3 +691,100 @@ def map_xycoords(
     if dual and cfg.diff:
         mapped_values = mapped_values[: (2 * nx - 1) * (2 * ny - 1)]
     return mapped_values
+
+
+def get_rectilinear_edges(
+    xc: NDArray, yc: NDArray, xtol: float, ytol: float
+) -> tuple[NDArray, NDArray] | None:
+    """Return the cell edges if the 2D slide mesh is (near) rectilinear"""
+    if xc.ndim != 2 or xc.shape != yc.shape or min(xc.shape) < 2:
+        return None
+    xmean = xc.mean(axis=0)
+    ymean = yc.mean(axis=1)
+    deviations = [
+        (np.max(np.abs(xc - xmean)), xtol),
+        (np.max(np.abs(yc - ymean[:, None])), ytol),
+        (np.max(np.abs(xmean[1:-1:2] - xmean[2::2]), initial=0), xtol),
+        (np.max(np.abs(ymean[1:-1:2] - ymean[2::2]), initial=0), ytol),
+    ]
+    if any(deviation > tol for deviation, tol in deviations):
+        return None
+    xedges = np.append(xmean[::2], xmean[-1])
+    yedges = np.append(ymean[::2], ymean[-1])
+    if np.any(np.diff(xedges) * (xedges[-1] - xedges[0]) < 0) or np.any(
+        np.diff(yedges) * (yedges[-1] - yedges[0]) < 0
+    ):
+        return None
+    return xedges, yedges
+
+
+def decimate_slide(
+    cfg: ConfigPlopm,
+    var: str,
+    quaa: NDArray,
+    xc: NDArray,
+    yc: NDArray,
+    mx: int,
+    my: int,
+    n: int,
+    use_csv: bool = False,
+) -> tuple[NDArray, NDArray, NDArray, int, int]:
+    """Aggregate the 2D slide to the number of pixels in the output figure"""
+    ncols, nrows = (mx, my) if use_csv else ((mx + 1) // 2, (my + 1) // 2)
+    columns, rows = (
+        (int(cfg.subfigs[1]), int(cfg.subfigs[0])) if cfg.subfigs[0] else (1, 1)
+    )
+    npx = float(cfg.dimensions[0]) * int(cfg.dpi[0]) / columns
+    npy = float(cfg.dimensions[1]) * int(cfg.dpi[0]) / rows
+    fx = max(1, math.ceil(ncols / npx))
+    fy = max(1, math.ceil(nrows / npy))
+    if fx == 1 and fy == 1:
+        return quaa, xc, yc, mx, my
+    # The pixels show cell values (also for extensive quantities and -how sum),
+    # so the colorbar range of the full resolution slide still applies
+    how = cfg.how[n]
+    if not how and (("num" in var and cfg.discrete) or var.startswith("index_")):
+        how = "first"
+    values = quaa.reshape(my, mx) if use_csv else quaa.reshape(my, mx)[::2, ::2]
+    ncoa, nroa = math.ceil(ncols / fx), math.ceil(nrows / fy)
+    padded = np.full((nroa * fy, ncoa * fx), np.nan)
+    padded[:nrows, :ncols] = values
+    blocks = padded.reshape(nroa, fy, ncoa, fx).swapaxes(1, 2).reshape(nroa, ncoa, -1)
+    valid = ~np.isnan(blocks)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="All-NaN slice encountered")
+        warnings.filterwarnings("ignore", message="Mean of empty slice")
+        if how == "min":
+            coarse = np.nanmin(blocks, axis=2)
+        elif how == "max":
+            coarse = np.nanmax(blocks, axis=2)
+        elif how in ["first", "last"]:
+            if how == "last":
+                blocks, valid = blocks[:, :, ::-1], valid[:, :, ::-1]
+            coarse = np.take_along_axis(
+                blocks, np.argmax(valid, axis=2)[:, :, None], axis=2
+            )[:, :, 0]
+        elif how == "harmonic":
+            with np.errstate(divide="ignore"):
+                coarse = 1.0 / np.nanmean(1.0 / blocks, axis=2)
+        else:
+            coarse = np.nanmean(blocks, axis=2)
+    if use_csv:
+        xedges = np.append(np.ravel(xc)[:-1:fx], np.ravel(xc)[-1])
+        yedges = np.append(np.ravel(yc)[:-1:fy], np.ravel(yc)[-1])
+        return coarse.ravel(), xedges[None, :], yedges[:, None], ncoa, nroa
+    cols = np.empty(2 * ncoa, dtype=int)
+    cols[::2] = 2 * np.arange(0, ncols, fx)
+    cols[1::2] = 2 * np.minimum(np.arange(fx, ncoa * fx + 1, fx), ncols) - 1
+    rows_ind = np.empty(2 * nroa, dtype=int)
+    rows_ind[::2] = 2 * np.arange(0, nrows, fy)
+    rows_ind[1::2] = 2 * np.minimum(np.arange(fy, nroa * fy + 1, fy), nrows) - 1
+    mapped_values = np.full((2 * nroa - 1, 2 * ncoa - 1), np.nan)
+    mapped_values[::2, ::2] = coarse
+    return (
+        mapped_values.ravel(),
+        xc[np.ix_(rows_ind, cols)],
+        yc[np.ix_(rows_ind, cols)],
+        2 * ncoa - 1,
+        2 * nroa - 1,
+    )
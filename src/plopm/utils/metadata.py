@@ -0,0 +1,229 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utility methods to index the OPM Flow output files reading only the headers"""
+
+import copy
+import datetime
+import json
+import os
+
+import numpy as np
+
+from plopm.utils.manifest import window_crc
+
+METADATA = "plopm.json"
+VERSION = 1
+# Big-endian numpy types of the binary arrays
+DTYPES = {"INTE": ">i4", "REAL": ">f4", "DOUB": ">f8", "LOGI": ">i4"}
+# Arrays decoded from the restart file to get the report steps, times, and dates
+STEPS = ("SEQNUM", "INTEHEAD", "DOUBHEAD")
+
+
+def element_size(kind: str) -> tuple[int, int]:
+    """Bytes per element and elements per record of the array type"""
+    if kind == "CHAR":
+        return 8, 105
+    if kind.startswith("C0"):
+        return int(kind[1:]), 105
+    if kind == "MESS":
+        return 0, 1000
+    return np.dtype(DTYPES[kind]).itemsize, 1000
+
+
+def scan_arrays(fname: str, start: int = 0) -> tuple[list, int]:
+    """Name, type, size, and data position of the complete arrays after start"""
+    arrays = []
+    end = start
+    fsize = os.path.getsize(fname)
+    with open(fname, "rb") as file:
+        file.seek(start)
+        while True:
+            head = file.read(24)
+            if len(head) < 24:
+                break
+            name = head[4:12].decode("ascii").strip()
+            size = int.from_bytes(head[12:16], "big", signed=True)
+            kind = head[16:20].decode("ascii")
+            nbytes, block = element_size(kind)
+            position = file.tell()
+            nbytes = size * nbytes + 8 * -(-size // block) if nbytes else 0
+            if position + nbytes > fsize:
+                # the array is still being written
+                break
+            file.seek(nbytes, 1)
+            arrays.append((name, kind, size, position))
+            end = file.tell()
+    return arrays, end
+
+
+def read_array(fname: str, kind: str, size: int, position: int) -> list:
+    """Values of the array, reading the data records"""
+    nbytes, block = element_size(kind)
+    values: list = []
+    with open(fname, "rb") as file:
+        file.seek(position)
+        for first in range(0, size, block):
+            file.seek(4, 1)
+            data = file.read(min(block, size - first) * nbytes)
+            file.seek(4, 1)
+            if kind in DTYPES:
+                values += np.frombuffer(data, dtype=DTYPES[kind]).tolist()
+            else:
+                values += [
+                    data[i : i + nbytes].decode("ascii", errors="replace").strip()
+                    for i in range(0, len(data), nbytes)
+                ]
+    return values
+
+
+def file_state(fname: str) -> list[int]:
+    """Modification time and size of the file"""
+    stat = os.stat(fname)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def index_init(fname: str) -> dict:
+    """Names, types, and sizes of the arrays in the .INIT"""
+    arrays, _ = scan_arrays(fname)
+    return {
+        "state": file_state(fname),
+        "arrays": {name: [kind, size] for name, kind, size, _ in arrays},
+    }
+
+
+def index_restart(fname: str, old: dict | None = None) -> dict:
+    """Arrays, report steps, times, and dates in the .UNRST
+
+    A restart file that grew since the previous index is scanned from the
+    last indexed array on."""
+    state = file_state(fname)
+    if (
+        old
+        and old["state"][1] < state[1]
+        and window_crc(fname, old["end"]) == old["crc"]
+    ):
+        meta = copy.deepcopy(old)
+    else:
+        meta = {
+            "end": 0,
+            "arrays": {},
+            "counts": {},
+            "steps": [],
+            "times": [],
+            "dates": [],
+        }
+    arrays, meta["end"] = scan_arrays(fname, meta["end"])
+    for name, kind, size, position in arrays:
+        if name not in meta["arrays"]:
+            meta["arrays"][name] = [kind, size]
+        meta["counts"][name] = meta["counts"].get(name, 0) + 1
+        if name not in STEPS:
+            continue
+        values = read_array(fname, kind, size, position)
+        if name == "SEQNUM":
+            meta["steps"].append(values[0])
+            meta["times"].append(None)
+            meta["dates"].append(None)
+        elif meta["steps"] and name == "INTEHEAD":
+            meta["dates"][-1] = [values[66], values[65], values[64]]
+        elif meta["steps"]:
+            meta["times"][-1] = values[0]
+    meta["state"] = state
+    meta["crc"] = window_crc(fname, meta["end"])
+    return meta
+
+
+def summary_key(keyword: str, wgname: str, num: int, dimens: list) -> str:
+    """Name of the summary vector as in OPM's ESmry"""
+    first = keyword[:1]
+    valid = wgname not in ("", ":+:+:+:+")
+    if first in ("B", "C") and num > 0:
+        nx, ny = dimens[0], dimens[1]
+        ijk = f"{(num - 1) % nx + 1},{(num - 1) // nx % ny + 1},"
+        ijk += f"{(num - 1) // (nx * ny) + 1}"
+        if first == "B":
+            return f"{keyword}:{ijk}"
+        return f"{keyword}:{wgname}:{ijk}" if valid else ""
+    if first in ("A", "R") and num > 0:
+        return f"{keyword}:{num}"
+    if first in ("G", "W"):
+        return f"{keyword}:{wgname}" if valid else ""
+    if first == "S" and valid:
+        return f"{keyword}:{wgname}:{num}"
+    return keyword
+
+
+def index_summary(fname: str) -> dict:
+    """Arrays and summary vectors in the .SMSPEC"""
+    arrays, _ = scan_arrays(fname)
+    found = {name: (kind, size, position) for name, kind, size, position in arrays}
+    values = {
+        name: read_array(fname, *found[name])
+        for name in ["DIMENS", "KEYWORDS", "WGNAMES", "NAMES", "NUMS"]
+        if name in found
+    }
+    keywords = values.get("KEYWORDS", [])
+    wgnames = values.get("NAMES", values.get("WGNAMES", [""] * len(keywords)))
+    nums = values.get("NUMS", [0] * len(keywords))
+    dimens = values.get("DIMENS", [0, 1, 1, 1])[1:]
+    keys = {
+        summary_key(keyword, wgname, num, dimens)
+        for keyword, wgname, num in zip(keywords, wgnames, nums)
+    }
+    return {
+        "state": file_state(fname),
+        "arrays": {name: [kind, size] for name, kind, size, _ in arrays},
+        "keys": sorted(keys - {""}),
+    }
+
+
+def load_metadata(deck: str) -> dict:
+    """Index of the .INIT, .UNRST, and .SMSPEC, cached next to the deck"""
+    cache = f"{deck}.{METADATA}"
+    old = {}
+    if os.path.isfile(cache):
+        try:
+            with open(cache, encoding="utf8") as file:
+                old = json.load(file)
+        except OSError:
+            old = {}
+        except ValueError:
+            old = {}
+        if old.get("version") != VERSION:
+            old = {}
+    meta: dict = {"version": VERSION}
+    for ext, index in (
+        ("INIT", index_init),
+        ("UNRST", index_restart),
+        ("SMSPEC", index_summary),
+    ):
+        if not os.path.isfile(f"{deck}.{ext}"):
+            continue
+        previous = old.get(ext)
+        if previous and previous["state"] == file_state(f"{deck}.{ext}"):
+            meta[ext] = previous
+        elif ext == "UNRST":
+            meta[ext] = index_restart(f"{deck}.{ext}", previous)
+        else:
+            meta[ext] = index(f"{deck}.{ext}")
+    if meta != old:
+        try:
+            with open(f"{cache}.{os.getpid()}", "w", encoding="utf8") as file:
+                json.dump(meta, file, indent=1)
+            os.replace(f"{cache}.{os.getpid()}", cache)
+        except OSError:
+            # e.g., read-only folders, the index is then built each time
+            pass
+    return meta
+
+
+def restart_dates(meta: dict) -> dict:
+    """Date of each report step in the restart file"""
+    if "UNRST" not in meta:
+        return {}
+    return {
+        step: datetime.date(*date)
+        for step, date in zip(meta["UNRST"]["steps"], meta["UNRST"]["dates"])
+        if date
+    }
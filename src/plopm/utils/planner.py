@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0913,R0917
+
+"""Utility methods to plan the reads, quantities, and slides of the 2D maps
+
+The maps are expanded into a task graph of arrays, grids, quantities, slides,
+colorbar ranges, and figures, where identical nodes are merged, e.g., the
+slide used to find the colorbar range is the one in the figure."""
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from plopm.config.config import ConfigPlopm
+from plopm.utils.metadata import element_size, load_metadata
+
+# Bytes of the computed slides kept in memory to be reused by the figures
+MEMORY = 10**9
+# Readers and coordinates kept open, the readers keep the arrays already read
+GRIDS = 16
+# Threads computing the slides, each one with at most two slides in flight
+WORKERS = min(8, os.cpu_count() or 1)
+# Restart arrays of the derived quantities
+MASS = ["SGAS", "RPORV", "RSW", "RVW", "GAS_DEN", "WAT_DEN"]
+SATURATIONS = ["SOIL", "SGAS", "SWAT"]
+KINDS = ["array", "grid", "quantity", "slide", "range", "figure"]
+NAMES = {
+    "grid": "{} slide {}",
+    "quantity": "{} {} restart {}",
+    "slide": "{} {} restart {} slide {}",
+}
+
+
+def pool_map(func: Callable, tasks: Iterable, workers: int = WORKERS) -> Iterator:
+    """Results of func for the tasks (arguments) in order, with bounded tasks in flight"""
+    with ThreadPoolExecutor(workers) as executor:
+        pending: list[Future] = []
+        for args in tasks:
+            pending.append(executor.submit(func, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def get_steps(cfg: ConfigPlopm, meta: dict) -> list[int]:
+    """Restarts of the maps, as selected in get_readers"""
+    if "UNRST" not in meta:
+        return [0] if cfg.restart[0] == -1 else list(cfg.restart)
+    steps = meta["UNRST"]["steps"]
+    if cfg.restart[0] == -1:
+        return list(steps) if cfg.gif else [steps[-1]]
+    return list(cfg.restart)
+
+
+def get_filters(cfg: ConfigPlopm, n: int) -> list[str]:
+    """Arrays of the -filter conditions of the deck"""
+    filters = cfg.filter[n] if n < len(cfg.filter) else ""
+    return [
+        value.strip().split(" ")[0].upper()
+        for value in filters.split("&")
+        if value.strip()
+    ]
+
+
+def get_arrays(
+    cfg: ConfigPlopm, meta: dict, var: str, nrst: int, n: int
+) -> list[tuple]:
+    """Arrays in the .INIT and .UNRST used by the variable at the restart"""
+    init = meta.get("INIT", {}).get("arrays", {})
+    unrst = meta.get("UNRST", {}).get("arrays", {})
+    arrays = []
+    for token in var.split(" ")[::2]:
+        key = token.upper()
+        if token[0].isdigit() and token[-1].isdigit():
+            continue
+        if token[0].isdigit():
+            arrays.append(("UNRST", token[1:].upper(), int(token[0])))
+        elif key in init:
+            arrays.append(("INIT", key, 0))
+        elif key in unrst:
+            arrays += [("UNRST", key, nrst), ("UNRST", "RPORV", nrst)]
+            for name in get_filters(cfg, n):
+                arrays.append(
+                    ("INIT", name, 0) if name in init else ("UNRST", name, nrst)
+                )
+        elif token in cfg.mass + cfg.xmass:
+            arrays += [("UNRST", name, nrst) for name in MASS]
+        elif token in cfg.caprock:
+            arrays += [("INIT", "DZ", 0), ("INIT", "DEPTH", 0)]
+            for name in ["WAT_DEN", "PRESSURE"]:
+                arrays += [("UNRST", name, 0), ("UNRST", name, nrst)]
+        elif token in ["swat", "soil", "sgas"]:
+            arrays += [("UNRST", name, nrst) for name in SATURATIONS]
+    return [
+        array
+        for array in dict.fromkeys(arrays)
+        if array[1] in (init if array[0] == "INIT" else unrst)
+    ]
+
+
+def add_node(graph: dict, node: tuple, deps: Iterable = (), nbytes: int = 0) -> tuple:
+    """Merge the node in the graph, counting the requests of the unmerged maps"""
+    if node not in graph:
+        graph[node] = {"deps": [], "bytes": nbytes, "requests": 0}
+    graph[node]["requests"] += 1
+    for dep in deps:
+        if dep not in graph[node]["deps"]:
+            graph[node]["deps"].append(dep)
+    return node
+
+
+def add_array(graph: dict, meta: dict, deck: str, array: tuple) -> tuple:
+    """Array of the .INIT or .UNRST"""
+    kind, size = meta[array[0]]["arrays"][array[1]]
+    return add_node(graph, ("array", deck, *array), (), size * element_size(kind)[0])
+
+
+def add_grid(graph: dict, cfg: ConfigPlopm, meta: dict, deck: str, n: int) -> tuple:
+    """Readers and coordinates of the slide of the deck"""
+    names = ["PORV", "DX", "DY", "DZ"] + get_filters(cfg, n)
+    deps = [
+        add_array(graph, meta, deck, ("INIT", name, 0))
+        for name in dict.fromkeys(names)
+        if name in meta.get("INIT", {}).get("arrays", {})
+    ]
+    egrid = os.path.getsize(f"{deck}.EGRID") if os.path.isfile(f"{deck}.EGRID") else 0
+    return add_node(graph, ("grid", deck, n), deps, egrid)
+
+
+def add_slide(
+    graph: dict, cfg: ConfigPlopm, meta: dict, deck: str, var: str, nrst: int, n: int
+) -> tuple:
+    """Quantity of the variable at the restart, mapped to the slide of the deck"""
+    quantity = add_node(
+        graph,
+        ("quantity", deck, var, nrst),
+        [
+            add_array(graph, meta, deck, array)
+            for array in get_arrays(cfg, meta, var, nrst, n)
+        ],
+    )
+    return add_node(graph, ("slide", deck, var, nrst, n), [quantity, ("grid", deck, n)])
+
+
+def plan_maps(cfg: ConfigPlopm) -> dict:
+    """Task graph of make_maps, each node with its dependencies and requests"""
+    graph: dict = {}
+    decks = cfg.names[0]
+    metas = {
+        deck: load_metadata(deck) for deck in decks + ([cfg.diff] * bool(cfg.diff))
+    }
+    ranges = not (
+        (cfg.rst_range and cfg.png and not cfg.subfigs[0])
+        or (cfg.bounds[0][0] and not cfg.diff)
+    )
+    if ranges:
+        for var in cfg.vrs:
+            for n, deck in enumerate(decks):
+                add_grid(graph, cfg, metas[deck], deck, n)
+                add_node(
+                    graph,
+                    ("range", var),
+                    [
+                        add_slide(graph, cfg, metas[deck], deck, var, nrst, n)
+                        for nrst in get_steps(cfg, metas[deck])
+                    ],
+                )
+    if cfg.mask:
+        for n, deck in enumerate(decks):
+            add_grid(graph, cfg, metas[deck], deck, n)
+            add_slide(graph, cfg, metas[deck], deck, cfg.mask, 0, n)
+    for var in cfg.vrs:
+        for n, deck in enumerate(decks):
+            add_grid(graph, cfg, metas[deck], deck, n)
+            for nrst in get_steps(cfg, metas[deck]):
+                deps = [add_slide(graph, cfg, metas[deck], deck, var, nrst, n)]
+                if cfg.diff:
+                    add_grid(graph, cfg, metas[cfg.diff], cfg.diff, 1)
+                    deps.append(
+                        add_slide(graph, cfg, metas[cfg.diff], cfg.diff, var, nrst, 1)
+                    )
+                if ranges:
+                    deps.append(("range", var))
+                figure: tuple = (deck, var) if cfg.gif else (deck, var, nrst)
+                if cfg.subfigs[0]:
+                    figure = figure[1:]
+                add_node(graph, ("figure", *figure), deps)
+    return graph
+
+
+def format_bytes(nbytes: float) -> str:
+    """Human readable size"""
+    for unit in ["B", "kB", "MB", "GB"]:
+        if nbytes < 1000 or unit == "GB":
+            break
+        nbytes /= 1000
+    return f"{nbytes:.1f} {unit}"
+
+
+def node_name(node: tuple) -> str:
+    """Description of the node of the task graph"""
+    if node[0] == "array":
+        restart = f" restart {node[4]}" if node[2] == "UNRST" else ""
+        return f"{node[1]}.{node[2]} {node[3]}{restart}"
+    if node[0] in NAMES:
+        return NAMES[node[0]].format(*node[1:])
+    if node[0] == "figure" and isinstance(node[-1], int):
+        return f"{' '.join(node[1:-1])} restart {node[-1]}"
+    return " ".join(node[1:])
+
+
+def print_plan(cfg: ConfigPlopm) -> None:
+    """Print the task graph of the maps and an estimate of the bytes to read"""
+    graph = plan_maps(cfg)
+    print("Task graph of the maps (node, dependencies, and requests):")
+    for kind in KINDS:
+        for node, data in graph.items():
+            if node[0] != kind:
+                continue
+            text = f"  {kind:<8} {node_name(node)}"
+            if data["deps"]:
+                text += f" <- {len(data['deps'])}"
+            if data["bytes"]:
+                text += f" [{format_bytes(data['bytes'])}]"
+            print(f"{text} x{data['requests']}")
+    reads = [data for node, data in graph.items() if node[0] in ["array", "grid"]]
+    nbytes = sum(data["bytes"] for data in reads)
+    requested = sum(data["bytes"] * data["requests"] for data in reads)
+    print(
+        f"I/O estimate: {len(reads)} reads of {format_bytes(nbytes)} after merging "
+        f"{sum(data['requests'] for data in reads)} requests of "
+        f"{format_bytes(requested)}; {WORKERS} worker(s) and up to "
+        f"{format_bytes(MEMORY)} of cached slides."
+    )
@@ -6,6 +6,7 @@
 
 import csv
 import datetime
+import itertools
 import os
 import sys
 from contextlib import nullcontext
@@ -18,11 +19,16 @@ from opm.io.ecl import EGrid as OpmGrid
 from opm.io.ecl import ERst as OpmRestart
 from opm.io.ecl import ESmry as OpmSummary
 
-from plopm.config.config import ConfigPlopm, ReadData
+from plopm.config.config import ConfigPlopm, ReadData, SectionData
+from plopm.utils.csvcache import load_columns
 from plopm.utils.initialization import initialize_mass, initialize_spatial
+from plopm.utils.metadata import load_metadata, restart_dates
+from plopm.utils.satfunc import SATFUNC, get_satfunc
 
 GAS_DEN_REF = 1.86843
 WAT_DEN_REF = 998.108
+# Statistics of -m stats over the active cells at each restart
+STATS = ["min", "max", "mean", "pvmean", "p1", "p50", "p99"]
 
 
 def get_readers(
@@ -33,9 +39,11 @@ def get_readers(
     restart: list,
     filters: list,
     n: int = 0,
+    precision: str = "float64",
 ) -> ReadData:
     """Load the opm parsing methods"""
     if os.path.isfile(f"{deck}.INIT"):
+        meta = load_metadata(deck)
         init = OpmFile(f"{deck}.INIT")
     else:
         print(f"Unable to find {deck} with .INIT.")
@@ -47,10 +55,10 @@ def get_readers(
         else None
     )
 
-    porv = np.array(init["PORV"])
-    dx = np.array(init["DX"])
-    dy = np.array(init["DY"])
-    dz = np.array(init["DZ"])
+    porv = np.asarray(init["PORV"])
+    dx = np.asarray(init["DX"])
+    dy = np.asarray(init["DY"])
+    dz = np.asarray(init["DZ"])
 
     act_mask = porv > 0
     pv = porv[act_mask]
@@ -65,17 +73,17 @@ def get_readers(
             filte = value.strip().split(" ")
             key = filte[0].upper()
             if init.count(key):
-                arr = np.array(init[key])
+                arr = np.asarray(init[key])
                 mask = porv0 > 0
                 porv[mask] = handle_filter(porv[mask], arr, filte[1], float(filte[2]))
 
     if unrst:
-        steps = unrst.report_steps
+        steps = meta["UNRST"]["steps"]
         ntot = steps[-1] + 1
-        if unrst.count("DOUBHEAD", 0):
-            tnrst = [unrst["DOUBHEAD", ntm][0] for ntm in steps]
+        if None not in meta["UNRST"]["times"]:
+            tnrst = meta["UNRST"]["times"]
         if restart[0] == -1:
-            restart = unrst.report_steps if gif else [ntot - 1]
+            restart = list(steps) if gif else [ntot - 1]
     elif restart[0] == -1:
         restart = [ntot - 1]
 
@@ -109,15 +117,25 @@ def get_readers(
         nx,
         ny,
         nz,
+        np.float32 if precision == "float32" else np.float64,
+        restart_dates(meta),
     )
 
 
+def resolve_slide(slide: list, read: ReadData) -> list:
+    """Slide ranges with ':' replaced by the whole grid, as a new list"""
+    return [
+        [0, dim] if rng[0] == ":" else list(rng)
+        for rng, dim in zip(slide, [read.nx, read.ny, read.nz])
+    ]
+
+
 def get_yzcoords(cfg: ConfigPlopm, read: ReadData, n: int) -> tuple[NDArray, NDArray]:
     """Handle the coordinates from the OPM Grid to the 2D yz-mesh using opm"""
     xyz_func = read.egrid.xyz_from_ijk
     ny_val = read.ny
     nz_val = read.nz
-    base_i_all = cfg.slide[n][0][0]
+    base_i_all = resolve_slide(cfg.slide[n], read)[0][0]
     total_size = nz_val * 4 * ny_val
     xc_list = [0] * total_size
     yc_list = [0] * total_size
@@ -153,7 +171,7 @@ def get_xzcoords(cfg: ConfigPlopm, read: ReadData, n: int) -> tuple[NDArray, NDA
     xyz_func = read.egrid.xyz_from_ijk
     nx_val = read.nx
     nz_val = read.nz
-    base_j_all = cfg.slide[n][1][0]
+    base_j_all = resolve_slide(cfg.slide[n], read)[1][0]
     total_size = nz_val * 4 * nx_val
     xc_list = [0] * total_size
     yc_list = [0] * total_size
@@ -189,7 +207,7 @@ def get_xycoords(cfg: ConfigPlopm, read: ReadData, n: int) -> tuple[NDArray, NDA
     xyz_func = read.egrid.xyz_from_ijk
     nx_val = read.nx
     ny_val = read.ny
-    base_k_all = cfg.slide[n][2][0]
+    base_k_all = resolve_slide(cfg.slide[n], read)[2][0]
     total_size = ny_val * 4 * nx_val
     xc_list = [0] * total_size
     yc_list = [0] * total_size
@@ -219,6 +237,105 @@ def get_xycoords(cfg: ConfigPlopm, read: ReadData, n: int) -> tuple[NDArray, NDA
     )
 
 
+def get_section(cfg: ConfigPlopm, deck: str, read: ReadData) -> SectionData:
+    """Cells crossed by the -section polyline, distances along it, and depths
+
+    Each segment of the polyline is clipped against the footprints of all grid
+    columns at once (pillars at mid height), and the depths of the cell faces
+    are interpolated from the corners at the entry and exit points."""
+
+    def corner_weights(points: NDArray) -> NDArray:
+        origin = corners[column, 0]
+        side_i = corners[column, 1] - origin
+        side_j = corners[column, 3] - origin
+        u = np.clip(
+            np.sum((points - origin) * side_i, axis=1) / np.sum(side_i**2, axis=1),
+            0,
+            1,
+        )
+        v = np.clip(
+            np.sum((points - origin) * side_j, axis=1) / np.sum(side_j**2, axis=1),
+            0,
+            1,
+        )
+        return np.stack([(1 - u) * (1 - v), u * (1 - v), u * v, (1 - u) * v], axis=1)
+
+    egrid = OpmFile(f"{deck}.EGRID")
+    nx, ny, nz = read.nx, read.ny, read.nz
+    coord = np.array(egrid["COORD"], dtype=float).reshape((ny + 1, nx + 1, 6))
+    pillars = 0.5 * (coord[:, :, :2] + coord[:, :, 3:5])
+    corners = np.stack(
+        [pillars[:-1, :-1], pillars[:-1, 1:], pillars[1:, 1:], pillars[1:, :-1]],
+        axis=2,
+    ).reshape(-1, 4, 2)
+    following = np.roll(corners, -1, axis=1)
+    area = np.sum(
+        corners[:, :, 0] * following[:, :, 1] - following[:, :, 0] * corners[:, :, 1],
+        axis=1,
+    )
+    edges = following - corners
+    normals = np.stack([-edges[:, :, 1], edges[:, :, 0]], axis=2)
+    normals *= np.sign(area)[:, None, None]
+    columns, starts, ends, entries, exits = [], [], [], [], []
+    distance = 0.0
+    for point0, point1 in itertools.pairwise(np.array(cfg.section, dtype=float)):
+        length = float(np.hypot(*(point1 - point0)))
+        num = np.sum(normals * (point0 - corners), axis=2)
+        den = normals @ (point1 - point0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = -num / den
+        enter = np.where(den > 0, bound, 0.0).max(axis=1)
+        leave = np.where(den < 0, bound, 1.0).min(axis=1)
+        outside = np.any((den == 0) & (num < 0), axis=1) | (area == 0)
+        crossed = np.flatnonzero(~outside & ((leave - enter) * length > 1e-6))
+        crossed = crossed[np.argsort(enter[crossed])]
+        columns.append(crossed)
+        starts.append(distance + enter[crossed] * length)
+        ends.append(distance + leave[crossed] * length)
+        entries.append(point0 + enter[crossed, None] * (point1 - point0))
+        exits.append(point0 + leave[crossed, None] * (point1 - point0))
+        distance += length
+    column = np.concatenate(columns)
+    if not column.size:
+        print(f"The -section polyline does not cross the grid of {deck}.")
+        sys.exit()
+    zcorn = np.array(egrid["ZCORN"], dtype=float).reshape((nz, 2, ny, 2, nx, 2))
+    zcorn = zcorn.transpose(0, 1, 2, 4, 3, 5).reshape((nz, 2, nx * ny, 2, 2))[
+        :, :, column
+    ]
+    zcorn = np.stack(
+        [zcorn[..., 0, 0], zcorn[..., 0, 1], zcorn[..., 1, 1], zcorn[..., 1, 0]],
+        axis=3,
+    )[::-1]
+    ncol = column.size
+    mx, my = 2 * ncol - 1, 2 * nz - 1
+    yc = np.empty((2 * nz, 2 * ncol))
+    for side, points in enumerate([entries, exits]):
+        depths = np.einsum("kbcq,cq->kbc", zcorn, corner_weights(np.vstack(points)))
+        yc[0::2, side::2] = depths[:, 1]
+        yc[1::2, side::2] = depths[:, 0]
+    xc = np.tile(
+        np.column_stack([np.concatenate(starts), np.concatenate(ends)]).ravel(),
+        (2 * nz, 1),
+    )
+    layers = np.arange(nz)[:, None]
+    return SectionData(
+        xc=xc,
+        yc=yc,
+        cells=(column + layers * nx * ny).ravel(),
+        index=(2 * np.arange(ncol) + 2 * (nz - 1 - layers) * mx).ravel(),
+        mx=mx,
+        my=my,
+    )
+
+
+def as_float(arr: NDArray, read: ReadData) -> NDArray:
+    """Array from the output files as floats, without copying if possible"""
+    if read.dtype == np.float32 or not np.issubdtype(arr.dtype, np.floating):
+        return arr.astype(read.dtype, copy=False)
+    return np.asarray(arr)
+
+
 def resolve_variable(
     cfg: ConfigPlopm,
     read: ReadData,
@@ -232,9 +349,9 @@ def resolve_variable(
 ):
     """Handle the variable"""
     if init.count(key_up):
-        return 1.0 * init[key_up, 0]
+        return as_float(init[key_up, 0], read)
     if unrst is not None and unrst.count(key_up, nrst):
-        return 1.0 * unrst[key_up, nrst]
+        return as_float(unrst[key_up, nrst], read)
     if key_low in mass_all:
         return handle_mass(read, key_low, nrst)
     if key_low in caprock_list:
@@ -259,7 +376,7 @@ def get_histogram(cfg: ConfigPlopm, read: ReadData, quans: list, nrst: int) -> N
         act = porv > 0
     else:
         act = porv > -1
-    var = np.nan * np.ones(nxyz, dtype=float)
+    var = np.full(nxyz, np.nan, dtype=read.dtype)
     result = resolve_variable(
         cfg, read, quan0, quan0_low, nrst, init_dic, unrst_dic, mass_all, caprock_list
     )
@@ -276,7 +393,7 @@ def get_histogram(cfg: ConfigPlopm, read: ReadData, quans: list, nrst: int) -> N
                 if unrst_dic is None:
                     print(f"Unknow -v variable ({val}).")
                     sys.exit()
-                quan1 = 1.0 * unrst_dic[val[1:].upper(), int(val[0])]
+                quan1 = as_float(unrst_dic[val[1:].upper(), int(val[0])], read)
             elif val[0].isdigit() and val[-1].isdigit():
                 quan1 = np.full_like(var[act], float(val))
             else:
@@ -317,7 +434,7 @@ def compute_distance(
     xyz = np.zeros((nxyz, 3), dtype=float)
     act = porv > 0
     time = np.array(read.tnrst)
-    distance = np.nan * np.ones(ntot)
+    distance = np.full(ntot, np.nan)
     index = 0
     for k in range(nz_val):
         for j in range(ny_val):
@@ -365,13 +482,13 @@ def compute_distance(
     with bar_ctx as bar_animation:
         for nrst in unrst_dic.report_steps:
             xyzt = np.copy(xyz)
-            var = np.nan * np.ones(nxyz, dtype=float)
+            var = np.full(nxyz, np.nan, dtype=read.dtype)
             quan0_low = quans[0]
             quan0_up = quans[0].upper()
             if quan0_low in ["index_i", "index_j", "index_k"]:
                 var[act] = get_indices(quan0_low, nx_val, ny_val, nz_val)
             elif unrst_dic.count(quan0_up, nrst):
-                var[act] = 1.0 * unrst_dic[quan0_up, nrst]
+                var[act] = as_float(unrst_dic[quan0_up, nrst], read)
             elif quan0_low in mass_all:
                 var[act] = handle_mass(read, quan0_low, nrst)
             elif quan0_low in ["swat", "soil", "sgas"]:
@@ -384,18 +501,18 @@ def compute_distance(
                 for j, val in enumerate(quans[2::2]):
                     val_up = val.upper()
                     if val[0].isdigit() and not val[-1].isdigit():
-                        quan1 = 1.0 * unrst_dic[val[1:].upper(), int(val[0])]
+                        quan1 = as_float(unrst_dic[val[1:].upper(), int(val[0])], read)
                     elif val[0].isdigit() and val[-1].isdigit():
                         quan1 = np.full_like(var[act], float(val))
                     elif init_dic.count(val_up):
-                        quan1 = 1.0 * init_dic[val_up, 0]
+                        quan1 = as_float(init_dic[val_up, 0], read)
                         if val_up == "PORV":
                             quan1 = quan1[act]
                     elif val in ["index_i", "index_j", "index_k"]:
                         var[act] = get_indices(val, nx_val, ny_val, nz_val)
                         continue
                     elif unrst_dic.count(val_up, nrst):
-                        quan1 = 1.0 * unrst_dic[val_up, nrst]
+                        quan1 = as_float(unrst_dic[val_up, nrst], read)
                     elif val in mass_all:
                         quan1 = handle_mass(read, val, nrst)
                     elif val in ["swat", "soil", "sgas"]:
@@ -406,7 +523,7 @@ def compute_distance(
                     var_act = var[act]
                     var[act] = operate(var_act, quan1, ops[j])
             xyzt[var != 1] = np.nan
-            temp = np.nan * np.ones(len(points))
+            temp = np.full(len(points), np.nan)
             for point_index, point in enumerate(points):
                 if show_progress:
                     bar_animation()
@@ -424,14 +541,18 @@ def compute_distance(
     return distance[~np.isnan(distance)], time[~np.isnan(distance)]
 
 
-def get_indices(name: str, nx: int, ny: int, nz: int) -> list:
+def get_indices(name: str, nx: int, ny: int, nz: int) -> NDArray:
     """Compute the i, j, or k indices"""
-    nxyz = nx * ny * nz
+    index = np.arange(nx * ny * nz)
     if name == "index_i":
-        return [(grid_index % nx) + 1 for grid_index in range(nxyz)]
-    if name == "index_j":
-        return [((grid_index // nx) % ny) + 1 for grid_index in range(nxyz)]
-    return [(grid_index // (nx * ny)) + 1 for grid_index in range(nxyz)]
+        index %= nx
+    elif name == "index_j":
+        index //= nx
+        index %= ny
+    else:
+        index //= nx * ny
+    index += 1
+    return index
 
 
 def project(var: NDArray, oper: str, porv: NDArray) -> NDArray:
@@ -530,7 +651,7 @@ def do_read_variables(
             porv = pv_all[inds_arr]
 
         if unrst_dic.count(quan0_up, nrst):
-            temp = 1.0 * unrst_dic[quan0_up, nrst][inds_arr]
+            temp = as_float(unrst_dic[quan0_up, nrst][inds_arr], read)
             # porv-weighted pressure for the dual model
             if cfg.dual[n] == "1" and cfg.sensor:
                 indd = egrid.active_index(
@@ -543,7 +664,7 @@ def do_read_variables(
                     porvd = pv_all[indd]
                 temp = (temp * porv + presd * porvd) / (porv + porvd)
         elif init_dic.count(quan0_up):
-            temp = 1.0 * init_dic[quan0_up, 0][inds_arr]
+            temp = as_float(init_dic[quan0_up, 0][inds_arr], read)
         elif arr_main is not None:
             temp = arr_main[inds_arr]
         else:
@@ -555,13 +676,15 @@ def do_read_variables(
                 val_up = val.upper()
                 arr_val = arr_vals[j]
                 if val[0].isdigit() and not val[-1].isdigit():
-                    quan1 = 1.0 * unrst_dic[val[1:].upper(), int(val[0])][inds_arr]
+                    quan1 = as_float(
+                        unrst_dic[val[1:].upper(), int(val[0])][inds_arr], read
+                    )
                 elif val[0].isdigit() and val[-1].isdigit():
                     quan1 = np.full_like(temp, float(val))
                 elif init_dic.count(val_up):
-                    quan1 = 1.0 * init_dic[val_up, 0][inds_arr]
+                    quan1 = as_float(init_dic[val_up, 0][inds_arr], read)
                 elif unrst_dic.count(val_up, nrst):
-                    quan1 = 1.0 * unrst_dic[val_up, nrst][inds_arr]
+                    quan1 = as_float(unrst_dic[val_up, nrst][inds_arr], read)
                 elif not np.isnan(arr_val).all():
                     quan1 = arr_val[inds_arr]
                 else:
@@ -600,177 +723,42 @@ def read_oned(
     tskl, tunit = initialize_time(tunit)
     quans = quan.split(" ")
     csv_flag = cfg.csvs[n][0]
-    q0_low = quans[0]
-    use_sw = "krw" in "".join(cfg.vrs)
     if csv_flag:
-        csvv = np.genfromtxt(f"{case}.csv", delimiter=",", skip_header=1)
-        col_t = cfg.csvs[n][0] - 1
-        col_v = cfg.csvs[n][1] - 1
-        time = tskl * csvv[:, col_t] / 86400.0
-        var = csvv[:, col_v]
+        csvv = load_columns(f"{case}.csv", [cfg.csvs[n][0] - 1, cfg.csvs[n][1] - 1])
+        time = tskl * csvv[:, 0] / 86400.0
+        var = csvv[:, 1]
     elif cfg.distance[0]:
         xskl, xunit = initialize_spatial(cfg.xunits)
-        read = get_readers(case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter)
+        read = get_readers(
+            case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter, 0, cfg.precision
+        )
         var, time = compute_distance(cfg, read, quans, n)
         vunit = f" ({cfg.distance[0]} distance to {cfg.distance[1]} in {xunit})"
         var *= xskl
     elif cfg.histogram[0]:
-        read = get_readers(case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter)
+        read = get_readers(
+            case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter, 0, cfg.precision
+        )
         var = get_histogram(cfg, read, quans, read.restart[0])
         tunit = ""
     elif cfg.sensor or cfg.how[0]:
-        read = get_readers(case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter)
+        read = get_readers(
+            case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter, 0, cfg.precision
+        )
         var, time = do_read_variables(cfg, read, quans, n, read.unrst.report_steps)
         time *= tskl
         if tunit == "Dates":
-            tmp = []
-            unrst_dic = read.unrst
-            for index in range(len(unrst_dic)):
-                values = unrst_dic["INTEHEAD", index]
-                tmp.append(datetime.date(values[66], values[65], values[64]))
-            time = np.array(tmp)
+            time = np.array([read.dates[nrst] for nrst in read.unrst.report_steps])
     elif cfg.layer:
         xskl, tunit = initialize_spatial(cfg.xunits)
-        read = get_readers(case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter)
+        read = get_readers(
+            case, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter, 0, cfg.precision
+        )
         tmp = read.restart[n] if n < len(cfg.restart) else read.restart[0]
         var, time = do_read_variables(cfg, read, quans, n, [tmp])
         time *= xskl
-    elif q0_low[:3] in ["krw", "krg"] or q0_low[:4] in [
-        "krog",
-        "krow",
-        "pcow",
-        "pcog",
-        "pcwg",
-    ]:
-        snu = 1
-        hyst = False
-        if q0_low[-1] == "h":
-            hyst = True
-            q0_low = quans[0][:-1]
-        if len(q0_low) == 3:
-            what = q0_low[:3]
-        elif q0_low in ["krow", "krog", "pcow", "pcog", "pcwg"]:
-            what = q0_low[:4]
-        elif q0_low[:3] in ["krw", "krg"]:
-            what = q0_low[:3]
-            snu = int(quans[0][3:])
-        else:
-            what = q0_low[:4]
-            snu = int(quans[0][4:])
-        if not os.path.isfile(f"{case}.INIT"):
-            print(f"Saturation functions required {case}.INIT")
-            sys.exit()
-        init = OpmFile(f"{case}.INIT")
-        tabdim = init["TABDIMS"]
-        table = np.array(init["TAB"])
-        nswe = tabdim[24]
-        nsnum = tabdim[25]
-        vunit = ""
-        if what == "krg":
-            tunit = "s$_w$ [-]" if use_sw else "s$_g$ [-]"
-            sht = tabdim[23] - 1
-            base = sht + (snu - 1) * nswe
-            time = table[base : base + nswe]
-            time = time[time <= 1.0]
-            count_v = len(time)
-            var = table[
-                sht + nswe * nsnum + (snu - 1) * nswe : sht + nswe * nsnum + snu * nswe
-            ][:count_v]
-            if hyst:
-                base2 = sht + (nsnum // 2 + snu - 1) * nswe
-                timeh = table[base2 : base2 + nswe]
-                timeh = timeh[timeh <= 1.0]
-                count_v = len(timeh)
-                var = np.append(
-                    var,
-                    np.flip(
-                        table[
-                            sht
-                            + nswe * nsnum
-                            + (nsnum // 2 + snu - 1) * nswe : sht
-                            + nswe * nsnum
-                            + (nsnum // 2 + snu) * nswe
-                        ][:count_v]
-                    ),
-                )
-                time = np.append(time, np.flip(timeh))
-            if use_sw:
-                time = 1.0 - time
-        elif what == "krow":
-            nswe = tabdim[21]
-            tunit = "s$_w$ [-]"
-            sht = tabdim[26] - 1
-            base = sht + (snu - 1) * nswe
-            time = table[base : base + nswe]
-            time = time[time <= 1.0]
-            count_v = len(time)
-            if tabdim[22] == 2:
-                sht += nswe
-            var = np.flip(
-                table[
-                    sht
-                    + nswe * nsnum
-                    + (snu - 1) * nswe : sht
-                    + nswe * nsnum
-                    + snu * nswe
-                ][:count_v]
-            )
-        elif what == "krw":
-            nswe = tabdim[21]
-            tunit = "s$_w$ [-]"
-            sht = tabdim[20] - 1
-            base = sht + (snu - 1) * nswe
-            time = table[base : base + nswe]
-            time = time[time <= 1.0]
-            count_v = len(time)
-            var = table[
-                sht + nswe * nsnum + (snu - 1) * nswe : sht + nswe * nsnum + snu * nswe
-            ][:count_v]
-            if hyst:
-                base2 = sht + (nsnum // 2 + snu - 1) * nswe
-                timeh = table[base2 : base2 + nswe]
-                timeh = timeh[timeh <= 1.0]
-                count_v = len(timeh)
-                var = np.append(
-                    np.flip(var),
-                    table[
-                        sht
-                        + nswe * nsnum
-                        + (nsnum // 2 + snu - 1) * nswe : sht
-                        + nswe * nsnum
-                        + (nsnum // 2 + snu) * nswe
-                    ][:count_v],
-                )
-                time = np.append(np.flip(time), timeh)
-        elif what == "pcow":
-            nswe = tabdim[21]
-            tunit = "s$_w$ [-]"
-            sht = tabdim[20] - 1
-            base = sht + (snu - 1) * nswe
-            time = table[base : base + nswe]
-            time = time[time <= 1.0]
-            count_v = len(time)
-            var = table[
-                sht
-                + 2 * nswe * nsnum
-                + (snu - 1) * nswe : sht
-                + 2 * nswe * nsnum
-                + snu * nswe
-            ][:count_v]
-        else:
-            tunit = "s$_g$ [-]"
-            sht = tabdim[23] - 1
-            base = sht + (snu - 1) * nswe
-            time = table[base : base + nswe]
-            time = time[time <= 1.0]
-            count_v = len(time)
-            var = table[
-                sht
-                + 2 * nswe * nsnum
-                + (snu - 1) * nswe : sht
-                + 2 * nswe * nsnum
-                + snu * nswe
-            ][:count_v]
+    elif SATFUNC.match(quans[0]):
+        time, var, tunit = get_satfunc(cfg, case, quans[0])
     elif quan[:6] == "pcfact" or quan[:8] == "permfact":
         cap = 6 if quan[:6] == "pcfact" else 8
         tmp0 = []
@@ -943,13 +931,11 @@ def get_csvs(
         file_name = deck.replace("PLOPM", str(cfg.restart[0]))
     else:
         file_name = deck
-    csvv = np.genfromtxt(f"{file_name}.csv", delimiter=",", skip_header=1)
-    col_x = cfg.csvs[n][0] - 1
-    col_y = cfg.csvs[n][1] - 1
-    x0 = csvv[0, col_x]
-    x1 = csvv[-1, col_x]
-    y0 = csvv[0, col_y]
-    y1 = csvv[-1, col_y]
+    csvv = load_columns(f"{file_name}.csv", [cfg.csvs[n][0] - 1, cfg.csvs[n][1] - 1])
+    x0 = csvv[0, 0]
+    x1 = csvv[-1, 0]
+    y0 = csvv[0, 1]
+    y1 = csvv[-1, 1]
     x = x1 + x0
     y = y1 + y0
     mx = round(x / (2.0 * x0))
@@ -1007,7 +993,6 @@ def get_quantity(
     mass_all: list[str],
     caprock: list[str],
     stress: float,
-    filters: str,
     isgif: bool,
     vmin: str,
     vmax: str,
@@ -1023,52 +1008,30 @@ def get_quantity(
             file_name = deck.replace("PLOPM", str(nrst))
         else:
             file_name = deck
-        csvv = np.genfromtxt(f"{file_name}.csv", delimiter=",", skip_header=1)
-        col = cvs[2] - 1
-        quan = csvv[:, col]
+        quan = load_columns(f"{file_name}.csv", [cvs[2] - 1])[:, 0]
     else:
         if read.init.count(name0):
-            quan = np.array(read.init[name0], dtype=float)
+            quan = np.asarray(read.init[name0], dtype=read.dtype)
             if name0_low == "porv":
-                quan = read.pv
+                quan = read.pv.copy()
         elif name0_low in ["wells", "faults", "grid"]:
             quan = np.zeros_like(read.init["SATNUM"])
         elif name0_low in ["index_i", "index_j", "index_k"]:
-            quan = np.array(
-                get_indices(name0_low, read.nx, read.ny, read.nz), dtype=float
-            )
-            quan = quan[read.porv > 0]
+            quan = np.asarray(
+                get_indices(name0_low, read.nx, read.ny, read.nz), dtype=read.dtype
+            )[read.porv > 0]
         elif read.unrst.count(name0, nrst):
             quan = read.unrst[name0, nrst]
-            if read.unrst.count("RPORV", nrst):
-                if filters:
-                    porv0 = np.array(read.init["PORV"])
-                    mask = porv0 > 0
-                    base_rporv = np.array(read.unrst["RPORV", nrst])
-                    for value in filters.split("&"):
-                        filte = value.strip().split(" ")
-                        key = filte[0].upper()
-                        if read.init.count(key):
-                            q1 = np.array(read.init[key])
-                        elif read.unrst.count(key, nrst):
-                            q1 = np.array(read.unrst[key, nrst])
-                        else:
-                            print(f"Unknow filter quantity ({key}).")
-                            sys.exit()
-                        base_rporv = handle_filter(
-                            base_rporv, q1, filte[1], float(filte[2])
-                        )
-                    read.porv[mask] = base_rporv
-                else:
-                    read.porv[read.porv > 0] = np.array(read.unrst["RPORV", nrst])
         elif name0_low in mass_all:
-            quan = handle_mass(read, name0_low, nrst) * skl
+            quan = handle_mass(read, name0_low, nrst)
+            quan *= skl
             if name0_low in mass:
                 unit = initialize_mass(skl)
         elif name0_low in caprock:
             quan, unit = handle_caprock(read, name0_low, nrst, stress)
         elif name0_low in ["swat", "soil", "sgas"]:
-            quan = handle_saturation(read.unrst, name0_low, nrst) * skl
+            quan = handle_saturation(read.unrst, name0_low, nrst)
+            quan *= skl
         else:
             print(f"Unknow -v variable ({name0}).")
             sys.exit()
@@ -1080,15 +1043,13 @@ def get_quantity(
                 elif val[0].isdigit() and val[-1].isdigit():
                     q1 = np.full_like(quan, float(val))
                 elif read.init.count(val.upper()):
-                    q1 = np.array(read.init[val.upper()])
+                    q1 = np.asarray(read.init[val.upper()])
                     if val.upper() == "PORV":
                         q1 = q1[read.porv > 0]
                 elif val in ["index_i", "index_j", "index_k"]:
-                    q1 = np.array(
-                        get_indices(val, read.nx, read.ny, read.nz),
-                        dtype=float,
-                    )
-                    q1 = q1[read.porv > 0]
+                    q1 = np.asarray(
+                        get_indices(val, read.nx, read.ny, read.nz), dtype=read.dtype
+                    )[read.porv > 0]
                 elif read.unrst.count(val.upper(), nrst):
                     q1 = read.unrst[val.upper(), nrst]
                 elif val in mass_all:
@@ -1108,18 +1069,136 @@ def get_quantity(
     return unit, quan
 
 
+def get_porv(read: ReadData, name: str, nrst: int, filters: str) -> NDArray:
+    """Pore volumes for the quantity in the restart, zero in the filtered cells
+
+    The restart pore volumes (RPORV) are used for the quantities in the
+    restart file, and read.porv is returned unchanged otherwise."""
+    name0 = name.split(" ")[0].upper()
+    if (
+        not read.unrst
+        or read.init.count(name0)
+        or not read.unrst.count(name0, nrst)
+        or not read.unrst.count("RPORV", nrst)
+    ):
+        return read.porv
+    porv = read.porv.copy()
+    if not filters:
+        porv[porv > 0] = read.unrst["RPORV", nrst]
+        return porv
+    base_rporv = np.asarray(read.unrst["RPORV", nrst])
+    for value in filters.split("&"):
+        filte = value.strip().split(" ")
+        key = filte[0].upper()
+        if read.init.count(key):
+            q1 = np.asarray(read.init[key])
+        elif read.unrst.count(key, nrst):
+            q1 = np.asarray(read.unrst[key, nrst])
+        else:
+            print(f"Unknow filter quantity ({key}).")
+            sys.exit()
+        base_rporv = handle_filter(base_rporv, q1, filte[1], float(filte[2]))
+    porv[np.asarray(read.init["PORV"]) > 0] = base_rporv
+    return porv
+
+
+def get_regions(
+    cfg: ConfigPlopm, read: ReadData, deck: str, var: str, n: int
+) -> tuple[NDArray, str, dict[str, NDArray]]:
+    """Sum, mean, and pore-volume-weighted mean of the variable per region"""
+    key = cfg.regions.upper()
+    if not read.init.count(key):
+        print(f"Unknow -regions array ({key}).")
+        sys.exit()
+    labels, regions = np.unique(
+        np.array(read.init[key], dtype=int), return_inverse=True
+    )
+    nreg = labels.size
+    active = np.asarray(read.init["PORV"]) > 0
+    stats = {
+        stat: np.full((len(read.restart), nreg), np.nan)
+        for stat in ["sum", "mean", "pvmean"]
+    }
+    unit = get_unit(var)
+    for t, nrst in enumerate(read.restart):
+        unit, quan = get_quantity(
+            deck,
+            read,
+            var,
+            nrst,
+            float(cfg.adjust[n]),
+            cfg.mass,
+            cfg.mass + cfg.xmass,
+            cfg.caprock,
+            cfg.stress,
+            True,
+            "",
+            "",
+            cfg.csvs[n],
+        )
+        porv = get_porv(read, var, nrst, cfg.filter[n])[active]
+        valid = (porv > 0) & np.isfinite(quan)
+        index, quan, porv = regions[valid], np.asarray(quan)[valid], porv[valid]
+        count = np.bincount(index, minlength=nreg)
+        total = np.bincount(index, quan, nreg)
+        pv = np.bincount(index, porv, nreg)
+        stats["sum"][t] = total
+        np.divide(total, count, out=stats["mean"][t], where=count > 0)
+        np.divide(
+            np.bincount(index, quan * porv, nreg),
+            pv,
+            out=stats["pvmean"][t],
+            where=pv > 0,
+        )
+    return labels, unit, stats
+
+
+def get_stats(
+    cfg: ConfigPlopm, read: ReadData, deck: str, var: str, n: int
+) -> tuple[str, NDArray]:
+    """Minimum, maximum, mean, pore-volume-weighted mean, and percentiles"""
+    active = np.asarray(read.init["PORV"]) > 0
+    stats = np.full((len(read.restart), len(STATS)), np.nan)
+    unit = get_unit(var)
+    for t, nrst in enumerate(read.restart):
+        unit, quan = get_quantity(
+            deck,
+            read,
+            var,
+            nrst,
+            float(cfg.adjust[n]),
+            cfg.mass,
+            cfg.mass + cfg.xmass,
+            cfg.caprock,
+            cfg.stress,
+            True,
+            "",
+            "",
+            cfg.csvs[n],
+        )
+        porv = get_porv(read, var, nrst, cfg.filter[n])[active]
+        valid = (porv > 0) & np.isfinite(quan)
+        quan, porv = np.asarray(quan, dtype=float)[valid], porv[valid]
+        if not quan.size:
+            continue
+        stats[t, :3] = quan.min(), quan.max(), quan.mean()
+        stats[t, 3] = np.dot(quan, porv) / porv.sum()
+        stats[t, 4:] = np.percentile(quan, [1, 50, 99])
+    return unit, stats
+
+
 def handle_saturation(unrst: OpmRestart, name: str, nrst: int) -> NDArray:
     """Compute the oil saturation"""
     if unrst.count("SOIL", nrst):
-        soil = np.array(unrst["SOIL", nrst])
+        soil = np.asarray(unrst["SOIL", nrst])
     else:
         soil = np.array(0)
     if unrst.count("SGAS", nrst):
-        sgas = np.array(unrst["SGAS", nrst])
+        sgas = np.asarray(unrst["SGAS", nrst])
     else:
         sgas = np.array(0)
     if unrst.count("SWAT", nrst):
-        swat = np.array(unrst["SWAT", nrst])
+        swat = np.asarray(unrst["SWAT", nrst])
     else:
         swat = np.array(0)
     if name == "soil":
@@ -1130,69 +1209,59 @@ def handle_saturation(unrst: OpmRestart, name: str, nrst: int) -> NDArray:
 
 
 def handle_mass(read: ReadData, name: str, nrst: int) -> NDArray:
-    """Compute the mass (intensive quantities)"""
-    sgas = np.array(read.unrst["SGAS", nrst])
-    rhog = np.array(read.unrst["GAS_DEN", nrst])
-    rhow = np.array(read.unrst["WAT_DEN", nrst])
-    if read.unrst.count("RSW", nrst):
-        rsw = np.array(read.unrst["RSW", nrst])
-    else:
-        rsw = np.zeros_like(sgas)
-    if read.unrst.count("RVW", nrst):
-        rvw = np.array(read.unrst["RVW", nrst])
-    else:
-        rvw = np.zeros_like(sgas)
-    if read.unrst.count("RPORV", nrst):
-        rpv = np.array(read.unrst["RPORV", nrst])
-    else:
-        rpv = read.pv
-    denom_l = rsw + WAT_DEN_REF / GAS_DEN_REF
-    denom_g = rvw + GAS_DEN_REF / WAT_DEN_REF
-    x_l_co2 = np.zeros_like(rsw)
-    x_g_h2o = np.zeros_like(rvw)
-    mask_l = denom_l != 0
-    mask_g = denom_g != 0
-    x_l_co2[mask_l] = rsw[mask_l] / denom_l[mask_l]
-    x_g_h2o[mask_g] = rvw[mask_g] / denom_g[mask_g]
-    inv_sgas = 1.0 - sgas
-    inv_xg = 1.0 - x_g_h2o
-    inv_xl = 1.0 - x_l_co2
-    co2_g = inv_xg * sgas * rhog * rpv
-    co2_d = x_l_co2 * inv_sgas * rhow * rpv
-    h2o_l = inv_xl * inv_sgas * rhow * rpv
-    h2o_v = x_g_h2o * sgas * rhog * rpv
-    return type_of_mass(name, co2_g, co2_d, h2o_l, h2o_v, x_l_co2, x_g_h2o)
-
-
-def type_of_mass(
-    name: str,
-    co2_g: NDArray,
-    co2_d: NDArray,
-    h2o_l: NDArray,
-    h2o_v: NDArray,
-    x_l_co2: NDArray,
-    x_g_h2o: NDArray,
-) -> NDArray:
-    """From the given variable return the associated mass"""
-    if name == "gasm":
-        return co2_g
-    if name == "dism":
-        return co2_d
-    if name == "liqm":
-        return h2o_l
-    if name == "vapm":
-        return h2o_v
+    """Compute the mass (intensive quantities), only the needed terms"""
+    unrst = read.unrst
+    sgas = np.asarray(unrst["SGAS", nrst])
+    rpv = unrst["RPORV", nrst] if unrst.count("RPORV", nrst) else read.pv
+
+    def fraction(key: str, ratio: float) -> NDArray:
+        # mass fraction of the dissolved component (zero without RSW/RVW)
+        if not unrst.count(key, nrst):
+            return np.zeros_like(sgas)
+        rxw = np.asarray(unrst[key, nrst])
+        denom = rxw + ratio
+        frac = np.zeros_like(rxw)
+        np.divide(rxw, denom, out=frac, where=denom != 0)
+        return frac
+
+    def phase_mass(frac: NDArray, gas: bool) -> NDArray:
+        # frac * saturation * density * pore volume, reusing the frac buffer
+        if gas:
+            frac *= sgas
+            frac *= unrst["GAS_DEN", nrst]
+        else:
+            frac *= 1.0 - sgas
+            frac *= unrst["WAT_DEN", nrst]
+        if np.result_type(frac, rpv) == frac.dtype:
+            frac *= rpv
+            return frac
+        return frac * rpv
+
+    if name in ["xco2l", "xh2ol", "dism", "liqm"]:
+        frac = fraction("RSW", WAT_DEN_REF / GAS_DEN_REF)
+        if name == "xco2l":
+            return frac
+        if name == "xh2ol":
+            return 1 - frac
+        if name == "dism":
+            return phase_mass(frac, False)
+        return phase_mass(1.0 - frac, False)
+    if name in ["xh2ov", "xco2v", "gasm", "vapm"]:
+        frac = fraction("RVW", GAS_DEN_REF / WAT_DEN_REF)
+        if name == "xh2ov":
+            return frac
+        if name == "xco2v":
+            return 1 - frac
+        if name == "vapm":
+            return phase_mass(frac, True)
+        return phase_mass(1.0 - frac, True)
     if name == "h2om":
-        return h2o_v + h2o_l
-    if name == "xco2l":
-        return x_l_co2
-    if name == "xh2ov":
-        return x_g_h2o
-    if name == "xco2v":
-        return 1 - x_g_h2o
-    if name == "xh2ol":
-        return 1 - x_l_co2
-    return co2_g + co2_d
+        vapour = phase_mass(fraction("RVW", GAS_DEN_REF / WAT_DEN_REF), True)
+        vapour += phase_mass(1.0 - fraction("RSW", WAT_DEN_REF / GAS_DEN_REF), False)
+        return vapour
+    gas = phase_mass(1.0 - fraction("RVW", GAS_DEN_REF / WAT_DEN_REF), True)
+    gas += phase_mass(fraction("RSW", WAT_DEN_REF / GAS_DEN_REF), False)
+    return gas
 
 
 def handle_caprock(
@@ -1201,21 +1270,20 @@ def handle_caprock(
     """Compute quantities related to the caprock integrity"""
     init_dic = read.init
     unrst_dic = read.unrst
-    dz = np.array(init_dic["DZ", 0])
-    depth = np.array(init_dic["DEPTH", 0])
+    dz = np.asarray(init_dic["DZ", 0])
+    depth = np.asarray(init_dic["DEPTH", 0])
     dz_half = 0.5 * dz
-    dz_corr = 0.5 * dz
     if unrst_dic.count("WAT_DEN", 0) and unrst_dic.count("WAT_DEN", nrst):
-        den0 = np.array(unrst_dic["WAT_DEN", 0])
-        den1 = np.array(unrst_dic["WAT_DEN", nrst])
+        den0 = np.asarray(unrst_dic["WAT_DEN", 0])
+        den1 = np.asarray(unrst_dic["WAT_DEN", nrst])
     else:
         den0 = np.array(1000.0)
         den1 = np.array(1000.0)
     fac = 9.81 / 1e5
-    pz_c0 = fac * dz_corr * den0
-    pz_c1 = fac * dz_corr * den1
-    pressure0 = np.array(unrst_dic["PRESSURE", 0])
-    pressure1 = np.array(unrst_dic["PRESSURE", nrst])
+    pz_c0 = fac * dz_half * den0
+    pz_c1 = fac * dz_half * den1
+    pressure0 = np.asarray(unrst_dic["PRESSURE", 0])
+    pressure1 = np.asarray(unrst_dic["PRESSURE", nrst])
     limipres = stress * (depth - dz_half)
     overpres = limipres - (pressure1 - pz_c1)
     limipres -= pressure0 - pz_c0
@@ -1229,7 +1297,7 @@ def handle_caprock(
     return objepres, " [-]"
 
 
-def get_wells(cfg: ConfigPlopm, n: int) -> tuple[list, list]:
+def get_wells(cfg: ConfigPlopm, read: ReadData, n: int) -> tuple[list, list]:
     """Using the input deck (.DATA) to read the i,j well locations"""
     wells: list[list[list[int]]] = []
     lwells: list[str] = []
@@ -1291,9 +1359,7 @@ def get_wells(cfg: ConfigPlopm, n: int) -> tuple[list, list]:
                     ]
                 )
     if not cfg.global_:
-        sld_x = cfg.slide[n][0]
-        sld_y = cfg.slide[n][1]
-        sld_z = cfg.slide[n][2]
+        sld_x, sld_y, sld_z = resolve_slide(cfg.slide[n], read)
         whow = cfg.whow
         for i, wells_list in enumerate(wells):
             for j, well in enumerate(wells_list):
@@ -1323,7 +1389,7 @@ def get_wells(cfg: ConfigPlopm, n: int) -> tuple[list, list]:
     return wells, lwells
 
 
-def get_faults(cfg: ConfigPlopm, n: int) -> tuple[list, list]:
+def get_faults(cfg: ConfigPlopm, read: ReadData, n: int) -> tuple[list, list]:
     """Using the input deck (.DATA) to read the i,j fault locations"""
     faults: list[list[list[int]]] = []
     lfaults: list[str] = []
@@ -1362,9 +1428,7 @@ def get_faults(cfg: ConfigPlopm, n: int) -> tuple[list, list]:
                     ]
                 )
     if not cfg.global_:
-        sld_x = cfg.slide[n][0]
-        sld_y = cfg.slide[n][1]
-        sld_z = cfg.slide[n][2]
+        sld_x, sld_y, sld_z = resolve_slide(cfg.slide[n], read)
         whow = cfg.whow
         for i, flist in enumerate(faults):
             for j, fault in enumerate(flist):
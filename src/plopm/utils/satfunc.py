@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0914
+
+"""Utility methods to decode the saturation function tables in the INIT
+
+TABDIMS gives the first entry in TAB, the number of nodes, and the number of
+tables of the SWFN, SGFN, and SOFN families. Each family is stored column by
+column (saturation, function values, and derivatives) for all the table
+numbers, with the unused nodes set to 1e20."""
+
+import os
+import re
+import sys
+
+import numpy as np
+from numpy.typing import NDArray
+from opm.io.ecl import EclFile as OpmFile
+
+from plopm.config.config import ConfigPlopm, TableData
+
+# Family and column of each function
+FUNCTIONS = {
+    "krw": ("swfn", 1),
+    "pcow": ("swfn", 2),
+    "krg": ("sgfn", 1),
+    "pcog": ("sgfn", 2),
+    "pcwg": ("sgfn", 2),
+    "krow": ("sofn", 1),
+    "krog": ("sofn", 2),
+}
+# Positions in TABDIMS of the first entry, nodes, and tables of the family, and
+# phase (INTEHEAD[14]) it requires
+FAMILIES = {"swfn": (20, 21, 22, 2), "sgfn": (23, 24, 25, 4), "sofn": (26, 28, 29, 1)}
+SATFUNC = re.compile(rf"^({'|'.join(FUNCTIONS)})(\d+|\*)?(h?)$")
+
+
+def decode_tables(deck: str) -> TableData:
+    """All the saturation function tables and region numbers of the INIT"""
+    init = OpmFile(f"{deck}.INIT")
+    dims = init["TABDIMS"]
+    tab = np.array(init["TAB"])
+    phases = init["INTEHEAD"][14]
+    tables = TableData()
+    for family, (pos, pnodes, ptab, phase) in FAMILIES.items():
+        if not phases & phase:
+            continue
+        # Two phase decks only have the oil relative permeability in SOFN
+        ncol = 2 if family == "sofn" and phases != 7 else 3
+        nodes, ntab = dims[pnodes], dims[ptab]
+        block = tab[dims[pos] - 1 : dims[pos] - 1 + ncol * ntab * nodes]
+        block = block.reshape((ncol, ntab, nodes))
+        setattr(
+            tables,
+            family,
+            [block[:, n, block[0, n] <= 1.0].T.copy() for n in range(ntab)],
+        )
+    ntab = max(len(tables.swfn), len(tables.sgfn), len(tables.sofn))
+    if "SATNUM" in init:
+        satnum = np.array(init["SATNUM"])
+        tables.regions = np.unique(satnum).tolist()
+        if "IMBNUM" in init:
+            imbnum = np.array(init["IMBNUM"])
+            for snu in tables.regions:
+                tables.imbibition[snu] = int(
+                    np.bincount(imbnum[satnum == snu]).argmax()
+                )
+    else:
+        tables.regions = list(range(1, ntab + 1))
+    return tables
+
+
+def get_tables(cfg: ConfigPlopm, deck: str) -> TableData:
+    """Saturation function tables of the deck, decoded in the first call"""
+    if deck not in cfg.graph.tables:
+        if not os.path.isfile(f"{deck}.INIT"):
+            print(f"Saturation functions required {deck}.INIT")
+            sys.exit()
+        cfg.graph.tables[deck] = decode_tables(deck)
+    return cfg.graph.tables[deck]
+
+
+def expand_regions(cfg: ConfigPlopm, vrs: list[str]) -> list[str]:
+    """Saturation functions given with * replaced by the ones of all regions"""
+    expanded = []
+    for var in vrs:
+        match = SATFUNC.match(var)
+        if match and match.group(2) == "*":
+            regions = get_tables(cfg, cfg.names[0][0]).regions
+            expanded += [f"{match.group(1)}{snu}{match.group(3)}" for snu in regions]
+        else:
+            expanded.append(var)
+    return expanded
+
+
+def get_satfunc(cfg: ConfigPlopm, deck: str, name: str) -> tuple[NDArray, NDArray, str]:
+    """Saturations, values, and saturation label of the function
+
+    With hysteresis ('h' at the end), the imbibition branch is appended in
+    reverse order after the drainage one."""
+    what, number, hyst = SATFUNC.match(name).groups()  # type: ignore[union-attr]
+    tables = get_tables(cfg, deck)
+    family, column = FUNCTIONS[what]
+    curves = getattr(tables, family)
+    snu = int(number) if number else 1
+    branches = [snu]
+    if hyst:
+        branches.append(tables.imbibition.get(snu, len(curves) // 2 + snu))
+    if not 0 < max(branches) <= len(curves):
+        print(f"No {family.upper()} table {max(branches)} for {name} in {deck}.INIT")
+        sys.exit()
+    sats, values = [], []
+    for index, table in enumerate(branches):
+        curve = curves[table - 1]
+        sat, value = curve[:, 0], curve[:, min(column, curve.shape[1] - 1)]
+        if what == "krow":
+            sat, value = np.flip(1.0 - sat), np.flip(value)
+        elif what == "krog":
+            swco = tables.swfn[table - 1][0, 0] if tables.swfn else 0.0
+            sat, value = np.flip(1.0 - swco - sat), np.flip(value)
+        if family == "sofn":
+            # SOFN merges the oil saturations of the water and gas tables
+            inside = (sat >= 0.0) & (sat <= 1.0)
+            sat, value = sat[inside], value[inside]
+        sats.append(np.flip(sat) if index else sat)
+        values.append(np.flip(value) if index else value)
+    sat = np.concatenate(sats)
+    if family == "swfn" or what == "krow":
+        return sat, np.concatenate(values), "s$_w$ [-]"
+    if what == "krg" and "krw" in "".join(cfg.vrs):
+        return 1.0 - sat, np.concatenate(values), "s$_w$ [-]"
+    return sat, np.concatenate(values), "s$_g$ [-]"
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utility methods to split the ensembles in shards and merge their statistics
+
+With '-shard i/N', every N-th member of each group starting in the i-th one is
+read, and the partial statistics are written to a .npz instead of the figure.
+'plopm merge' combines the files of all the shards into the figure that
+'-ensemble' gives reading all the members on one machine, e.g.::
+
+    plopm -i ens/ -v fgip -ensemble 3 -shard 1/2
+    plopm -i ens/ -v fgip -ensemble 3 -shard 2/2
+    plopm merge ensemble_shard1of2.npz ensemble_shard2of2.npz
+"""
+
+import argparse
+import json
+import os
+import sys
+from functools import reduce
+from typing import Any
+
+import numpy as np
+
+from plopm.config.config import ConfigPlopm
+from plopm.utils.initialization import ini_cfg, ini_summary
+from plopm.utils.write_oned import ensemble_partials, make_plots, merge_partials
+
+# Options that change the statistics, which the shards must share (the other
+# ones, e.g., -o or -dpi, only change how the figure is written)
+STATISTICS = [
+    "input",
+    "variable",
+    "ensemble",
+    "restart",
+    "slide",
+    "tunits",
+    "adjust",
+    "csv",
+    "filter",
+    "how",
+    "distance",
+    "histogram",
+    "xunits",
+    "stress",
+    "precision",
+]
+
+
+def save_shard(cfg: ConfigPlopm, cmdargs: argparse.Namespace) -> None:
+    """Write the partial statistics of the members of the shard"""
+    arrays: dict[str, Any] = {}
+    for key, value in ensemble_partials(cfg).items():
+        value = np.asarray(value)
+        if value.dtype == object:
+            # the dates of the time grid
+            value = value.astype("datetime64[s]")
+        arrays[key] = value
+    options = {
+        **vars(cmdargs),
+        "input": "  ".join(" ".join(names) for names in cfg.names),
+        "shard": "",
+    }
+    arrays["options"] = np.array(json.dumps(options))
+    arrays["namens"] = np.array(json.dumps(cfg.namens))
+    arrays["shard"] = np.array(cfg.shard)
+    name = cfg.save[0] if cfg.save[0] else "ensemble"
+    np.savez(f"{cfg.output}/{name}_shard{cfg.shard[0]}of{cfg.shard[1]}.npz", **arrays)
+
+
+def load_shard(fname: str) -> dict[str, Any]:
+    """Partial statistics in the file of one shard"""
+    if not os.path.isfile(fname):
+        print(f"Unable to find the shard file {fname}.")
+        sys.exit()
+    with np.load(fname) as data:
+        return {
+            key: data[key][()] if data[key].ndim == 0 else data[key]
+            for key in data.files
+        }
+
+
+def merge_shards(argv: list[str]) -> ConfigPlopm:
+    """Figure of the ensemble from the partial statistics of all the shards"""
+    parser = argparse.ArgumentParser(
+        prog="plopm merge",
+        description="Combine the partial statistics written with -shard i/N",
+    )
+    parser.add_argument("files", nargs="+", help="Files of the shards (.npz)")
+    parser.add_argument(
+        "-o", "--output", default=".", help="The base name of the output folder"
+    )
+    cmdargs = parser.parse_args(argv)
+    parts = sorted(
+        (load_shard(fname) for fname in cmdargs.files),
+        key=lambda part: int(part["shard"][0]),
+    )
+    options = json.loads(str(parts[0]["options"]))
+    for part in parts[1:]:
+        other = json.loads(str(part["options"]))
+        if any(other[key] != options[key] for key in STATISTICS):
+            print("The shards were written for different decks or options.")
+            sys.exit()
+    nshards = int(parts[0]["shard"][1])
+    found = [int(part["shard"][0]) for part in parts]
+    if found != list(range(1, nshards + 1)) or any(
+        int(part["shard"][1]) != nshards for part in parts
+    ):
+        print(f"The shards {found} do not cover 1 to {nshards} once each.")
+        sys.exit()
+    for key in [key for key in parts[0] if key.startswith("time_")]:
+        if any(not np.array_equal(part[key], parts[0][key]) for part in parts):
+            print("The shards were written on different time grids.")
+            sys.exit()
+    cfg = ini_cfg(argparse.Namespace(**{**options, **vars(cmdargs)}))
+    cfg.namens = json.loads(str(parts[0]["namens"]))
+    cfg.partials = reduce(merge_partials, parts)
+    ini_summary(cfg)
+    make_plots(cfg)
+    return cfg
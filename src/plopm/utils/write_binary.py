@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0913,R0917
+
+"""Utility methods to write the csv outputs as binary columns (npz or feather)"""
+
+import json
+import sys
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def map_columns(
+    xc: NDArray, yc: NDArray, quaa: NDArray, mx: int, my: int, gaps: bool
+) -> dict[str, NDArray]:
+    """Centers and values of the cells of the map, the inactive ones as nan"""
+    xcs, ycs = np.broadcast_arrays(xc, yc)
+    columns = {
+        "x": 0.25 * (xcs[:-1, :-1] + xcs[1:, :-1] + xcs[:-1, 1:] + xcs[1:, 1:]),
+        "y": 0.25 * (ycs[:-1, :-1] + ycs[1:, :-1] + ycs[:-1, 1:] + ycs[1:, 1:]),
+        "value": np.asarray(quaa, dtype=float).reshape(my, mx),
+    }
+    if gaps:
+        # the maps of the decks leave a zero width quad between the cells
+        columns = {key: values[::2, ::2] for key, values in columns.items()}
+    return {key: np.ascontiguousarray(values) for key, values in columns.items()}
+
+
+def save_columns(
+    fname: str, mode: str, columns: dict[str, NDArray], meta: dict[str, Any]
+) -> None:
+    """Write the columns and the metadata without formatting the values
+
+    The numpy arrays are written as they are (npz) or wrapped without copies in
+    uncompressed Arrow IPC (feather) columns, which can be memory mapped."""
+    if mode == "npz":
+        arrays: dict[str, Any] = {key: np.asarray(value) for key, value in meta.items()}
+        np.savez(f"{fname}.npz", **{**columns, **arrays})
+        return
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        from pyarrow import feather
+    except ImportError:
+        print("'-m feather' requires pyarrow, install it with 'pip install pyarrow'.")
+        sys.exit()
+    shape = next(iter(columns.values())).shape
+    table = pa.table(
+        {key: pa.array(values.ravel()) for key, values in columns.items()},
+        metadata={
+            **{key: str(value) for key, value in meta.items()},
+            "shape": json.dumps(list(shape)),
+        },
+    )
+    feather.write_feather(table, f"{fname}.feather", compression="uncompressed")
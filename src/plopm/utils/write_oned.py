@@ -4,7 +4,9 @@
 
 """Utility functions to write the PNGs figures"""
 
-import warnings
+import csv
+from dataclasses import replace
+from typing import Any
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -15,7 +17,16 @@ from scipy.interpolate import interp1d
 from scipy.stats import lognorm, norm
 
 from plopm.config.config import ConfigPlopm
-from plopm.utils.readers import read_oned
+from plopm.utils.readers import (
+    STATS,
+    get_readers,
+    get_regions,
+    get_stats,
+    initialize_time,
+    read_oned,
+)
+from plopm.utils.satfunc import SATFUNC
+from plopm.utils.write_binary import save_columns
 
 
 def make_plots(cfg: ConfigPlopm) -> None:
@@ -86,15 +97,33 @@ def make_plots(cfg: ConfigPlopm) -> None:
             axis.set_yticks(ticks)
             axis.set_yticklabels(formatted_labels)
 
-    def save_summary_csv(deckn: str, var: NDArray, quan: str, index: int) -> None:
-        text = [f"{val}\n" for val in var if not np.isnan(val)]
+    def save_summary_csv(
+        deckn: str, time: NDArray, var: NDArray, quan: str, index: int, units: tuple
+    ) -> None:
         name = clean_name(f"{deckn}_{quan}")
         if cfg.save[index]:
             name = cfg.save[index]
+        if cfg.binary:
+            save_columns(
+                f"{cfg.output}/{name}",
+                cfg.binary,
+                {
+                    "time": np.asarray(
+                        time, dtype="datetime64[s]" if units[0] == "Dates" else float
+                    ),
+                    "value": np.asarray(var, dtype=float),
+                },
+                {"deck": deckn, "variable": quan, "tunit": units[0], "unit": units[1]},
+            )
+            return
+        text = [f"{val}\n" for val in var if not np.isnan(val)]
         with open(f"{cfg.output}/{name}.csv", "w", encoding="utf8") as file:
             file.write("".join(text))
 
     def save_summary_png(deckn: str, quan: str, index: int, fig: Figure) -> None:
+        if cfg.figures is not None:
+            cfg.figures.append(fig)
+            return
         name = clean_name(f"{deckn}_{quan}")
         fig.savefig(
             f"{cfg.output}/{cfg.save[index] if cfg.save[index] else name}.png",
@@ -105,16 +134,17 @@ def make_plots(cfg: ConfigPlopm) -> None:
     deckn = get_deck_name(cfg.names[0][0])
     fig, _ = plt.subplots(1, 1)
     if cfg.ensemble == 0 and not cfg.subfigs[0] and len(cfg.names[0]) < len(cfg.vrs):
-        cfg.names[0] = [cfg.names[0][0]] * len(cfg.vrs)
-        if len(cfg.lw[0]) < len(cfg.vrs):
-            cfg.lw[0] = [cfg.lw[0][0]] * len(cfg.vrs)
-            cfg.lw = [cfg.lw[0]] * len(cfg.vrs)
-        if len(cfg.colors[0]) < len(cfg.vrs):
-            cfg.colors[0] = [cfg.colors[0][0]] * len(cfg.vrs)
-            cfg.colors = [cfg.colors[0]] * len(cfg.vrs)
-        if len(cfg.linestyle[0]) < len(cfg.vrs):
-            cfg.linestyle[0] = [cfg.linestyle[0][0]] * len(cfg.vrs)
-            cfg.linestyle = [cfg.linestyle[0]] * len(cfg.vrs)
+        # Local copy of the configuration, the one of the caller is not modified
+        nvrs = len(cfg.vrs)
+        cfg = replace(
+            cfg, names=[[cfg.names[0][0]] * nvrs] + [list(v) for v in cfg.names[1:]]
+        )
+        if len(cfg.lw[0]) < nvrs:
+            cfg.lw = [[cfg.lw[0][0]] * nvrs for _ in range(nvrs)]
+        if len(cfg.colors[0]) < nvrs:
+            cfg.colors = [[cfg.colors[0][0]] * nvrs for _ in range(nvrs)]
+        if len(cfg.linestyle[0]) < nvrs:
+            cfg.linestyle = [[cfg.linestyle[0][0]] * nvrs for _ in range(nvrs)]
     if cfg.subfigs[0]:
         plt.close()
         fig, axiss = plt.subplots(
@@ -268,7 +298,7 @@ def make_plots(cfg: ConfigPlopm) -> None:
             axis.tick_params(axis="x", which="both", bottom=False, labelbottom=False)
         if len(cfg.vrs) == len(cfg.names[0]) and not cfg.subfigs[0]:
             if cfg.csv:
-                save_summary_csv(deckn, var, quan, j)
+                save_summary_csv(deckn, time, var, quan, j, (tunit, vunit.strip()))
                 return
             save_summary_png(deckn, quan, j, fig)
             return
@@ -313,63 +343,244 @@ def make_plots(cfg: ConfigPlopm) -> None:
     plt.close()
 
 
+def make_regions(cfg: ConfigPlopm) -> None:
+    """Plot the variables aggregated per region and save them as csv"""
+    tskl, tunit = initialize_time(cfg.tunits[0])
+    if tunit == "Dates":
+        tskl, tunit = initialize_time("d")
+    for n, deck in enumerate(cfg.names[0]):
+        read = get_readers(
+            deck, True, False, cfg.vrs, cfg.restart, cfg.filter, n, cfg.precision
+        )
+        time = tskl * np.array([read.tnrst[nrst] for nrst in read.restart])
+        for j, var in enumerate(cfg.vrs):
+            labels, unit, stats = get_regions(cfg, read, deck, var, n)
+            name = f"{deck.split('/')[-1].lower()}_{var}_{cfg.regions}"
+            name = name.replace(" / ", "_over_").replace(" ", "")
+            if cfg.save[0]:
+                name = (
+                    cfg.save[0]
+                    if len(cfg.names[0]) * len(cfg.vrs) == 1
+                    else (f"{cfg.save[0]}_{n}_{j}")
+                )
+            header = ",".join([tunit] + [f"{cfg.regions} {val}" for val in labels])
+            for stat, values in stats.items():
+                np.savetxt(
+                    f"{cfg.output}/{name}_{stat}.csv",
+                    np.column_stack([time, values]),
+                    delimiter=",",
+                    header=header,
+                    comments="",
+                )
+            if cfg.csv:
+                continue
+            how = cfg.how[0] or ("sum" if var in cfg.mass else "pvmean")
+            fig, axis = plt.subplots(1, 1, layout="compressed")
+            colors = plt.colormaps.get_cmap("tab20")
+            for r, label in enumerate(labels):
+                axis.plot(
+                    time,
+                    stats[how][:, r],
+                    color=colors(r % 20),
+                    lw=float(cfg.lw_values[0]),
+                    label=f"{cfg.regions} {label}",
+                )
+            axis.set_xlabel(cfg.xlabel[0] if cfg.xlabel[0] else tunit)
+            axis.set_ylabel(cfg.ylabel[0] if cfg.ylabel[0] else f"{var} ({how}){unit}")
+            axis.grid(bool(int(cfg.axgrid[0])))
+            if labels.size <= 20 and cfg.loc[0] != "empty":
+                axis.legend(loc=cfg.loc[0])
+            if cfg.title[0] != "0":
+                axis.set_title(cfg.title[0])
+            if cfg.figures is not None:
+                cfg.figures.append(fig)
+            else:
+                fig.savefig(
+                    f"{cfg.output}/{name}.png",
+                    bbox_inches="tight",
+                    dpi=int(cfg.dpi[0]),
+                )
+            plt.close()
+
+
+def make_stats(cfg: ConfigPlopm) -> None:
+    """Save the statistics of the variables per restart as csv and npz"""
+    tskl, tunit = initialize_time(cfg.tunits[0])
+    if tunit == "Dates":
+        tskl, tunit = initialize_time("d")
+    name = cfg.save[0] if cfg.save[0] else "stats"
+    columns: dict[str, list] = {
+        key: [] for key in ["deck", "variable", "restart", "time"] + STATS
+    }
+    for n, deck in enumerate(cfg.names[0]):
+        read = get_readers(
+            deck, True, False, cfg.vrs, cfg.restart, cfg.filter, n, cfg.precision
+        )
+        time = tskl * np.array([read.tnrst[nrst] for nrst in read.restart])
+        case = deck.split("/")[-1].lower()
+        for var in cfg.vrs:
+            unit, stats = get_stats(cfg, read, deck, var, n)
+            columns["deck"] += [case] * len(read.restart)
+            columns["variable"] += [var] * len(read.restart)
+            columns["restart"] += list(read.restart)
+            columns["time"] += list(time)
+            for i, stat in enumerate(STATS):
+                columns[stat] += list(stats[:, i])
+            if not cfg.how[0]:
+                continue
+            fig, axis = plt.subplots(1, 1, layout="compressed")
+            for stat in cfg.how[0].split(","):
+                axis.plot(
+                    time,
+                    stats[:, STATS.index(stat)],
+                    lw=float(cfg.lw_values[0]),
+                    label=stat,
+                )
+            axis.set_xlabel(cfg.xlabel[0] if cfg.xlabel[0] else tunit)
+            axis.set_ylabel(cfg.ylabel[0] if cfg.ylabel[0] else f"{var}{unit}")
+            axis.grid(bool(int(cfg.axgrid[0])))
+            if cfg.loc[0] != "empty":
+                axis.legend(loc=cfg.loc[0])
+            if cfg.title[0] != "0":
+                axis.set_title(cfg.title[0])
+            if cfg.figures is not None:
+                cfg.figures.append(fig)
+            else:
+                fname = f"{name}_{case}_{var}".replace(" / ", "_over_")
+                fig.savefig(
+                    f"{cfg.output}/{fname.replace(' ', '')}.png",
+                    bbox_inches="tight",
+                    dpi=int(cfg.dpi[0]),
+                )
+            plt.close()
+    with open(f"{cfg.output}/{name}.csv", "w", encoding="utf8", newline="") as file:
+        writer = csv.writer(file, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+    arrays: dict[str, Any] = {key: np.array(val) for key, val in columns.items()}
+    np.savez(f"{cfg.output}/{name}.npz", **arrays)
+
+
+def ensemble_partials(cfg: ConfigPlopm) -> dict[str, Any]:
+    """Counts, means, and squared deviations on the time grid, and the members
+    with the lowest and highest sums, for the members of the shard
+
+    The statistics of several shards are combined with merge_partials. Without
+    -shard, the time grid is the longest one of the members; with -shard, it is
+    the one of the first member of each group, so all shards share it."""
+    var_name = cfg.vrs[0]
+    match = SATFUNC.match(var_name)
+    hyst = 2 if match and match.group(3) else 1
+    shard, nshards = cfg.shard if cfg.shard else [1, 1]
+    thetime, timeeval = np.array([0]), np.array([0])
+    partials: dict[str, Any] = {}
+
+    def read_branch(name: str, index: int, hyst_index: int) -> tuple:
+        time, var, tunit, vunit = read_oned(
+            cfg,
+            name,
+            var_name,
+            cfg.tunits[0],
+            float(cfg.adjust[0]),
+            index,
+        )
+        rng = int(1.0 * len(time) / hyst)
+        time = time[hyst_index * rng : (hyst_index + 1) * rng]
+        var = var[hyst_index * rng : (hyst_index + 1) * rng]
+        timeeval = time
+        if tunit == "Dates":
+            timeeval = np.array([value.timestamp() for value in time], dtype=float)
+        return time, timeeval, var, tunit, vunit
+
+    for hyst_index in range(hyst):
+        for names_index, names in enumerate(cfg.names):
+            if nshards > 1:
+                thetime, timeeval, _, tunit, vunit = read_branch(
+                    names[0], 0, hyst_index
+                )
+            members, tmp = [], []
+            for name_index, name in enumerate(names):
+                if name_index % nshards != shard - 1:
+                    continue
+                time, evaluation, var, tunit, vunit = read_branch(
+                    name, name_index, hyst_index
+                )
+                if nshards == 1 and time.size > thetime.size:
+                    thetime, timeeval = time.copy(), evaluation.copy()
+                members.append(name)
+                tmp.append(interp1d(evaluation, var, bounds_error=False))
+            values = np.array([value(timeeval) for value in tmp], dtype=float).reshape(
+                len(tmp), len(timeeval)
+            )
+            count = np.sum(~np.isnan(values), axis=0)
+            means = np.divide(
+                np.nansum(values, axis=0),
+                count,
+                out=np.zeros(count.size),
+                where=count > 0,
+            )
+            sums = np.nansum(values, axis=1)
+            key = f"{hyst_index}_{names_index}"
+            partials[f"time_{key}"] = thetime
+            partials[f"count_{key}"] = count
+            partials[f"mean_{key}"] = means
+            partials[f"m2_{key}"] = np.nansum((values - means) ** 2, axis=0)
+            for end, pick in (("low", np.argmin), ("high", np.argmax)):
+                member = int(pick(sums)) if members else -1
+                partials[f"{end}_{key}"] = (
+                    values[member] if members else np.full(count.size, np.nan)
+                )
+                partials[f"{end}sum_{key}"] = (
+                    sums[member] if members else np.inf * (1 if end == "low" else -1)
+                )
+                partials[f"{end}name_{key}"] = members[member] if members else ""
+    partials["tunit"], partials["vunit"] = tunit, vunit
+    return partials
+
+
+def merge_partials(first: dict[str, Any], second: dict[str, Any]) -> dict[str, Any]:
+    """Statistics of the members of both partials (Chan et al. update)"""
+    merged = dict(first)
+    for key in [key[6:] for key in first if key.startswith("count_")]:
+        count_a, count_b = first[f"count_{key}"], second[f"count_{key}"]
+        count = count_a + count_b
+        delta = second[f"mean_{key}"] - first[f"mean_{key}"]
+        ratio = np.divide(count_b, count, out=np.zeros(count.size), where=count > 0)
+        merged[f"count_{key}"] = count
+        merged[f"mean_{key}"] = first[f"mean_{key}"] + delta * ratio
+        merged[f"m2_{key}"] = (
+            first[f"m2_{key}"] + second[f"m2_{key}"] + delta**2 * count_a * ratio
+        )
+        for end, better in (("low", np.less), ("high", np.greater)):
+            if better(second[f"{end}sum_{key}"], first[f"{end}sum_{key}"]):
+                for name in [end, f"{end}sum", f"{end}name"]:
+                    merged[f"{name}_{key}"] = second[f"{name}_{key}"]
+    return merged
+
+
 def handle_ensemble(
     cfg: ConfigPlopm, axiss: Axes | np.ndarray
 ) -> tuple[str, str, float, float, float, float]:
     """Compute the mean and create the band"""
     axis = axiss if isinstance(axiss, Axes) else np.ravel(axiss)[0]
-    thetime, timeeval = np.array([0]), np.array([0])
+    partials = cfg.partials if cfg.partials else ensemble_partials(cfg)
+    tunit, vunit = str(partials["tunit"]), str(partials["vunit"])
     min_v, max_v = np.inf, -np.inf
-    hyst = 1
-    var_name = cfg.vrs[0]
-    if (
-        var_name[:3] in ["krw", "krg"]
-        or var_name[:4]
-        in [
-            "krow",
-            "krog",
-            "pcow",
-            "pcog",
-            "pcwg",
-        ]
-        and var_name[-1] == "h"
-    ):
-        hyst = 2
+    match = SATFUNC.match(cfg.vrs[0])
+    hyst = 2 if match and match.group(3) else 1
+    thetime = np.array([0])
     for hyst_index in range(hyst):
-        for names_index, names in enumerate(cfg.names):
+        for names_index in range(len(cfg.names)):
+            key = f"{hyst_index}_{names_index}"
             label = cfg.namens[0][names_index] + " (mean)"
             if len(label.split("/")) > 1:
                 label = label.split("/")[-2] + "/" + label.split("/")[-1]
             if cfg.labels[0][0]:
                 label = cfg.labels[names_index][0]
-            tmp = []
-            for name_index, name in enumerate(names):
-                time, var, tunit, vunit = read_oned(
-                    cfg,
-                    name,
-                    var_name,
-                    cfg.tunits[0],
-                    float(cfg.adjust[0]),
-                    name_index,
-                )
-                rng = int(1.0 * len(time) / hyst)
-                time = time[hyst_index * rng : (hyst_index + 1) * rng]
-                var = var[hyst_index * rng : (hyst_index + 1) * rng]
-                if time.size > thetime.size:
-                    thetime = time.copy()
-                if tunit == "Dates":
-                    time = np.array([value.timestamp() for value in time], dtype=float)
-                    if time.size > timeeval.size:
-                        timeeval = time.copy()
-                else:
-                    timeeval = thetime
-                tmp.append(interp1d(time, var, bounds_error=False))
-            values = np.array([value(timeeval) for value in tmp])
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", message="Mean of empty slice")
-                warnings.filterwarnings("ignore", message="Degrees of freedom <= 0")
-                means = np.nanmean(values, axis=0)
-                stdev = np.nanstd(values, axis=0)
+            thetime, count = partials[f"time_{key}"], partials[f"count_{key}"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                means = np.where(count > 0, partials[f"mean_{key}"], np.nan)
+                stdev = np.sqrt(partials[f"m2_{key}"] / count)
             plot_label = label if hyst_index == hyst - 1 else None
             axis.plot(
                 thetime,
@@ -398,36 +609,24 @@ def handle_ensemble(
                     max_v = max(max_v, np.nanmax(upper_band))
             if cfg.ensemble in [2, 3]:
                 ensemble_index = len(cfg.names) + names_index
-                maxs = np.nansum(values + means, axis=1)
-                mins = np.nansum(values - means, axis=1)
-                maxs = np.where(maxs == np.max(maxs))[0][0]
-                mins = np.where(mins == np.min(mins))[0][0]
-                labell = names[mins] + " (lower)"
-                labelu = names[maxs] + " (upper)"
+                labell = f"{partials[f'lowname_{key}']} (lower)"
+                labelu = f"{partials[f'highname_{key}']} (upper)"
                 if cfg.labels[0][0]:
                     labell = cfg.labels[names_index][1]
                     labelu = cfg.labels[names_index][2]
-                lower_label = labell if hyst_index == hyst - 1 else None
-                upper_label = labelu if hyst_index == hyst - 1 else None
-                axis.plot(
-                    thetime,
-                    values[mins],
-                    color=cfg.colors[0][ensemble_index],
-                    ls=cfg.linestyle[0][ensemble_index],
-                    label=lower_label,
-                    lw=float(cfg.lw[0][names_index]),
-                )
-                axis.plot(
-                    thetime,
-                    values[maxs],
-                    color=cfg.colors[0][ensemble_index],
-                    ls=cfg.linestyle[0][ensemble_index],
-                    label=upper_label,
-                    lw=float(cfg.lw[0][names_index]),
-                )
-                if np.any(~np.isnan(values[mins])):
-                    min_v = min(min_v, np.nanmin(values[mins]))
-                if np.any(~np.isnan(values[maxs])):
-                    max_v = max(max_v, np.nanmax(values[maxs]))
+                for end, end_label in (("low", labell), ("high", labelu)):
+                    values = partials[f"{end}_{key}"]
+                    axis.plot(
+                        thetime,
+                        values,
+                        color=cfg.colors[0][ensemble_index],
+                        ls=cfg.linestyle[0][ensemble_index],
+                        label=end_label if hyst_index == hyst - 1 else None,
+                        lw=float(cfg.lw[0][names_index]),
+                    )
+                    if np.any(~np.isnan(values)) and end == "low":
+                        min_v = min(min_v, np.nanmin(values))
+                    elif np.any(~np.isnan(values)):
+                        max_v = max(max_v, np.nanmax(values))
     min_t, max_t = thetime[0], thetime[-1]
     return tunit, vunit, min_t, max_t, min_v, max_v
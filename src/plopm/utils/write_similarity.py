@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0914
+
+"""Utility methods to compare the fields of the ensemble members pairwise
+
+Each member is read once into a disk-backed array of centered values, and the
+Gram matrix of all pairs is then accumulated over chunks of cells, so the
+memory use does not depend on the number of members times cells."""
+
+import csv
+import os
+import sys
+import tempfile
+
+import matplotlib.pyplot as plt
+import numpy as np
+from numpy.typing import NDArray
+
+from plopm.config.config import ConfigPlopm
+from plopm.utils.planner import MEMORY
+from plopm.utils.readers import get_porv, get_quantity, get_readers
+
+METRICS = ["rmse", "corr"]
+
+
+def pairwise_metric(fields: NDArray, means: NDArray, metric: str) -> NDArray:
+    """RMSE or correlation between the rows of the centered fields
+
+    With c the centered rows, ||x_i - x_j||^2 = G_ii + G_jj - 2 G_ij +
+    ncells (m_i - m_j)^2 for the Gram matrix G = c c^T."""
+    nmembers, ncells = fields.shape
+    chunk = max(1, MEMORY // (16 * nmembers))
+    gram = np.zeros((nmembers, nmembers))
+    for first in range(0, ncells, chunk):
+        block = np.asarray(fields[:, first : first + chunk], dtype=float)
+        gram += block @ block.T
+    diag = np.diag(gram)
+    if metric == "corr":
+        norm = np.sqrt(np.outer(diag, diag))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(norm > 0, gram / norm, np.nan)
+    dist = diag[:, None] + diag[None, :] - 2 * gram
+    dist += ncells * (means[:, None] - means[None, :]) ** 2
+    return np.sqrt(np.maximum(dist, 0) / ncells)
+
+
+def read_member(
+    cfg: ConfigPlopm, var: str, index: int, n: int
+) -> tuple[NDArray, NDArray]:
+    """Field of the active cells of the member and the cells kept by -filter"""
+    deck = cfg.names[0][n]
+    read = get_readers(
+        deck, False, False, cfg.vrs, cfg.restart, cfg.filter, n, cfg.precision
+    )
+    active = np.asarray(read.init["PORV"]) > 0
+    nrst = read.restart[0]
+    _, quan = get_quantity(
+        deck,
+        read,
+        var,
+        nrst,
+        float(cfg.adjust[index]),
+        cfg.mass,
+        cfg.mass + cfg.xmass,
+        cfg.caprock,
+        cfg.stress,
+        True,
+        "",
+        "",
+        cfg.csvs[n],
+    )
+    kept = get_porv(read, var, nrst, cfg.filter[n])[active] > 0
+    return np.asarray(quan, dtype=float), kept
+
+
+def read_members(
+    cfg: ConfigPlopm, var: str, index: int, fname: str
+) -> tuple[np.memmap, NDArray]:
+    """Centered field of each member in a memory map and the member means
+
+    The cells kept by -filter in the first member are used for all."""
+    quan, kept = read_member(cfg, var, index, 0)
+    means = np.zeros(len(cfg.names[0]))
+    fields = np.memmap(fname, dtype=float, mode="w+", shape=(means.size, kept.sum()))
+    for n, deck in enumerate(cfg.names[0]):
+        if n:
+            quan, _ = read_member(cfg, var, index, n)
+        if quan.size != kept.size:
+            print(
+                f"The active cells of {deck} differ from the ones of "
+                f"{cfg.names[0][0]}, the members must share the grid."
+            )
+            sys.exit()
+        means[n] = quan[kept].mean()
+        fields[n] = quan[kept] - means[n]
+    fields.flush()
+    return fields, means
+
+
+def make_similarity(cfg: ConfigPlopm) -> None:
+    """Save the matrix of pairwise RMSE or correlation as csv and heatmap"""
+    metric = cfg.how[0] if cfg.how[0] else "rmse"
+    prefix = cfg.save[0] if cfg.save[0] else "similarity"
+    members = [deck.split("/")[-1].lower() for deck in cfg.names[0]]
+    for index, var in enumerate(cfg.vrs):
+        with tempfile.TemporaryDirectory(dir=cfg.output) as tmp:
+            fields, means = read_members(cfg, var, index, os.path.join(tmp, "fields"))
+            matrix = pairwise_metric(fields, means, metric)
+            del fields
+        name = f"{prefix}_{var}".replace(" / ", "_over_").replace(" ", "")
+        with open(f"{cfg.output}/{name}.csv", "w", encoding="utf8", newline="") as file:
+            writer = csv.writer(file, quoting=csv.QUOTE_NONNUMERIC)
+            writer.writerow(["member"] + members)
+            writer.writerows(
+                [member] + list(row) for member, row in zip(members, matrix)
+            )
+        fig, axis = plt.subplots(1, 1, layout="compressed")
+        image = axis.imshow(
+            matrix,
+            cmap=cfg.colors_raw or ("RdBu_r" if metric == "corr" else "viridis"),
+            vmin=-1 if metric == "corr" else None,
+            vmax=1 if metric == "corr" else None,
+            interpolation="nearest",
+        )
+        if len(members) <= 50:
+            ticks = range(len(members))
+            axis.set_xticks(ticks, members, rotation=90)
+            axis.set_yticks(ticks, members)
+        fig.colorbar(image, label=f"{metric} of {var}")
+        if cfg.title[0] != "0":
+            axis.set_title(cfg.title[0])
+        if cfg.figures is not None:
+            cfg.figures.append(fig)
+        else:
+            fig.savefig(
+                f"{cfg.output}/{name}.png", bbox_inches="tight", dpi=int(cfg.dpi[0])
+            )
+        plt.close()
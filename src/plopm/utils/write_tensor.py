@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0914
+
+"""Utility methods to write the variables as dense (time, k, j, i) tensors
+
+Each variable is written one restart at a time into a memory-mapped .npy, so
+the size of the tensor is not limited by the available memory."""
+
+import json
+import sys
+from typing import Any
+
+import numpy as np
+
+from plopm.config.config import ConfigPlopm, ReadData
+from plopm.utils.readers import get_porv, get_quantity, get_readers, get_unit
+
+GEOMETRY = ["DEPTH", "DX", "DY", "DZ", "PORO"]
+
+
+def dense(read: ReadData, values: np.ndarray, active: np.ndarray) -> np.ndarray:
+    """Values of the active cells on the (k, j, i) grid, nan elsewhere"""
+    full = np.full(read.nxyz, np.nan, dtype=read.dtype)
+    full[active] = values
+    return full.reshape((read.nz, read.ny, read.nx))
+
+
+def write_geometry(read: ReadData, fname: str) -> None:
+    """Active cells, pore volumes, and cell sizes and depths on the grid"""
+    porv = np.asarray(read.init["PORV"])
+    active = porv > 0
+    arrays: dict[str, Any] = {
+        "ACTNUM": active.reshape((read.nz, read.ny, read.nx)),
+        "PORV": dense(read, porv[active], active),
+    }
+    for name in GEOMETRY:
+        if read.init.count(name):
+            arrays[name] = dense(read, np.asarray(read.init[name]), active)
+    np.savez(fname, **arrays)
+
+
+def make_tensors(cfg: ConfigPlopm) -> None:
+    """Save each variable as a (time, nz, ny, nx) .npy with a json sidecar"""
+    prefix = cfg.save[0] if cfg.save[0] else "tensor"
+    for n, deck in enumerate(cfg.names[0]):
+        read = get_readers(
+            deck, True, False, cfg.vrs, cfg.restart, cfg.filter, n, cfg.precision
+        )
+        if not read.nxyz or read.nx * read.ny * read.nz != read.nxyz:
+            print(f"'-m tensor' requires {deck}.EGRID for the grid dimensions.")
+            sys.exit()
+        case = deck.split("/")[-1].lower()
+        name = f"{prefix}_{case}"
+        active = np.asarray(read.init["PORV"]) > 0
+        meta: dict = {
+            "deck": deck,
+            "shape": [len(read.restart), read.nz, read.ny, read.nx],
+            "axes": ["time", "k", "j", "i"],
+            "dtype": np.dtype(read.dtype).name,
+            "fill": "nan",
+            "restarts": list(read.restart),
+            "times": [float(read.tnrst[nrst]) for nrst in read.restart],
+            "dates": [
+                read.dates[nrst].isoformat() if nrst in read.dates else None
+                for nrst in read.restart
+            ],
+            "geometry": f"{name}_geometry.npz",
+            "variables": {},
+        }
+        write_geometry(read, f"{cfg.output}/{meta['geometry']}")
+        for var in cfg.vrs:
+            fname = f"{name}_{var}".replace(" / ", "_over_").replace(" ", "")
+            tensor = np.lib.format.open_memmap(
+                f"{cfg.output}/{fname}.npy",
+                mode="w+",
+                dtype=read.dtype,
+                shape=tuple(meta["shape"]),
+            )
+            unit = get_unit(var)
+            for t, nrst in enumerate(read.restart):
+                unit, quan = get_quantity(
+                    deck,
+                    read,
+                    var,
+                    nrst,
+                    float(cfg.adjust[n]),
+                    cfg.mass,
+                    cfg.mass + cfg.xmass,
+                    cfg.caprock,
+                    cfg.stress,
+                    True,
+                    "",
+                    "",
+                    cfg.csvs[n],
+                )
+                if cfg.filter[n]:
+                    kept = get_porv(read, var, nrst, cfg.filter[n])[active] > 0
+                    quan = np.where(kept, quan, np.nan)
+                tensor[t] = dense(read, quan, active)
+                tensor.flush()
+            del tensor
+            meta["variables"][var] = {"file": f"{fname}.npy", "unit": unit.strip()}
+        with open(f"{cfg.output}/{name}.json", "w", encoding="utf8") as file:
+            json.dump(meta, file, indent=1)
@@ -4,10 +4,12 @@
 
 """Utility functions to write the 2D figures (PNGs and GIFs)"""
 
-import datetime
+import copy
 import sys
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import nullcontext
+from dataclasses import replace
 from typing import Any
 
 import colorcet  # noqa: F401  # registers colorcet colormaps with matplotlib
@@ -17,48 +19,93 @@ import matplotlib.ticker as mticker
 import numpy as np
 from alive_progress import alive_bar
 from matplotlib import animation, colors
-from matplotlib.animation import FuncAnimation, writers
+from matplotlib.animation import FuncAnimation
 from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 from matplotlib.cm import ScalarMappable
 from matplotlib.figure import Figure
+from matplotlib.image import AxesImage, PcolorImage
 from matplotlib.ticker import LogFormatter
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from mpl_toolkits.axes_grid1.axes_divider import AxesDivider
 from numpy.typing import NDArray
 
-from plopm.config.config import ConfigPlopm, ReadData
+from plopm.config.config import ConfigPlopm, DiffData, ReadData
+from plopm.utils.csvcache import preload_columns
+from plopm.utils.manifest import (
+    is_current,
+    load_manifest,
+    make_entry,
+    record,
+    save_manifest,
+)
 from plopm.utils.mapping import (
+    decimate_slide,
+    get_rectilinear_edges,
+    handle_section,
     handle_slide_x,
     handle_slide_y,
     handle_slide_z,
+    map_section,
     map_xycoords,
     map_xzcoords,
     map_yzcoords,
     rotate_grid,
 )
+from plopm.utils.planner import GRIDS, MEMORY, WORKERS, pool_map
 from plopm.utils.readers import (
     get_csvs,
     get_faults,
+    get_porv,
     get_quantity,
     get_readers,
+    get_section,
     get_wells,
     initialize_time,
 )
+from plopm.utils.write_binary import map_columns, save_columns
+from plopm.utils.write_video import get_gif_writer, get_video_writer
 
 
 def prepare_maps(
     cfg: ConfigPlopm, deck: str, n: int
 ) -> tuple[ReadData, NDArray, NDArray, str, str, str, int, int, str, str]:
-    """Get the spatial coordinates"""
+    """Get the spatial coordinates, once per run for each deck and slide"""
+    key = (deck, n, str(cfg.slide[n]))
+    if key in cfg.graph.grids:
+        return cfg.graph.grids[key]
     if cfg.csvs[n][0]:
+        if cfg.gif:
+            preload_columns(
+                [f"{deck.replace('PLOPM', str(nrst))}.csv" for nrst in cfg.restart],
+                [cfg.csvs[n][2] - 1],
+            )
         xc, yc, mx, my, xname, yname = get_csvs(cfg, deck, n)
         slidet, sliden = "", ""
         read = ReadData(restart=cfg.restart)
     else:
-        read = get_readers(deck, cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter, n)
+        if (deck, n) not in cfg.graph.readers:
+            if len(cfg.graph.readers) >= GRIDS:
+                del cfg.graph.readers[next(iter(cfg.graph.readers))]
+            read = get_readers(
+                deck,
+                cfg.gif,
+                cfg.vtk,
+                cfg.vrs,
+                cfg.restart,
+                cfg.filter,
+                n,
+                cfg.precision,
+            )
+            if cfg.section:
+                # the crossed cells are found once and gathered at each restart
+                read = replace(read, section=get_section(cfg, deck, read))
+            cfg.graph.readers[(deck, n)] = read
+        read = cfg.graph.readers[(deck, n)]
         slide = cfg.slide[n]
-        if slide[0][0] != -2:
+        if cfg.section:
+            xc, yc, slidet, sliden, mx, my, xname, yname = handle_section(read)
+        elif slide[0][0] != -2:
             xc, yc, slidet, sliden, mx, my, xname, yname = handle_slide_x(cfg, read, n)
         elif slide[1][0] != -2:
             xc, yc, slidet, sliden, mx, my, xname, yname = handle_slide_y(cfg, read, n)
@@ -66,7 +113,9 @@ def prepare_maps(
             xc, yc, slidet, sliden, mx, my, xname, yname = handle_slide_z(cfg, read, n)
     if int(cfg.rotate[n]) != 0 or cfg.translate[n] != ["[0", "0]"]:
         xc, yc = rotate_grid(cfg, n, xc, yc)
-    return (
+    if len(cfg.graph.grids) >= GRIDS:
+        del cfg.graph.grids[next(iter(cfg.graph.grids))]
+    cfg.graph.grids[key] = (
         read,
         xc,
         yc,
@@ -78,6 +127,7 @@ def prepare_maps(
         xname,
         yname,
     )
+    return cfg.graph.grids[key]
 
 
 def make_maps(cfg: ConfigPlopm) -> None:
@@ -114,11 +164,19 @@ def make_maps(cfg: ConfigPlopm) -> None:
                 fig.delaxes(axis_to_remove)
 
     def save_animation(im_ani: FuncAnimation, name: str) -> None:
-        if cfg.loop or not writers.is_available("ffmpeg"):
-            im_ani.save(f"{cfg.output}/{name}.gif")
+        if cfg.video:
+            im_ani.save(
+                f"{cfg.output}/{name}.{cfg.video}",
+                writer=get_video_writer(cfg.video, cfg.vcodec, cfg.crf, cfg.interval),
+            )
         else:
-            im_ani.save(f"{cfg.output}/{name}.gif", extra_args=["-loop", "-1"])
+            im_ani.save(
+                f"{cfg.output}/{name}.gif",
+                writer=get_gif_writer(cfg.interval, cfg.loop, cfg.giflossy),
+            )
 
+    if cfg.incremental:
+        cfg.manifest = load_manifest(cfg.output)
     skip = 0
     if (
         cfg.subfigs[0]
@@ -233,104 +291,78 @@ def make_maps(cfg: ConfigPlopm) -> None:
         _, _, _, cmin, cmax, diffa = find_min_max(cfg)
         maska = get_mask(cfg) if cfg.mask else []
         deckd = set_deck_name(cfg.diff) if cfg.diff else ""
-        read, xc, yc, named, slidet, sliden, mx, my, xname, yname = prepare_maps(
-            cfg, cfg.names[0][0], 0
-        )
-        for n, var in enumerate(cfg.vrs):
-            if len(read.restart) > 1:
-                if cfg.subfigs[0]:
-                    fig, axis = create_figure(int(cfg.subfigs[0]), int(cfg.subfigs[1]))
-                else:
-                    fig, axis = create_figure(1, 1)
-            if not cfg.subfigs[0] and not cfg.gif:
-                plt.close()
-                fig, axis = create_figure(1, 1, "tight")
-            axiss = normalize_axis(axis)
-            original_loc, cb = prepare_colorbars(axiss)
-            if len(read.restart) > 1:
-                delete_extra_axes(axiss, len(read.restart), fig)
-            if cfg.gif and len(read.restart) > 1:
-                im_ani = animation.FuncAnimation(
-                    fig,
-                    mapit,
-                    fargs=(
-                        cfg.names[0][0],
-                        fig,
-                        axiss,
-                        original_loc,
-                        cb,
-                        cmin,
-                        cmax,
-                        maska,
-                        diffa,
-                        named,
-                        deckd,
-                        slidet,
-                        sliden,
-                        cfg,
-                        n,
-                        read,
-                        xc,
-                        yc,
-                        skip,
-                        sub1,
-                        mx,
-                        my,
-                        xname,
-                        yname,
-                    ),
-                    frames=len(read.restart),
-                    interval=cfg.interval,
-                    blit=False,
-                    repeat=False,
-                )
-                name = f"{cfg.save[0] if cfg.save[0] else named + '_' + var}"
-                save_animation(im_ani, name)
-            else:
-                if len(cfg.names[0]) > 1:
-                    delete_extra_axes(axiss, len(cfg.names[0]), fig)
-                if len(read.restart) > 1 and len(cfg.names[0]) == len(read.restart):
-                    if not cfg.subfigs[0]:
+        targets = cfg.names[0][:1]
+        if cfg.diff and not cfg.subfigs[0]:
+            targets = cfg.names[0]
+        for m, target in enumerate(targets):
+            read, xc, yc, named, slidet, sliden, mx, my, xname, yname = prepare_maps(
+                cfg, target, m
+            )
+            for n, var in enumerate(cfg.vrs):
+                if len(read.restart) > 1:
+                    if cfg.subfigs[0]:
+                        fig, axis = create_figure(
+                            int(cfg.subfigs[0]), int(cfg.subfigs[1])
+                        )
+                    else:
                         fig, axis = create_figure(1, 1)
-                        axiss = normalize_axis(axis)
-                        original_loc, cb = prepare_colorbars(axiss)
-                    mapit(
-                        0,
-                        cfg.names[0][0],
+                if not cfg.subfigs[0] and not cfg.gif:
+                    plt.close()
+                    fig, axis = create_figure(1, 1, "tight")
+                axiss = normalize_axis(axis)
+                original_loc, cb = prepare_colorbars(axiss)
+                if len(read.restart) > 1:
+                    delete_extra_axes(axiss, len(read.restart), fig)
+                if cfg.gif and len(read.restart) > 1:
+                    im_ani = animation.FuncAnimation(
                         fig,
-                        axiss,
-                        original_loc,
-                        cb,
-                        cmin,
-                        cmax,
-                        maska,
-                        diffa,
-                        named,
-                        deckd,
-                        slidet,
-                        sliden,
-                        cfg,
-                        n,
-                        read,
-                        xc,
-                        yc,
-                        skip,
-                        sub1,
-                        mx,
-                        my,
-                        xname,
-                        yname,
+                        mapit,
+                        fargs=(
+                            target,
+                            fig,
+                            axiss,
+                            original_loc,
+                            cb,
+                            cmin,
+                            cmax,
+                            maska,
+                            diffa,
+                            named,
+                            deckd,
+                            slidet,
+                            sliden,
+                            cfg,
+                            n,
+                            read,
+                            xc,
+                            yc,
+                            skip,
+                            sub1,
+                            mx,
+                            my,
+                            xname,
+                            yname,
+                        ),
+                        frames=len(read.restart),
+                        interval=cfg.interval,
+                        blit=False,
+                        repeat=False,
                     )
+                    name = f"{cfg.save[0] if cfg.save[0] else named + '_' + var}"
+                    if cfg.save[0] and len(targets) > 1:
+                        name += f"_{named}"
+                    save_animation(im_ani, name)
                 else:
-                    for t, _ in enumerate(read.restart):
+                    if len(cfg.names[0]) > 1:
+                        delete_extra_axes(axiss, len(cfg.names[0]), fig)
+                    if len(read.restart) > 1 and len(cfg.names[0]) == len(read.restart):
                         if not cfg.subfigs[0]:
-                            plt.close()
                             fig, axis = create_figure(1, 1)
                             axiss = normalize_axis(axis)
                             original_loc, cb = prepare_colorbars(axiss)
                         mapit(
-                            t,
-                            cfg.names[0][0],
+                            0,
+                            target,
                             fig,
                             axiss,
                             original_loc,
@@ -355,6 +387,75 @@ def make_maps(cfg: ConfigPlopm) -> None:
                             xname,
                             yname,
                         )
+                    else:
+                        for t, _ in enumerate(read.restart):
+                            if not cfg.subfigs[0]:
+                                plt.close()
+                                fig, axis = create_figure(1, 1)
+                                axiss = normalize_axis(axis)
+                                original_loc, cb = prepare_colorbars(axiss)
+                            mapit(
+                                t,
+                                target,
+                                fig,
+                                axiss,
+                                original_loc,
+                                cb,
+                                cmin,
+                                cmax,
+                                maska,
+                                diffa,
+                                named,
+                                deckd,
+                                slidet,
+                                sliden,
+                                cfg,
+                                n,
+                                read,
+                                xc,
+                                yc,
+                                skip,
+                                sub1,
+                                mx,
+                                my,
+                                xname,
+                                yname,
+                            )
+    if cfg.incremental:
+        save_manifest(cfg.output, cfg.manifest)
+
+
+def make_sweep(cfg: ConfigPlopm) -> None:
+    """Maps of each slide of the sweep, the slides split among processes"""
+    workers = min(WORKERS, len(cfg.sweep))
+    if workers < 2 or cfg.figures is not None:
+        sweep_maps(cfg, cfg.sweep)
+        return
+    size = -(-len(cfg.sweep) // workers)
+    with ProcessPoolExecutor(workers) as executor:
+        pending = [
+            executor.submit(sweep_maps, cfg, cfg.sweep[i : i + size])
+            for i in range(0, len(cfg.sweep), size)
+        ]
+        for future in pending:
+            future.result()
+
+
+def sweep_maps(cfg: ConfigPlopm, pages: list[tuple[int, int]]) -> None:
+    """Maps of the slides, reading the readers and quantities only once"""
+    for axis, index in pages:
+        slide = [[-2, -2], [-2, -2], [-2, -2]]
+        slide[axis] = [index - 1, index]
+        make_maps(
+            replace(
+                cfg,
+                slide=[copy.deepcopy(slide) for _ in cfg.slide],
+                save=[
+                    f"{save}_{'ijk'[axis]}{index}" if save else "" for save in cfg.save
+                ],
+            )
+        )
+        clear_slides(cfg)
 
 
 def fill_map_array(
@@ -371,6 +472,8 @@ def fill_map_array(
     """Retrieve the quantity"""
     if use_csv:
         quaa = np.asarray(quan).copy()
+    elif read.section is not None:
+        quaa = map_section(read, var, quan)
     elif cfg.slide[slide_index][0][0] != -2:
         quaa = map_yzcoords(cfg, read, var, quan, map_index, mx, my)
     elif cfg.slide[slide_index][1][0] != -2:
@@ -380,12 +483,96 @@ def fill_map_array(
     return quaa
 
 
+def compute_slide(
+    cfg: ConfigPlopm,
+    deck: str,
+    read: ReadData,
+    var: str,
+    nrst: int,
+    n: int,
+    k: int,
+    mx: int,
+    my: int,
+) -> tuple[str, NDArray, NDArray]:
+    """Unit, values, and map of the variable n in the slide k at the restart"""
+    key = (deck, var, int(nrst), n, k)
+    if key in cfg.graph.quantities and cfg.graph.readers.get((deck, k)) is read:
+        unit, quan = cfg.graph.quantities[key]
+    else:
+        unit, quan = get_quantity(
+            deck,
+            read,
+            var,
+            nrst,
+            float(cfg.adjust[n]),
+            cfg.mass,
+            cfg.mass + cfg.xmass,
+            cfg.caprock,
+            cfg.stress,
+            cfg.gif,
+            cfg.vmin[n],
+            cfg.vmax[n],
+            cfg.csvs[k],
+        )
+    read = replace(read, porv=get_porv(read, var, nrst, cfg.filter[k]))
+    return (
+        unit,
+        np.asarray(quan),
+        fill_map_array(cfg, read, var, quan, k, k, mx, my, cfg.csvs[k][0]),
+    )
+
+
+def cache_slide(
+    cfg: ConfigPlopm, key: tuple, slide: tuple[str, NDArray, NDArray]
+) -> tuple[str, NDArray, NDArray]:
+    """Keep the quantity and the slide for the next requests while they fit"""
+    if (
+        key[:5] not in cfg.graph.quantities
+        and cfg.graph.nbytes + slide[1].nbytes <= MEMORY
+    ):
+        cfg.graph.quantities[key[:5]] = slide[:2]
+        cfg.graph.nbytes += slide[1].nbytes
+    if cfg.graph.nbytes + slide[2].nbytes <= MEMORY:
+        cfg.graph.slides[key] = slide
+        cfg.graph.nbytes += slide[2].nbytes
+    return slide[0], slide[1], slide[2].copy()
+
+
+def clear_slides(cfg: ConfigPlopm) -> None:
+    """Drop the coordinates and slides, keeping the readers and quantities"""
+    cfg.graph.nbytes -= sum(slide[2].nbytes for slide in cfg.graph.slides.values())
+    cfg.graph.slides.clear()
+    cfg.graph.grids.clear()
+
+
+def get_slide(
+    cfg: ConfigPlopm,
+    deck: str,
+    read: ReadData,
+    var: str,
+    nrst: int,
+    n: int,
+    k: int,
+    mx: int,
+    my: int,
+) -> tuple[str, NDArray, NDArray]:
+    """Slide of the deck k computed once per run, the map is a copy"""
+    key = (deck, var, int(nrst), n, k, str(cfg.slide[k]))
+    if key in cfg.graph.slides:
+        unit, quan, quaa = cfg.graph.slides[key]
+        return unit, quan, quaa.copy()
+    slide = compute_slide(cfg, deck, read, var, nrst, n, k, mx, my)
+    if cfg.graph.readers.get((deck, k)) is not read:
+        return slide
+    return cache_slide(cfg, key, slide)
+
+
 def find_min_max(
     cfg: ConfigPlopm,
-) -> tuple[ReadData, NDArray, NDArray, list[float], list[float], list[NDArray]]:
+) -> tuple[ReadData, NDArray, NDArray, list[float], list[float], DiffData]:
     """Method to find the min and max for the colorbars"""
     cmin, cmax = [float("inf")], [float("-inf")]
-    diffa: list[NDArray] = []
+    diffa = get_diff_data(cfg) if cfg.diff else DiffData()
     xc, yc = np.empty(0), np.empty(0)
     if (cfg.rst_range and cfg.png and not cfg.subfigs[0]) or (
         cfg.bounds[0][0] and not cfg.diff
@@ -395,10 +582,13 @@ def find_min_max(
     def apply_diff_and_log(
         quaa: NDArray,
         var_index: int,
+        read: ReadData,
         restart_index: int,
     ) -> None:
         if cfg.diff:
-            quaa -= diffa[restart_index]
+            quaa -= get_reference(
+                cfg, diffa, cfg.vrs[var_index], var_index, read, restart_index
+            )
         if int(cfg.log[var_index]) == 1:
             quaa[quaa <= 0] = np.nan
 
@@ -409,40 +599,23 @@ def find_min_max(
 
     if cfg.restart[0] == -1 and cfg.gif:
         read = get_readers(
-            cfg.names[0][0], cfg.gif, cfg.vtk, cfg.vrs, cfg.restart, cfg.filter
+            cfg.names[0][0],
+            cfg.gif,
+            cfg.vtk,
+            cfg.vrs,
+            cfg.restart,
+            cfg.filter,
+            0,
+            cfg.precision,
         )
     else:
         read = ReadData(restart=cfg.restart)
-    if cfg.diff:
-        var = cfg.vrs[0]
-        for t, _ in enumerate(read.restart):
-            read, xc, yc, _, _, _, mx, my, _, _ = prepare_maps(cfg, cfg.diff, 1)
-            _, quan = get_quantity(
-                cfg.diff,
-                read,
-                var,
-                read.restart[t],
-                float(cfg.adjust[0]),
-                cfg.mass,
-                cfg.mass + cfg.xmass,
-                cfg.caprock,
-                cfg.stress,
-                cfg.filter[0],
-                cfg.gif,
-                cfg.vmin[0],
-                cfg.vmax[0],
-                cfg.csvs[0],
-            )
-            quaa = fill_map_array(cfg, read, var, quan, 1, 1, mx, my)
-            diffa.append(quaa.copy())
     if len(cfg.vrs) == len(cfg.names[0]) and len(cfg.names[0]) > 1:
         for m, var in enumerate(cfg.vrs):
             cmin.append(cmin[-1])
             cmax.append(cmax[-1])
+            read, xc, yc, _, _, _, mx, my, _, _ = prepare_maps(cfg, cfg.names[0][m], m)
             for t, _ in enumerate(read.restart):
-                read, xc, yc, _, _, _, mx, my, _, _ = prepare_maps(
-                    cfg, cfg.names[0][m], m
-                )
                 _, quan = get_quantity(
                     cfg.names[0][m],
                     read,
@@ -453,69 +626,114 @@ def find_min_max(
                     cfg.mass + cfg.xmass,
                     cfg.caprock,
                     cfg.stress,
-                    cfg.filter[0],
                     cfg.gif,
                     cfg.vmin[m],
                     cfg.vmax[m],
                     cfg.csvs[0],
                 )
-                quaa = fill_map_array(cfg, read, var, quan, m, m, mx, my)
-                apply_diff_and_log(quaa, m, t)
+                sread = replace(
+                    read, porv=get_porv(read, var, read.restart[t], cfg.filter[0])
+                )
+                quaa = fill_map_array(cfg, sread, var, quan, m, m, mx, my)
+                apply_diff_and_log(quaa, m, read, t)
                 update_color_range(quaa)
     else:
         for m, var in enumerate(cfg.vrs):
             cmin.append(cmin[-1])
             cmax.append(cmax[-1])
             for n, deck in enumerate(cfg.names[0]):
-                for t, _ in enumerate(read.restart):
-                    read, xc, yc, _, _, _, mx, my, _, _ = prepare_maps(cfg, deck, n)
-                    _, quan = get_quantity(
-                        deck,
-                        read,
-                        var,
-                        read.restart[t],
-                        float(cfg.adjust[m]),
-                        cfg.mass,
-                        cfg.mass + cfg.xmass,
-                        cfg.caprock,
-                        cfg.stress,
-                        cfg.filter[n],
-                        cfg.gif,
-                        cfg.vmin[m],
-                        cfg.vmax[m],
-                        cfg.csvs[n],
-                    )
-                    quaa = fill_map_array(
-                        cfg, read, var, quan, n, n, mx, my, cfg.csvs[n][0]
+                read, xc, yc, _, _, _, mx, my, _, _ = prepare_maps(cfg, deck, n)
+                tasks = [
+                    (cfg, deck, read, var, nrst, m, n, mx, my) for nrst in read.restart
+                ]
+                for t, slide in enumerate(pool_map(compute_slide, tasks)):
+                    _, _, quaa = cache_slide(
+                        cfg,
+                        (deck, var, int(read.restart[t]), m, n, str(cfg.slide[n])),
+                        slide,
                     )
-                    apply_diff_and_log(quaa, m, t)
+                    apply_diff_and_log(quaa, m, read, t)
                     update_color_range(quaa)
     return read, xc, yc, cmin, cmax, diffa
 
 
-def get_mask(cfg: ConfigPlopm) -> list[NDArray]:
-    """Read the mask"""
-    maska = []
-    var = cfg.mask
-    for n, deck in enumerate(cfg.names[0]):
-        read, _, _, _, _, _, mx, my, _, _ = prepare_maps(cfg, deck, n)
+def get_diff_data(cfg: ConfigPlopm) -> DiffData:
+    """Open the reference deck once; its slides are read when needed"""
+    read, _, _, _, _, _, mx, my, _, _ = prepare_maps(cfg, cfg.diff, 1)
+    diffa = DiffData(read=read, mx=mx, my=my)
+    if read.unrst and read.unrst.count("DOUBHEAD", 0):
+        diffa.steps = np.array(read.unrst.report_steps, dtype=int)
+        diffa.times = np.array(read.tnrst, dtype=float)
+    return diffa
+
+
+def get_reference_slide(
+    cfg: ConfigPlopm, diffa: DiffData, var: str, n: int, nrst: int
+) -> NDArray:
+    """Map the reference quantity, keeping only the last two slides in memory"""
+    if (var, nrst) not in diffa.slides:
+        if len(diffa.slides) > 1:
+            del diffa.slides[next(iter(diffa.slides))]
         _, quan = get_quantity(
-            deck,
-            read,
+            cfg.diff,
+            diffa.read,
             var,
-            0,
-            float(cfg.adjust[0]),
+            nrst,
+            float(cfg.adjust[n]),
             cfg.mass,
             cfg.mass + cfg.xmass,
             cfg.caprock,
             cfg.stress,
-            cfg.filter[n],
             cfg.gif,
-            cfg.vmin[0],
-            cfg.vmax[0],
-            cfg.csvs[n],
+            cfg.vmin[n],
+            cfg.vmax[n],
+            cfg.csvs[0],
+        )
+        read = replace(diffa.read, porv=get_porv(diffa.read, var, nrst, cfg.filter[0]))
+        diffa.slides[(var, nrst)] = fill_map_array(
+            cfg, read, var, quan, 1, 1, diffa.mx, diffa.my, cfg.csvs[0][0]
         )
-        maska.append(fill_map_array(cfg, read, var, quan, n, n, mx, my))
+    return diffa.slides[(var, nrst)]
+
+
+def get_reference(
+    cfg: ConfigPlopm, diffa: DiffData, var: str, n: int, read: ReadData, t: int
+) -> NDArray:
+    """Reference slide at the simulation time of the restart t of the input"""
+    nrst = read.restart[t]
+    if (
+        cfg.diffmode == "step"
+        or not diffa.steps.size
+        or not read.unrst
+        or not read.unrst.count("DOUBHEAD", nrst)
+    ):
+        if diffa.steps.size and nrst not in diffa.steps:
+            print(
+                f"The report step {nrst} is not in {cfg.diff}.UNRST, use "
+                "'-diffmode nearest' or '-diffmode interp' to pair it by time."
+            )
+            sys.exit()
+        return get_reference_slide(cfg, diffa, var, n, nrst)
+    time = read.unrst["DOUBHEAD", nrst][0]
+    ind = int(np.searchsorted(diffa.times, time))
+    if cfg.diffmode == "nearest" or ind in (0, diffa.times.size):
+        ind = int(np.argmin(np.abs(diffa.times - time)))
+        return get_reference_slide(cfg, diffa, var, n, diffa.steps[ind])
+    if diffa.times[ind] == time:
+        return get_reference_slide(cfg, diffa, var, n, diffa.steps[ind])
+    weight = (time - diffa.times[ind - 1]) / (diffa.times[ind] - diffa.times[ind - 1])
+    return (1.0 - weight) * get_reference_slide(
+        cfg, diffa, var, n, diffa.steps[ind - 1]
+    ) + weight * get_reference_slide(cfg, diffa, var, n, diffa.steps[ind])
+
+
+def get_mask(cfg: ConfigPlopm) -> list[NDArray]:
+    """Read the mask"""
+    maska = []
+    var = cfg.mask
+    for n, deck in enumerate(cfg.names[0]):
+        read, _, _, _, _, _, mx, my, _, _ = prepare_maps(cfg, deck, n)
+        maska.append(get_slide(cfg, deck, read, var, 0, 0, n, mx, my)[2])
     return maska
 
 
@@ -536,7 +754,7 @@ def mapit(
     cmin: list[float],
     cmax: list[float],
     maska: list[Any],
-    diffa: list[NDArray],
+    diffa: DiffData,
     named: str,
     deckd: str,
     slidet: str,
@@ -805,13 +1023,7 @@ def handle_axis(
     )
     namet, time = name, ""
     if cfg.tunits[0] == "dates":
-        date_values = unrst["INTEHEAD", restart[t]]
-        date = datetime.date(
-            date_values[66],
-            date_values[65],
-            date_values[64],
-        )
-        time = f" {date}"
+        time = f" {read.dates[restart[t]]}"
     elif cfg.tunits[0] == "empty":
         pass
     else:
@@ -945,7 +1157,7 @@ def mapits(
     cmin: list[float],
     cmax: list[float],
     maska: list[Any],
-    diffa: list[NDArray],
+    diffa: DiffData,
     named: str,
     deckd: str,
     slidet: str,
@@ -970,13 +1182,21 @@ def mapits(
         name = name.replace(" ", "")
         return name
 
-    def save_map(named: str, save_index: int) -> None:
-        fig.set_facecolor(cfg.fc)
+    def map_name(named: str, save_index: int) -> str:
         name = clean_name(f"{named}_{var}_{sliden}_t{read.restart[t]}")
         if save_index < len(cfg.save) and cfg.save[save_index]:
             name = cfg.save[save_index]
+            if cfg.diff and not cfg.subfigs[0] and len(cfg.names[0]) > 1:
+                name += f"_{named}"
+        return name
+
+    def save_map(named: str, save_index: int) -> None:
+        fig.set_facecolor(cfg.fc)
+        if cfg.figures is not None:
+            cfg.figures.append(fig)
+            return
         fig.savefig(
-            f"{cfg.output}/{name}.png",
+            f"{cfg.output}/{map_name(named, save_index)}.png",
             bbox_inches="tight",
             dpi=int(cfg.dpi[0]),
         )
@@ -998,52 +1218,95 @@ def mapits(
         return axiss, cb
 
     var = cfg.vrs[n]
-    unit, quan = get_quantity(
-        deck,
-        read,
-        var,
-        read.restart[t],
-        float(cfg.adjust[n]),
-        cfg.mass,
-        cfg.mass + cfg.xmass,
-        cfg.caprock,
-        cfg.stress,
-        cfg.filter[k],
-        cfg.gif,
-        cfg.vmin[n],
-        cfg.vmax[n],
-        cfg.csvs[k],
-    )
+    if cfg.incremental:
+        if cfg.csv:
+            name = clean_name(f"{named}_{var}_{sliden}_t{read.restart[t]}")
+            fname = f"{cfg.output}/{cfg.save[n] if cfg.save[n] else name}"
+            fname += f".{cfg.binary if cfg.binary else 'csv'}"
+        else:
+            fname = f"{cfg.output}/{map_name(named, t if cfg.rst_range else n)}.png"
+        entry = make_entry(
+            [deck, cfg.diff] if cfg.diff else [deck],
+            cfg.optionshash,
+            variable=var,
+            restart=int(read.restart[t]),
+            scale=(
+                [float(cmin[n]), float(cmax[n])]
+                if cfg.mask or int(cfg.log[n]) == 1
+                else []
+            ),
+        )
+        if is_current(cfg.manifest, fname, entry):
+            return
+        record(cfg.manifest, fname, entry)
     n_s, nwelult, welult = 0, 1, None
     lwelult: list[str] = []
     if cfg.subfigs[0] and len(cfg.names[0]) > 1:
         n_s = k
-    if cfg.csvs[k][0]:
-        quaa = quan
+    if cfg.vrs[0] not in ("wells", "faults") and (n_s == k or cfg.csvs[k][0]):
+        unit, quan, quaa = get_slide(
+            cfg, deck, read, var, read.restart[t], n, k, mx, my
+        )
     else:
-        if cfg.vrs[0] == "wells":
-            welult, lwelult = get_wells(cfg, k)
-        elif cfg.vrs[0] == "faults":
-            welult, lwelult = get_faults(cfg, k)
-        nwelult = len(lwelult) + 1
-        if cfg.slide[n_s][0][0] != -2:
-            quaa = map_yzcoords(cfg, read, var, quan, k, mx, my, welult, nwelult)
-        elif cfg.slide[n_s][1][0] != -2:
-            quaa = map_xzcoords(cfg, read, var, quan, k, mx, my, welult, nwelult)
+        unit, quan = get_quantity(
+            deck,
+            read,
+            var,
+            read.restart[t],
+            float(cfg.adjust[n]),
+            cfg.mass,
+            cfg.mass + cfg.xmass,
+            cfg.caprock,
+            cfg.stress,
+            cfg.gif,
+            cfg.vmin[n],
+            cfg.vmax[n],
+            cfg.csvs[k],
+        )
+        read = replace(read, porv=get_porv(read, var, read.restart[t], cfg.filter[k]))
+        if cfg.csvs[k][0]:
+            quaa = quan
         else:
-            quaa = map_xycoords(cfg, read, var, quan, k, mx, my, welult, nwelult)
+            if cfg.vrs[0] == "wells":
+                welult, lwelult = get_wells(cfg, read, k)
+            elif cfg.vrs[0] == "faults":
+                welult, lwelult = get_faults(cfg, read, k)
+            nwelult = len(lwelult) + 1
+            if cfg.slide[n_s][0][0] != -2:
+                quaa = map_yzcoords(cfg, read, var, quan, k, mx, my, welult, nwelult)
+            elif cfg.slide[n_s][1][0] != -2:
+                quaa = map_xzcoords(cfg, read, var, quan, k, mx, my, welult, nwelult)
+            else:
+                quaa = map_xycoords(cfg, read, var, quan, k, mx, my, welult, nwelult)
     if cfg.diff:
-        quaa -= diffa[t]
+        quaa = quaa - get_reference(cfg, diffa, var, n, read, t)
     if cfg.mask:
         mask = maska[k]
         maxv = np.nanmax(mask)
         mask_condition = quaa < cfg.maskthr
         quaa[mask_condition] = -cmax[n] * (maxv - mask[mask_condition]) / (maxv - 1)
     if cfg.csv:
-        text = [f"{val}\n" for val in quaa if not np.isnan(val)]
         name = clean_name(f"{named}_{var}_{sliden}_t{read.restart[t]}")
         if cfg.save[n]:
             name = cfg.save[n]
+        if cfg.binary:
+            save_columns(
+                f"{cfg.output}/{name}",
+                cfg.binary,
+                map_columns(xc, yc, quaa, mx, my, not cfg.csvs[k][0]),
+                {
+                    "deck": named,
+                    "variable": var,
+                    "unit": unit.strip(),
+                    "restart": int(read.restart[t]),
+                    "time": read.tnrst[read.restart[t]] if read.tnrst else np.nan,
+                    "slide": sliden,
+                    "xname": xname,
+                    "yname": yname,
+                },
+            )
+            return
+        text = [f"{val}\n" for val in quaa if not np.isnan(val)]
         with open(f"{cfg.output}/{name}.csv", "w", encoding="utf8") as file:
             file.write("".join(text))
         return
@@ -1055,6 +1318,11 @@ def mapits(
         extinf = np.nansum(np.abs(quaa))
     else:
         extinf = np.empty(0)
+    valid_maps = quaa[~np.isnan(quaa)]
+    if cfg.lod and var not in ("wells", "grid", "faults"):
+        quaa, xc, yc, mx, my = decimate_slide(
+            cfg, var, quaa, xc, yc, mx, my, k, bool(cfg.csvs[k][0])
+        )
     ntick = 3
     ncolor = var + " " + unit
     defcol, temp, cmap = True, "tab20", matplotlib.colormaps.get_cmap("tab20")
@@ -1063,7 +1331,6 @@ def mapits(
         cmap = matplotlib.colormaps.get_cmap(cfg.cmaps[n])
         temp = cfg.cmaps[n]
     if var not in ("wells", "grid", "faults"):
-        valid_maps = quaa[~np.isnan(quaa)]
         if (
             len(cfg.names[0]) > 1
             and cfg.subfigs[0]
@@ -1191,6 +1458,11 @@ def mapits(
                 lw=float(cfg.grid[1]),
             )
     else:
+        raster = (
+            get_raster(cfg, xc, yc, quaa, mx, my, bool(cfg.csvs[k][0]))
+            if cfg.raster and var != "grid"
+            else None
+        )
         if var == "grid":
             imag = axis.pcolormesh(
                 xc,
@@ -1200,6 +1472,17 @@ def mapits(
                 edgecolors="black",
                 lw=0.001,
             )
+        elif raster is not None:
+            imag = draw_raster(
+                axis,
+                *raster,
+                cmap,
+                (
+                    colors.LogNorm(vmin=minc, vmax=maxc)
+                    if int(cfg.log[n]) == 1
+                    else None
+                ),
+            )
         elif int(cfg.log[n]) == 0:
             imag = axis.pcolormesh(
                 xc,
@@ -1452,6 +1735,69 @@ def mapits(
             plt.close()
 
 
+def get_raster(
+    cfg: ConfigPlopm,
+    xc: NDArray,
+    yc: NDArray,
+    quaa: NDArray,
+    mx: int,
+    my: int,
+    use_csv: bool = False,
+) -> tuple[NDArray, NDArray, NDArray] | None:
+    """Cell edges and values if the slide can be drawn as an image"""
+    if use_csv:
+        return np.ravel(xc), np.ravel(yc), quaa.reshape(my, mx)
+    npx = float(cfg.dimensions[0]) * int(cfg.dpi[0])
+    npy = float(cfg.dimensions[1]) * int(cfg.dpi[0])
+    edges = get_rectilinear_edges(
+        xc,
+        yc,
+        0.5 * (np.max(xc) - np.min(xc)) / npx,
+        0.5 * (np.max(yc) - np.min(yc)) / npy,
+    )
+    if edges is None:
+        return None
+    return edges[0], edges[1], quaa.reshape(my, mx)[::2, ::2]
+
+
+def draw_raster(
+    axis: Axes,
+    xedges: NDArray,
+    yedges: NDArray,
+    values: NDArray,
+    cmap: colors.Colormap,
+    norm: colors.Normalize | None = None,
+) -> AxesImage:
+    """Draw the rectilinear slide as an image instead of a pcolormesh"""
+    if xedges[-1] < xedges[0]:
+        xedges, values = xedges[::-1], values[:, ::-1]
+    if yedges[-1] < yedges[0]:
+        yedges, values = yedges[::-1], values[::-1]
+    extent = (xedges[0], xedges[-1], yedges[0], yedges[-1])
+    lengths = np.diff(xedges), np.diff(yedges)
+    if all(np.ptp(val) < 1e-6 * np.mean(val) for val in lengths):
+        imag: AxesImage = AxesImage(
+            axis,
+            cmap=cmap,
+            norm=norm,
+            data=values,
+            extent=extent,
+            interpolation="nearest",
+            origin="lower",
+        )
+    else:
+        imag = PcolorImage(
+            axis, xedges, yedges, values, cmap=cmap, norm=norm, extent=extent
+        )
+    axis.add_image(imag)
+    imag.set_clip_path(axis.patch)
+    imag.sticky_edges.x[:] = [extent[0], extent[1]]
+    imag.sticky_edges.y[:] = [extent[2], extent[3]]
+    axis.update_datalim(np.array([[extent[0], extent[2]], [extent[1], extent[3]]]))
+    axis.autoscale_view(tight=True)
+    return imag
+
+
 def handle_well_or_grid_or_fault(
     fig: Figure,
     cfg: ConfigPlopm,
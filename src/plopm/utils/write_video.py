@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R1732,R0902
+
+"""Utility methods to write the animations frame by frame"""
+
+import subprocess
+from io import BytesIO
+from typing import Any
+
+import numpy as np
+from matplotlib.animation import AbstractMovieWriter
+from matplotlib.cm import ScalarMappable
+from matplotlib.figure import Figure
+from numpy.typing import NDArray
+from PIL import Image
+
+VIDEO_DEFAULTS = {
+    "mp4": ("libx264", "23"),
+    "webm": ("libvpx-vp9", "31"),
+}
+# Colors of the GIF palette, the last index is left for the unchanged pixels
+GIF_COLORS = 255
+GIF_GRAYS = 16
+
+
+class VideoWriter(AbstractMovieWriter):
+    """Pipe each rendered frame as raw RGB to ffmpeg, no frames are kept"""
+
+    def __init__(self, framerate: float, codec: str, crf: str) -> None:
+        super().__init__(codec=codec)
+        self.framerate = framerate
+        self.crf = crf
+        self.proc: subprocess.Popen | None = None
+
+    def setup(self, fig: Any, outfile: Any, dpi: float | None = None) -> None:
+        super().setup(fig, outfile, dpi)
+        width, height = self.frame_size
+        command = [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{width}x{height}",
+            "-framerate",
+            str(self.framerate),
+            "-i",
+            "pipe:",
+            "-vcodec",
+            self.codec,
+            "-crf",
+            self.crf,
+        ]
+        if "vpx" in self.codec:
+            command += ["-b:v", "0"]
+        command += [
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            "-y",
+            str(outfile),
+        ]
+        self.proc = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def grab_frame(self, **savefig_kwargs) -> None:
+        buffer = BytesIO()
+        self.fig.savefig(buffer, format="rgba", dpi=self.dpi, **savefig_kwargs)
+        rgba = np.frombuffer(buffer.getbuffer(), dtype=np.uint8).reshape(-1, 4)
+        if self.proc and self.proc.stdin:
+            self.proc.stdin.write(rgba[:, :3].tobytes())
+
+    def finish(self) -> None:
+        if self.proc:
+            _, err = self.proc.communicate()
+            if self.proc.returncode:
+                raise subprocess.CalledProcessError(
+                    self.proc.returncode, self.proc.args, stderr=err
+                )
+
+
+def get_video_writer(video: str, vcodec: str, crf: str, interval: float) -> VideoWriter:
+    """Writer for the mp4/webm animations"""
+    codec, quality = VIDEO_DEFAULTS[video]
+    return VideoWriter(1000.0 / interval, vcodec or codec, crf or quality)
+
+
+class GifWriter(AbstractMovieWriter):
+    """Map the frames to one palette, Pillow stores only the changed pixels"""
+
+    def __init__(self, framerate: float, loop: bool, lossy: int) -> None:
+        super().__init__()
+        self.framerate = framerate
+        self.loop = loop
+        self.lossy = lossy
+        self.colors = np.zeros((0, 3), dtype=np.int32)
+        self.keys = np.zeros(0, dtype=np.uint32)
+        self.lookup = np.zeros(0, dtype=np.uint8)
+        self.previous: NDArray | None = None
+        self.frames: list[Image.Image] = []
+
+    def setup(self, fig: Any, outfile: Any, dpi: float | None = None) -> None:
+        super().setup(fig, outfile, dpi)
+        self.colors = np.zeros((0, 3), dtype=np.int32)
+        self.keys = np.zeros(0, dtype=np.uint32)
+        self.lookup = np.zeros(0, dtype=np.uint8)
+        self.previous = None
+        self.frames = []
+
+    def grab_frame(self, **savefig_kwargs) -> None:
+        buffer = BytesIO()
+        self.fig.savefig(buffer, format="rgba", dpi=self.dpi, **savefig_kwargs)
+        keys = np.frombuffer(buffer.getbuffer(), dtype="<u4") & 0xFFFFFF
+        if not self.colors.size:
+            self.colors = get_gif_palette(self.fig, keys)
+        width, height = self.frame_size
+        index = self.palette_index(keys).reshape(int(height), int(width))
+        if self.lossy and self.previous is not None:
+            # keep the previous color of the pixels that barely changed, so
+            # they are stored as unchanged
+            near = np.abs(self.colors[index] - self.colors[self.previous]).max(-1)
+            index = np.where(near <= self.lossy, self.previous, index)
+        self.previous = index
+        frame = Image.fromarray(index, "P")
+        frame.putpalette(self.colors.astype(np.uint8).tobytes())
+        self.frames.append(frame)
+
+    def palette_index(self, keys: NDArray) -> NDArray:
+        """Closest palette color, cached for the colors in previous frames"""
+        unique, inverse = np.unique(keys, return_inverse=True)
+        position = np.searchsorted(self.keys, unique).clip(0, self.keys.size - 1)
+        known = self.keys[position] == unique if self.keys.size else unique < 0
+        index = np.empty(unique.size, dtype=np.uint8)
+        index[known] = self.lookup[position[known]]
+        new = unique[~known]
+        for first in range(0, new.size, 4096):
+            colors = key_colors(new[first : first + 4096])
+            distance = ((colors[:, None, :] - self.colors[None, :, :]) ** 2).sum(-1)
+            index[np.flatnonzero(~known)[first : first + 4096]] = distance.argmin(-1)
+        if new.size:
+            keys = np.concatenate([self.keys, new])
+            lookup = np.concatenate([self.lookup, index[~known]])
+            order = np.argsort(keys, kind="stable")
+            self.keys, self.lookup = keys[order], lookup[order]
+        return index[inverse]
+
+    def finish(self) -> None:
+        if self.frames:
+            params: dict[str, Any] = {"loop": 0} if self.loop else {}
+            self.frames[0].save(
+                self.outfile,
+                save_all=True,
+                append_images=self.frames[1:],
+                duration=1000.0 / self.framerate,
+                palette=self.colors.astype(np.uint8).tobytes(),
+                optimize=True,
+                disposal=1,
+                **params,
+            )
+        self.frames = []
+
+
+def key_colors(keys: NDArray) -> NDArray:
+    """RGB values of the colors packed as r + 256 g + 65536 b"""
+    return np.stack([keys & 255, (keys >> 8) & 255, keys >> 16], -1).astype(np.int32)
+
+
+def get_gif_palette(fig: Figure, keys: NDArray) -> NDArray:
+    """Grays, colormaps in the figure, and the main colors of the first frame"""
+    colors: list[tuple[int, ...]] = [
+        (val, val, val) for val in np.linspace(0, 255, GIF_GRAYS).astype(int)
+    ]
+    cmaps = {
+        mappable.get_cmap().name: mappable.get_cmap()
+        for mappable in fig.findobj(lambda obj: isinstance(obj, ScalarMappable))
+        if isinstance(mappable, ScalarMappable)
+    }
+    for cmap in cmaps.values():
+        ncolors = min(cmap.N, (GIF_COLORS // 2) // len(cmaps))
+        samples = np.round(255 * cmap(np.linspace(0, 1, ncolors))[:, :3])
+        colors += [tuple(color) for color in samples.astype(int)]
+    unique, counts = np.unique(keys, return_counts=True)
+    frequent = key_colors(unique[np.argsort(-counts)][:GIF_COLORS])
+    colors += [tuple(color) for color in frequent]
+    return np.array(list(dict.fromkeys(colors))[:GIF_COLORS], dtype=np.int32)
+
+
+def get_gif_writer(interval: float, loop: bool, lossy: int) -> GifWriter:
+    """Writer for the gif animations"""
+    return GifWriter(1000.0 / interval, loop, lossy)
@@ -6,17 +6,28 @@
 
 import csv
 import os
+import re
 import shlex
 import shutil
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
 from contextlib import nullcontext
+from dataclasses import replace
 from subprocess import run
 
 import numpy as np
 from alive_progress import alive_bar
 from numpy.typing import NDArray
+from opm.io.ecl import EclFile as OpmFile
 
 from plopm.config.config import ReadData
+from plopm.utils.manifest import (
+    is_current,
+    load_manifest,
+    make_entry,
+    record,
+    save_manifest,
+)
 from plopm.utils.readers import get_quantity, get_readers
 
 VTK_DTYPES = {
@@ -33,9 +44,28 @@ VTK_DTYPES = {
     "UInt8": np.uint8,
 }
 
+# Ascii geometry (text before and after the cell data) of the .pvtu pieces,
+# set once in each worker process by set_piece_grids
+PIECE_GRIDS: list[tuple[str, str]] = []
+
+# (i, j, k) offsets of the hexahedron corners in the VTK_HEXAHEDRON order
+HEXAHEDRON_CORNERS = [
+    (0, 0, 0),
+    (1, 0, 0),
+    (1, 1, 0),
+    (0, 1, 0),
+    (0, 0, 1),
+    (1, 0, 1),
+    (1, 1, 1),
+    (0, 1, 1),
+]
+
 
 def make_vtks(
     flow: str,
+    vtkgrid: str,
+    vtkfile: str,
+    vtkparts: int,
     names: list,
     output: str,
     save: list,
@@ -51,88 +81,273 @@ def make_vtks(
     mass_all: list[str],
     caprock: list[str],
     stress: float,
-    filterss: list[str],
+    incremental: bool = False,
+    optionshash: str = "",
+    precision: str = "float64",
 ) -> None:
-    """Use OPM Flow to generate the vtk grid to populate with the given variables"""
+    """Write the vtk grid from the EGRID (or OPM Flow) and populate it"""
+    manifest = load_manifest(output) if incremental else {}
     for k, case in enumerate(names[0]):
-        deck = case
         dname = case.split("/")[-1]
-        if not os.path.isfile(f"{deck}.DATA"):
-            print(f"{deck}.DATA does not exist")
-            sys.exit()
-        if not os.path.isfile(f"{output}/{dname}-GRID.vtu"):
-            cwd = os.getcwd()
-            output_abs = os.path.abspath(output)
-            dryrun_deck = ""
-            dryrun_folder = ""
-            dryrun_parent = cwd
-            try:
-                if len(case.split("/")) > 1:
-                    os.chdir("/".join(case.split("/")[:-1]))
-                dryrun_parent = os.getcwd()
-                flags, thermal = get_flags()
-                flow_command = shlex.split(flow)
-                dryrun_deck = f"{dname}_DRYRUN_{os.getpid()}.DATA"
-                dryrun_folder = f"plopm_{os.getpid()}"
-                shutil.copyfile(f"{dname}.DATA", dryrun_deck)
-                flags += " --enable-dry-run=1"
-                os.makedirs(dryrun_folder, exist_ok=True)
-                deck_rel = f"../{dryrun_deck}"
-                os.chdir(dryrun_folder)
-                if "SPE11B" in dname or "SPE11C" in dname:
-                    run(
-                        flow_command
-                        + [deck_rel]
-                        + shlex.split(flags)
-                        + shlex.split(thermal),
-                        check=False,
-                    )
+        if vtkfile == "vtkhdf":
+            read = get_readers(case, gif, vtk, vrs, restart, filters, 0, precision)
+            write_vtkhdf(
+                case,
+                read,
+                output,
+                dname,
+                save,
+                vrs,
+                vtkformat_list,
+                vtknames,
+                k,
+                skl,
+                mass,
+                mass_all,
+                caprock,
+                stress,
+            )
+            continue
+        where = save[k] if save[k] else dname
+        ext = "pvtu" if vtkparts > 1 else "vtu"
+        if vtkparts == 1:
+            grid = f"{output}/{dname}-GRID.vtu"
+            entry = make_entry([case], "", grid=vtkgrid)
+            if not os.path.isfile(grid) or (
+                incremental and not is_current(manifest, grid, entry)
+            ):
+                if vtkgrid == "egrid" and os.path.isfile(f"{case}.EGRID"):
+                    write_grid_vtu(case, grid)
                 else:
-                    run(flow_command + [deck_rel] + shlex.split(flags), check=False)
-                shutil.move(
-                    f"{dname}_DRYRUN_{os.getpid()}-00000.vtu",
-                    f"{output_abs}/{dname}-GRID.vtu",
-                )
-            finally:
-                os.chdir(dryrun_parent)
-                if dryrun_folder:
-                    shutil.rmtree(dryrun_folder, ignore_errors=True)
-                if dryrun_deck and os.path.isfile(dryrun_deck):
-                    os.remove(dryrun_deck)
-                os.chdir(cwd)
-        read = get_readers(case, gif, vtk, vrs, restart, filters)
-        opmtovtk(
-            case,
-            read,
-            output,
-            dname,
-            save,
-            vrs,
-            vtkformat_list,
-            vtknames,
-            k,
-            skl,
-            mass,
-            mass_all,
-            caprock,
-            stress,
-            filterss[k],
-        )
-        writepvd(
-            save,
-            dname,
-            read.restart,
-            read.tnrst,
-            output,
-            k,
+                    flow_grid_vtu(flow, case, dname, output)
+            record(manifest, grid, entry)
+        read = get_readers(case, gif, vtk, vrs, restart, filters, 0, precision)
+        entries = {
+            f"{output}/{where}-{int(i):04d}.{ext}": make_entry(
+                [case],
+                optionshash,
+                variables=vrs,
+                restart=int(i),
+            )
+            for i in read.restart
+        }
+        todo = [
+            i
+            for i, (fname, entry) in zip(read.restart, entries.items())
+            if not incremental or not is_current(manifest, fname, entry)
+        ]
+        if vtkparts > 1:
+            write_pvtu(
+                case,
+                replace(read, restart=todo),
+                output,
+                dname,
+                save,
+                vrs,
+                vtkformat_list,
+                vtknames,
+                k,
+                skl,
+                mass,
+                mass_all,
+                caprock,
+                stress,
+                vtkparts,
+            )
+        else:
+            opmtovtk(
+                case,
+                replace(read, restart=todo),
+                output,
+                dname,
+                save,
+                vrs,
+                vtkformat_list,
+                vtknames,
+                k,
+                skl,
+                mass,
+                mass_all,
+                caprock,
+                stress,
+            )
+        for fname, entry in entries.items():
+            record(manifest, fname, entry)
+        writepvd(save, dname, read.restart, read.tnrst, output, k, ext, incremental)
+    if incremental:
+        save_manifest(output, manifest)
+
+
+def get_hexahedra(
+    coord: NDArray, zcorn: NDArray, actnum: NDArray, nx: int, ny: int, nz: int
+) -> tuple[NDArray, NDArray]:
+    """Unique corner points and hexahedron connectivity of the active cells"""
+    coord = coord.reshape(-1, 6)
+    zcorn = zcorn.reshape(nz, 2, ny, 2, nx, 2)
+    active = np.flatnonzero(actnum > 0)
+    i, j, k = active % nx, (active // nx) % ny, active // (nx * ny)
+    pillars = np.empty((k.size, 8), dtype=np.int64)
+    zvals = np.empty((k.size, 8))
+    for c, (di, dj, dk) in enumerate(HEXAHEDRON_CORNERS):
+        pillars[:, c] = (j + dj) * (nx + 1) + i + di
+        zvals[:, c] = zcorn[k, dk, j, dj, i, di]
+    keys, connectivity = np.unique(
+        np.column_stack([pillars.ravel(), zvals.ravel()]), axis=0, return_inverse=True
+    )
+    top = coord[keys[:, 0].astype(np.int64), :3]
+    bottom = coord[keys[:, 0].astype(np.int64), 3:]
+    height = bottom[:, 2] - top[:, 2]
+    fraction = np.divide(
+        keys[:, 1] - top[:, 2],
+        height,
+        out=np.zeros_like(height),
+        where=height != 0,
+    )
+    points = top + (bottom - top) * fraction[:, None]
+    points[:, 2] = keys[:, 1]
+    return points, connectivity.reshape(-1, 8)
+
+
+def read_hexahedra(case: str) -> tuple[NDArray, NDArray]:
+    """Read the corner points in the EGRID and build the hexahedra"""
+    egrid = OpmFile(f"{case}.EGRID")
+    nx, ny, nz = egrid["GRIDHEAD"][1:4]
+    return get_hexahedra(
+        np.array(egrid["COORD"], dtype=float),
+        np.array(egrid["ZCORN"], dtype=float),
+        np.array(egrid["ACTNUM"]) if egrid.count("ACTNUM") else np.ones(nx * ny * nz),
+        nx,
+        ny,
+        nz,
+    )
+
+
+def format_grid(points: NDArray, connectivity: NDArray) -> tuple[str, str]:
+    """Ascii vtu text before and after the cell data of the hexahedra"""
+    ncells = connectivity.shape[0]
+    head = (
+        "<?xml version='1.0'?>\n"
+        + "<VTKFile type='UnstructuredGrid' version='0.1' "
+        + "byte_order='LittleEndian'>\n"
+        + "\t<UnstructuredGrid>\n"
+        + f"\t\t<Piece NumberOfCells='{ncells}' "
+        + f"NumberOfPoints='{points.shape[0]}'>\n"
+    )
+    tail = (
+        "\t\t\t<Points>\n"
+        + "\t\t\t\t<DataArray type='Float64' Name='Coordinates' "
+        + "NumberOfComponents='3' format='ascii'>\n"
+        + format_data_array(points, np.float64)
+        + "\n\t\t\t</Points>\n"
+        + "\t\t\t<Cells>\n"
+        + "\t\t\t\t<DataArray type='Int64' Name='connectivity' "
+        + "NumberOfComponents='1' format='ascii'>\n"
+        + format_data_array(connectivity, np.int64)
+        + "\n\t\t\t\t<DataArray type='Int64' Name='offsets' "
+        + "NumberOfComponents='1' format='ascii'>\n"
+        + format_data_array(8 * np.arange(1, ncells + 1), np.int64)
+        + "\n\t\t\t\t<DataArray type='UInt8' Name='types' "
+        + "NumberOfComponents='1' format='ascii'>\n"
+        + format_data_array(np.full(ncells, 12), np.uint8)
+        + "\n\t\t\t</Cells>\n"
+        + "\t\t</Piece>\n"
+        + "\t</UnstructuredGrid>\n"
+        + "</VTKFile>\n"
+    )
+    return head, tail
+
+
+def write_grid_vtu(case: str, fname: str) -> None:
+    """Write the active cells of the EGRID corner-point grid as hexahedra"""
+    head, tail = format_grid(*read_hexahedra(case))
+    with open(fname, "w", encoding="utf8") as file:
+        file.write(head + tail)
+
+
+def get_partition(centres: NDArray, nparts: int) -> NDArray:
+    """Recursive coordinate bisection of the cells into nparts pieces"""
+    parts = np.zeros(centres.shape[0], dtype=int)
+
+    def bisect(ind: NDArray, first: int, count: int) -> None:
+        if count == 1:
+            parts[ind] = first
+            return
+        left = count // 2
+        axis = np.argmax(np.ptp(centres[ind], axis=0))
+        order = np.argsort(centres[ind, axis], kind="stable")
+        split = ind.size * left // count
+        bisect(ind[order[:split]], first, left)
+        bisect(ind[order[split:]], first + left, count - left)
+
+    bisect(np.arange(centres.shape[0]), 0, nparts)
+    return parts
+
+
+def flow_grid_vtu(flow: str, case: str, dname: str, output: str) -> None:
+    """Use an OPM Flow dry run to generate the vtk grid"""
+    if not os.path.isfile(f"{case}.DATA"):
+        print(f"{case}.DATA does not exist")
+        sys.exit()
+    cwd = os.getcwd()
+    output_abs = os.path.abspath(output)
+    dryrun_deck = ""
+    dryrun_folder = ""
+    dryrun_parent = cwd
+    try:
+        if len(case.split("/")) > 1:
+            os.chdir("/".join(case.split("/")[:-1]))
+        dryrun_parent = os.getcwd()
+        flags, thermal = get_flags()
+        flow_command = shlex.split(flow)
+        dryrun_deck = f"{dname}_DRYRUN_{os.getpid()}.DATA"
+        dryrun_folder = f"plopm_{os.getpid()}"
+        shutil.copyfile(f"{dname}.DATA", dryrun_deck)
+        flags += " --enable-dry-run=1"
+        os.makedirs(dryrun_folder, exist_ok=True)
+        deck_rel = f"../{dryrun_deck}"
+        os.chdir(dryrun_folder)
+        if "SPE11B" in dname or "SPE11C" in dname:
+            run(
+                flow_command + [deck_rel] + shlex.split(flags) + shlex.split(thermal),
+                check=False,
+            )
+        else:
+            run(flow_command + [deck_rel] + shlex.split(flags), check=False)
+        shutil.move(
+            f"{dname}_DRYRUN_{os.getpid()}-00000.vtu",
+            f"{output_abs}/{dname}-GRID.vtu",
         )
+    finally:
+        os.chdir(dryrun_parent)
+        if dryrun_folder:
+            shutil.rmtree(dryrun_folder, ignore_errors=True)
+        if dryrun_deck and os.path.isfile(dryrun_deck):
+            os.remove(dryrun_deck)
+        os.chdir(cwd)
 
 
 def writepvd(
-    save: list, dname: str, restart: list, tnrst: list, output: str, k: int
+    save: list,
+    dname: str,
+    restart: list,
+    tnrst: list,
+    output: str,
+    k: int,
+    ext: str = "vtu",
+    update: bool = False,
 ) -> None:
-    """Generate the pvd file"""
+    """Generate the pvd file, keeping the steps already in it if update"""
     where = save[k] if save[k] else dname
+    datasets = {
+        f"{where}-{int(i):04d}": (str(tnrst[i]), f"{where}-{int(i):04d}.{ext}")
+        for i in restart
+    }
+    if update and os.path.isfile(f"{output}/{where}.pvd"):
+        with open(f"{output}/{where}.pvd", encoding="utf8") as file:
+            for time, fname in re.findall(
+                r"timestep='([^']*)' file='([^']*)'", file.read()
+            ):
+                datasets.setdefault(fname.rsplit(".", 1)[0], (time, fname))
     base_pvd = []
     base_pvd.append(
         "<?xml version='1.0'?>\n"
@@ -142,10 +357,8 @@ def writepvd(
         + "         compressor='vtkZLibDataCompressor'>\n"
         + " <Collection>\n"
     )
-    for i in restart:
-        base_pvd.append(
-            f"   <DataSet timestep='{tnrst[i]}' file='{where}-{int(i):04d}.vtu'/>\n"
-        )
+    for time, fname in sorted(datasets.values(), key=lambda item: float(item[0])):
+        base_pvd.append(f"   <DataSet timestep='{time}' file='{fname}'/>\n")
     base_pvd.append(" </Collection>\n</VTKFile>")
     with open(
         f"{output}/{where}.pvd",
@@ -229,6 +442,51 @@ def format_data_array(quan: NDArray, target_dtype: type) -> str:
     return "\t\t\t\t\t " + " ".join(quan) + "\n\t\t\t\t\t</DataArray>"
 
 
+def get_cell_array(
+    case: str,
+    read: ReadData,
+    var: str,
+    nrst: int,
+    skl: float,
+    vtkformat: str,
+    vtkname: str,
+    mass: list[str],
+    mass_all: list[str],
+    caprock: list[str],
+    stress: float,
+    warning_keys: set[tuple[str, str, str]],
+) -> tuple[str, str, NDArray]:
+    """Get the VTK type, name, and values of the variable at the restart"""
+    unit, quan = get_quantity(
+        case,
+        read,
+        var,
+        nrst,
+        skl,
+        mass,
+        mass_all,
+        caprock,
+        stress,
+        False,
+        "",
+        "",
+        [False],
+    )
+    if vtkformat not in VTK_DTYPES:
+        print(f"Unknown format ({vtkformat}).")
+        sys.exit()
+    target_dtype = VTK_DTYPES[vtkformat]
+    if np.issubdtype(target_dtype, np.integer):
+        check_integer_conversion(quan, var, vtkformat, target_dtype, warning_keys)
+    quan = np.ravel(np.asarray(quan, dtype=target_dtype))
+    # VTK interoperability for Float16 is limited in many readers,
+    # so we emit Float32 while preserving the Float16 values.
+    if vtkformat == "Float16":
+        vtkformat = "Float32"
+        quan = quan.astype(np.float32)
+    return vtkformat, vtkname if vtkname else var + unit, quan
+
+
 def opmtovtk(
     case: str,
     read: ReadData,
@@ -244,7 +502,6 @@ def opmtovtk(
     mass_all: list[str],
     caprock: list[str],
     stress: float,
-    filterss: str,
 ) -> None:
     """Generate the vtks"""
     restart = read.restart
@@ -268,55 +525,264 @@ def opmtovtk(
         bar_ctx = nullcontext()
     with bar_ctx as bar_animation:
         for i in restart:
-            cell_data = [
-                "\t\t\t\t<CellData Scalars='File created by https://github.com/cssr-tools/plopm'>",
-            ]
+            arrays = []
             for n, var in enumerate(vrs):
                 if show_progress:
                     bar_animation()
-                unit, quan = get_quantity(
-                    case,
-                    read,
-                    var,
-                    i,
-                    float(skl[n]),
-                    mass,
-                    mass_all,
-                    caprock,
-                    stress,
-                    filterss,
-                    False,
-                    "",
-                    "",
-                    [False],
+                arrays.append(
+                    get_cell_array(
+                        case,
+                        read,
+                        var,
+                        i,
+                        float(skl[n]),
+                        vtkformat_list[n],
+                        vtknames[n],
+                        mass,
+                        mass_all,
+                        caprock,
+                        stress,
+                        warning_keys,
+                    )
                 )
+            write_piece(
+                f"{output}/{where}-{int(i):04d}.vtu",
+                "".join(base_vtk[:4]),
+                "".join(base_vtk[4:]),
+                arrays,
+            )
+
+
+def write_piece(
+    fname: str, head: str, tail: str, arrays: list[tuple[str, str, NDArray]]
+) -> None:
+    """Write a vtu with the given cell data"""
+    cell_data = [
+        "\t\t\t\t<CellData Scalars='File created by https://github.com/cssr-tools/plopm'>",
+    ]
+    for vtkformat, name, quan in arrays:
+        cell_data.append(
+            f"\n\t\t\t\t\t<DataArray type='{vtkformat}' Name='{name}' "
+            + "NumberOfComponents='1' format='ascii'>\n"
+        )
+        cell_data.append(format_data_array(quan, quan.dtype.type))
+    cell_data.append("\n\t\t\t\t</CellData>\n")
+    with open(fname, "w", encoding="utf8") as file:
+        file.write(head + "".join(cell_data) + tail)
+
+
+def set_piece_grids(grids: list[tuple[str, str]]) -> None:
+    """Keep the ascii geometry of the pieces in the worker processes"""
+    PIECE_GRIDS[:] = grids
+
 
-                vtkformat = vtkformat_list[n]
-                if vtkformat not in VTK_DTYPES:
-                    print(f"Unknown format ({vtkformat}).")
-                    sys.exit()
-                target_dtype = VTK_DTYPES[vtkformat]
-                if np.issubdtype(target_dtype, np.integer):
-                    check_integer_conversion(
-                        quan, var, vtkformat, target_dtype, warning_keys
+def write_part(fname: str, part: int, arrays: list[tuple[str, str, NDArray]]) -> None:
+    """Write a vtu of the piece with the geometry sent once to the worker"""
+    write_piece(fname, *PIECE_GRIDS[part], arrays)
+
+
+def write_pvtu(
+    case: str,
+    read: ReadData,
+    output: str,
+    dname: str,
+    save: list,
+    vrs: list,
+    vtkformat_list: list,
+    vtknames: list,
+    k: int,
+    skl: list[str],
+    mass: list[str],
+    mass_all: list[str],
+    caprock: list[str],
+    stress: float,
+    nparts: int,
+) -> None:
+    """Split the grid in pieces written in parallel and collected in .pvtu"""
+    if not os.path.isfile(f"{case}.EGRID"):
+        print(f"'-vtkparts' requires {case}.EGRID")
+        sys.exit()
+    restart = read.restart
+    points, connectivity = read_hexahedra(case)
+    parts = get_partition(points[connectivity].mean(axis=1), nparts)
+    cells, grids = [], []
+    for part in range(nparts):
+        cells.append(np.flatnonzero(parts == part))
+        used, local = np.unique(connectivity[cells[-1]], return_inverse=True)
+        grids.append(format_grid(points[used], local.reshape(-1, 8)))
+    warning_keys: set[tuple[str, str, str]] = set()
+    where = save[k] if save[k] else dname
+    show_progress = sys.stdout.isatty()
+    if show_progress:
+        bar_ctx = alive_bar(len(restart) * len(vrs), bar="fish")
+    else:
+        bar_ctx = nullcontext()
+    with (
+        bar_ctx as bar_animation,
+        ProcessPoolExecutor(
+            min(nparts, os.cpu_count() or 1),
+            initializer=set_piece_grids,
+            initargs=(grids,),
+        ) as executor,
+    ):
+        pending: list[Future] = []
+        for i in restart:
+            arrays = []
+            for n, var in enumerate(vrs):
+                if show_progress:
+                    bar_animation()
+                arrays.append(
+                    get_cell_array(
+                        case,
+                        read,
+                        var,
+                        i,
+                        float(skl[n]),
+                        vtkformat_list[n],
+                        vtknames[n],
+                        mass,
+                        mass_all,
+                        caprock,
+                        stress,
+                        warning_keys,
                     )
-                # VTK XML interoperability for Float16 is limited in many readers,
-                # so we emit Float32 in the DataArray type while preserving values.
-                if vtkformat == "Float16":
-                    vtkformat = "Float32"
-                cell_data.append(
-                    f"\n\t\t\t\t\t<DataArray type='{vtkformat}' Name="
-                    + f"'{vtknames[n] if vtknames[n] else var+unit}' "
-                    + "NumberOfComponents='1' format='ascii'>\n"
                 )
-                cell_data.append(format_data_array(quan, target_dtype))
-            cell_data.append("\n\t\t\t\t</CellData>\n")
+            for future in pending:
+                future.result()
+            pending = [
+                executor.submit(
+                    write_part,
+                    f"{output}/{where}-{int(i):04d}_{part}.vtu",
+                    part,
+                    [(fmt, name, quan[cells[part]]) for fmt, name, quan in arrays],
+                )
+                for part in range(nparts)
+            ]
+            pcell_data = "".join(
+                f"\t\t\t<PDataArray type='{fmt}' Name='{name}' "
+                + "NumberOfComponents='1'/>\n"
+                for fmt, name, _ in arrays
+            )
+            pieces = "".join(
+                f"\t\t<Piece Source='{where}-{int(i):04d}_{part}.vtu'/>\n"
+                for part in range(nparts)
+            )
             with open(
-                f"{output}/{where}-{int(i):04d}.vtu",
-                "w",
-                encoding="utf8",
+                f"{output}/{where}-{int(i):04d}.pvtu", "w", encoding="utf8"
             ) as file:
-                file.write("".join(base_vtk[:4] + cell_data + base_vtk[4:]))
+                file.write(
+                    "<?xml version='1.0'?>\n"
+                    + "<VTKFile type='PUnstructuredGrid' version='0.1' "
+                    + "byte_order='LittleEndian'>\n"
+                    + "\t<PUnstructuredGrid GhostLevel='0'>\n"
+                    + "\t\t<PCellData>\n"
+                    + pcell_data
+                    + "\t\t</PCellData>\n"
+                    + "\t\t<PPoints>\n"
+                    + "\t\t\t<PDataArray type='Float64' Name='Coordinates' "
+                    + "NumberOfComponents='3'/>\n"
+                    + "\t\t</PPoints>\n"
+                    + pieces
+                    + "\t</PUnstructuredGrid>\n"
+                    + "</VTKFile>\n"
+                )
+        for future in pending:
+            future.result()
+
+
+def write_vtkhdf(
+    case: str,
+    read: ReadData,
+    output: str,
+    dname: str,
+    save: list,
+    vrs: list,
+    vtkformat_list: list,
+    vtknames: list,
+    k: int,
+    skl: list[str],
+    mass: list[str],
+    mass_all: list[str],
+    caprock: list[str],
+    stress: float,
+) -> None:
+    """Write the geometry once and append the cell data of each restart"""
+    try:
+        import h5py  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        print("'-vtkfile vtkhdf' requires h5py, install it with 'pip install h5py'.")
+        sys.exit()
+    if not os.path.isfile(f"{case}.EGRID"):
+        print(f"'-vtkfile vtkhdf' requires {case}.EGRID")
+        sys.exit()
+    restart = read.restart
+    points, connectivity = read_hexahedra(case)
+    ncells = connectivity.shape[0]
+    warning_keys: set[tuple[str, str, str]] = set()
+    where = save[k] if save[k] else dname
+    with h5py.File(f"{output}/{where}.vtkhdf", "w") as file:
+        root = file.create_group("VTKHDF")
+        root.attrs["Version"] = (2, 0)
+        root.attrs["Type"] = np.bytes_("UnstructuredGrid")
+        root["NumberOfPoints"] = np.array([points.shape[0]], dtype=np.int64)
+        root["NumberOfCells"] = np.array([ncells], dtype=np.int64)
+        root["NumberOfConnectivityIds"] = np.array([8 * ncells], dtype=np.int64)
+        root["Points"] = points
+        root["Connectivity"] = connectivity.ravel().astype(np.int64)
+        root["Offsets"] = 8 * np.arange(ncells + 1, dtype=np.int64)
+        root["Types"] = np.full(ncells, 12, dtype=np.uint8)
+        cell_data = root.create_group("CellData")
+        steps = root.create_group("Steps")
+        steps.attrs["NSteps"] = len(restart)
+        steps["Values"] = np.array([read.tnrst[i] for i in restart], dtype=float)
+        steps["NumberOfParts"] = np.ones(len(restart), dtype=np.int64)
+        for name in ["PartOffsets", "PointOffsets"]:
+            steps[name] = np.zeros(len(restart), dtype=np.int64)
+        for name in ["CellOffsets", "ConnectivityIdOffsets"]:
+            steps[name] = np.zeros((len(restart), 1), dtype=np.int64)
+        steps.create_group("PointDataOffsets")
+        offsets = steps.create_group("CellDataOffsets")
+        show_progress = sys.stdout.isatty()
+        if show_progress:
+            bar_ctx = alive_bar(len(restart) * len(vrs), bar="fish")
+        else:
+            bar_ctx = nullcontext()
+        with bar_ctx as bar_animation:
+            for i in restart:
+                for n, var in enumerate(vrs):
+                    if show_progress:
+                        bar_animation()
+                    _, name, quan = get_cell_array(
+                        case,
+                        read,
+                        var,
+                        i,
+                        float(skl[n]),
+                        vtkformat_list[n],
+                        vtknames[n],
+                        mass,
+                        mass_all,
+                        caprock,
+                        stress,
+                        warning_keys,
+                    )
+                    # A slash in the unit would create a nested HDF5 group
+                    name = name.replace("/", "_")
+                    if name not in cell_data:
+                        cell_data.create_dataset(
+                            name,
+                            shape=(0,),
+                            maxshape=(None,),
+                            chunks=(max(quan.size, 1),),
+                            dtype=quan.dtype,
+                        )
+                        offsets[name] = quan.size * np.arange(
+                            len(restart), dtype=np.int64
+                        )
+                    values = cell_data[name]
+                    values.resize((values.shape[0] + quan.size,))
+                    values[-quan.size :] = quan
+                file.flush()
 
 
 def make_dry_deck(dname: str) -> None:
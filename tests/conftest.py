@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Fixtures shared by the tests"""
+
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+from opm.io.ecl import EclOutput, ERst, eclArrType
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def copy_reference(path: Path, steps: list[int]) -> None:
+    """Copy SPE11B keeping only the given report steps in the UNRST"""
+    for ext in ["DATA", "EGRID", "INIT"]:
+        shutil.copyfile(mainpth / "examples" / f"SPE11B.{ext}", path / f"REF.{ext}")
+    unrst = ERst(str(mainpth / "examples" / "SPE11B.UNRST"))
+    out = EclOutput(str(path / "REF.UNRST"))
+    for seqnum, step in enumerate(steps):
+        for name, arr_type, _ in unrst.arrays(step):
+            if arr_type == eclArrType.MESS:
+                out.write_message(name)
+            elif name == "SEQNUM":
+                out.write(name, np.array([seqnum], dtype=np.int32))
+            else:
+                out.write(name, unrst[name, step])
+
+
+@pytest.fixture(name="write_reference")
+def fixture_write_reference() -> Callable[[Path, list[int]], None]:
+    """Write REF from SPE11B with the given report steps in the UNRST"""
+    return copy_reference
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the in-memory Python API"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from opm.io.ecl import ERst as OpmRestart
+from opm.io.ecl import ESmry as OpmSummary
+
+from plopm.api import Session
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_session(tmp_path):
+    """See examples/SPE11B"""
+    deck = str(mainpth / "examples" / "SPE11B")
+    unrst = OpmRestart(f"{deck}.UNRST")
+    session = Session(deck)
+    assert session.restarts() == [0, 1, 2, 3, 4, 5]
+    assert np.allclose(session.times(), [0, 1825, 3650, 5475, 7300, 9125])
+    assert np.allclose(session.values("pressure", 3), unrst["PRESSURE", 3])
+    pressure = session.slice("pressure", 5)
+    assert pressure.shape == (58, 83)
+    active = pressure[~np.isnan(pressure)]
+    assert np.allclose(np.sort(active), np.sort(unrst["PRESSURE", 5]))
+    assert session.slice("fipnum", 0, ",,1:58").shape == (1, 83)
+    assert np.allclose(
+        session.series("sgas", (10, 1, 1)),
+        [unrst["SGAS", nrst][9] for nrst in range(6)],
+    )
+    time, fgip = session.summary("fgip")
+    assert np.allclose(fgip, OpmSummary(f"{deck}.SMSPEC")["FGIP"])
+    assert time[-1] == 9125
+    for options in [["-v", "sgas", "-r", "5"], ["-v", "fgip"]]:
+        figures = session.figures("-o", str(tmp_path), *options)
+        assert len(figures) == 1 and isinstance(figures[0], Figure)
+    assert not list(tmp_path.iterdir())
+
+
+def test_session_modes(tmp_path):
+    """The figures go through the same checks and modes as the executable"""
+    session = Session(str(mainpth / "examples" / "SPE11B"), "-o", str(tmp_path))
+    with pytest.raises(SystemExit):
+        session.figures("-v", "sgas", "-r", "99")
+    figures = session.figures("-v", "pressure", "-regions", "fipnum")
+    assert len(figures) == 1
+    assert figures[0].axes[0].get_xlabel().startswith("Time")
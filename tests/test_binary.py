@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the csv outputs as binary columns"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plopm.core.plopm import main
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_npz(tmp_path):
+    """See examples/SPE11B"""
+    deck = str(mainpth / "examples" / "SPE11B")
+    for mode in ["csv", "npz"]:
+        main(["-i", deck, "-v", "sgas", "-m", mode, "-o", str(tmp_path)])
+    text = np.loadtxt(tmp_path / "spe11b_sgas_i,1,k_t5.csv")
+    data = np.load(tmp_path / "spe11b_sgas_i,1,k_t5.npz")
+    assert data["value"].shape == data["x"].shape == (58, 83)
+    assert np.array_equal(text, data["value"][~np.isnan(data["value"])])
+    assert np.all(np.diff(data["x"], axis=1) > 0)
+    assert data["time"] == 9125 and str(data["variable"]) == "sgas"
+    main(["-i", deck, "-v", "fgip", "-m", "npz", "-o", str(tmp_path)])
+    data = np.load(tmp_path / "spe11b_fgip.npz")
+    assert data["time"].size == data["value"].size
+    assert data["time"][-1] == 9125
+
+
+def test_feather(tmp_path):
+    """See examples/SPE11B"""
+    feather = pytest.importorskip("pyarrow.feather")
+    deck = str(mainpth / "examples" / "SPE11B")
+    main(["-i", deck, "-v", "sgas", "-m", "feather", "-o", str(tmp_path)])
+    table = feather.read_table(tmp_path / "spe11b_sgas_i,1,k_t5.feather")
+    assert table.column_names == ["x", "y", "value"]
+    assert table.schema.metadata[b"shape"] == b"[58, 83]"
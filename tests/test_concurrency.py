@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the queries from several threads sharing the readers"""
+
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from plopm.api import Session, parse_options
+from plopm.utils.initialization import ini_summary
+from plopm.utils.write_oned import make_plots
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_concurrency():
+    """See examples/SPE11B"""
+    session = Session(str(mainpth / "examples" / "SPE11B"))
+    read = session.read()
+    porv = read.porv.copy()
+    queries = [
+        (var, restart, slide)
+        for var in ["pressure", "sgas", "porv", "pressure - 0pressure"]
+        for restart in session.restarts()
+        for slide in [",1,", ",:,", ",,1"]
+    ]
+    for var, _, slide in queries:
+        session.config("-v", var, "-s", slide)
+    slides = {key: copy.deepcopy(cfg.slide) for key, cfg in session.configs.items()}
+    serial = [session.slice(*query) for query in queries]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        threaded = list(executor.map(lambda query: session.slice(*query), queries))
+    for quan, quat in zip(serial, threaded):
+        assert np.array_equal(quan, quat, equal_nan=True)
+    assert np.array_equal(
+        session.slice("sgas", 5, ",:,"),
+        serial[queries.index(("sgas", 5, ",:,"))],
+        equal_nan=True,
+    )
+    assert np.array_equal(read.porv, porv)
+    for key, slide in slides.items():
+        assert session.configs[key].slide == slide
+
+
+def test_make_plots():
+    """The summary plots leave the configuration unchanged"""
+    cfg = parse_options(str(mainpth / "examples" / "SPE11B"), ["-v", "fgip,fgir"])
+    ini_summary(cfg)
+    cfg.figures = []
+    names, lw = copy.deepcopy(cfg.names), copy.deepcopy(cfg.lw)
+    make_plots(cfg)
+    assert cfg.figures
+    assert cfg.names == names
+    assert cfg.lw == lw
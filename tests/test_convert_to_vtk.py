@@ -3,9 +3,17 @@
 
 """Test the generation of vtks from the restart files"""
 
+import shutil
 from pathlib import Path
 
+import numpy as np
+import pytest
+from opm.io.ecl import EclFile as OpmFile
+from opm.io.ecl import EGrid as OpmGrid
+from opm.io.ecl import ERst as OpmRestart
+
 from plopm.core.plopm import main
+from plopm.utils.write_vtk import get_hexahedra, get_partition
 
 mainpth: Path = Path(__file__).parents[1]
 
@@ -28,3 +36,106 @@ def test_convert_to_vtk(tmp_path):
     )
     for file in ["-GRID.vtu", "-0005.vtu", ".pvd"]:
         assert (tmp_path / f"SPE11B{file}").exists()
+
+
+def test_egrid_hexahedra():
+    """The vtk hexahedra match the corner points of the active cells"""
+    for deck in [
+        mainpth / "examples" / "SPE11B",
+        mainpth / "tests" / "data" / "3dbox" / "3DBOX",
+    ]:
+        egrid = OpmFile(f"{deck}.EGRID")
+        nx, ny, nz = egrid["GRIDHEAD"][1:4]
+        points, connectivity = get_hexahedra(
+            np.array(egrid["COORD"], dtype=float),
+            np.array(egrid["ZCORN"], dtype=float),
+            np.array(egrid["ACTNUM"]),
+            nx,
+            ny,
+            nz,
+        )
+        grid = OpmGrid(f"{deck}.EGRID")
+        assert connectivity.shape == (grid.active_cells, 8)
+        for ind in [0, grid.active_cells // 2, grid.active_cells - 1]:
+            xyz = np.column_stack(grid.xyz_from_active_index(ind))
+            assert np.allclose(points[connectivity[ind]], xyz[[0, 1, 3, 2, 4, 5, 7, 6]])
+
+
+def test_convert_to_vtkhdf(tmp_path):
+    """The geometry is stored once and each restart is appended"""
+    h5py = pytest.importorskip("h5py")
+    main(
+        [
+            "-v",
+            "pressure,fipnum",
+            "-vtkformat",
+            "Float32,UInt16",
+            "-o",
+            str(tmp_path),
+            "-i",
+            str(mainpth / "examples" / "SPE11B"),
+            "-m",
+            "vtk",
+            "-vtkfile",
+            "vtkhdf",
+            "-r",
+            "0,3,5",
+        ]
+    )
+    unrst = OpmRestart(str(mainpth / "examples" / "SPE11B.UNRST"))
+    with h5py.File(tmp_path / "SPE11B.vtkhdf") as file:
+        root = file["VTKHDF"]
+        ncells = root["NumberOfCells"][0]
+        assert root["Connectivity"].size == 8 * ncells
+        assert np.allclose(root["Steps/Values"][:], [0, 5475, 9125])
+        assert list(root["Steps/CellDataOffsets/pressure [bar]"][:]) == [
+            0,
+            ncells,
+            2 * ncells,
+        ]
+        assert root["CellData/fipnum [-]"].dtype == np.uint16
+        assert np.allclose(
+            root["CellData/pressure [bar]"][ncells : 2 * ncells],
+            unrst["PRESSURE", 3],
+        )
+
+
+def test_convert_to_pvtu(tmp_path):
+    """The pieces of the partitioned output cover all active cells once"""
+    main(
+        [
+            "-v",
+            "temp",
+            "-o",
+            str(tmp_path),
+            "-i",
+            str(mainpth / "examples" / "SPE11B"),
+            "-m",
+            "vtk",
+            "-vtkparts",
+            "3",
+            "-r",
+            "0,5",
+        ]
+    )
+    assert "SPE11B-0005.pvtu" in (tmp_path / "SPE11B.pvd").read_text()
+    pvtu = (tmp_path / "SPE11B-0005.pvtu").read_text()
+    ncells = 0
+    for part in range(3):
+        assert f"Source='SPE11B-0005_{part}.vtu'" in pvtu
+        piece = (tmp_path / f"SPE11B-0005_{part}.vtu").read_text()
+        ncells += int(piece.split("NumberOfCells='")[1].split("'")[0])
+    assert ncells == 4812
+    (tmp_path / "nogrid").mkdir()
+    for ext in ["INIT", "UNRST"]:
+        shutil.copy(
+            mainpth / "examples" / f"SPE11B.{ext}", tmp_path / "nogrid" / f"B.{ext}"
+        )
+    for options in [
+        ["-i", str(tmp_path / "nogrid" / "B")],
+        ["-i", str(mainpth / "examples" / "SPE11B"), "-vtkgrid", "flow"],
+    ]:
+        with pytest.raises(SystemExit):
+            main([*options, "-m", "vtk", "-vtkparts", "2", "-o", str(tmp_path)])
+    parts = get_partition(np.random.default_rng(0).random((1000, 3)), 3)
+    assert sorted(np.bincount(parts)) == [333, 333, 334]
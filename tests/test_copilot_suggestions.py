@@ -346,9 +346,9 @@ def test_readers_direct_utility_functions():
     assert get_unit("disperc") == " [m]"
     assert get_unit("rpr") == " [bar]"
     assert get_unit("fgit") == " [sm$^3$]"
-    assert get_indices("index_i", 2, 2, 2) == [1, 2, 1, 2, 1, 2, 1, 2]
-    assert get_indices("index_j", 2, 2, 2) == [1, 1, 2, 2, 1, 1, 2, 2]
-    assert get_indices("index_k", 2, 2, 2) == [1, 1, 1, 1, 2, 2, 2, 2]
+    assert get_indices("index_i", 2, 2, 2).tolist() == [1, 2, 1, 2, 1, 2, 1, 2]
+    assert get_indices("index_j", 2, 2, 2).tolist() == [1, 1, 2, 2, 1, 1, 2, 2]
+    assert get_indices("index_k", 2, 2, 2).tolist() == [1, 1, 1, 1, 2, 2, 2, 2]
 
 
 def test_readers_error_branches():
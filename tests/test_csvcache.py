@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the cached csv columns"""
+
+import os
+
+import numpy as np
+
+from plopm.utils import csvcache
+from plopm.utils.csvcache import SIDECAR, load_columns, preload_columns
+
+
+def test_csvcache(tmp_path, monkeypatch):
+    """Same columns as genfromtxt, parsing each file once"""
+    values = np.random.default_rng(0).random((50, 4))
+    fnames = []
+    for i in range(3):
+        fnames.append(str(tmp_path / f"map{i}.csv"))
+        np.savetxt(fnames[-1], values + i, delimiter=", ", header="x,y,a,b")
+    full = np.genfromtxt(fnames[0], delimiter=",", skip_header=1)
+    assert np.array_equal(load_columns(fnames[0], [3, 0]), full[:, [3, 0]])
+    assert os.path.isfile(f"{fnames[0]}.{SIDECAR}")
+    monkeypatch.setattr(csvcache, "parse_columns", None)
+    assert np.array_equal(load_columns(fnames[0], [0]), full[:, [0]])
+    monkeypatch.undo()
+    monkeypatch.setattr(csvcache, "WORKERS", 2)
+    preload_columns(fnames, [2])
+    assert csvcache.sidecar_columns(fnames[2]) == {2}
+    with open(fnames[1], "a", encoding="utf8") as file:
+        file.write("1,2,,4\n")
+    assert csvcache.sidecar_columns(fnames[1]) == set()
+    quan = load_columns(fnames[1], [2])[:, 0]
+    assert quan.size == 51 and np.isnan(quan[-1])
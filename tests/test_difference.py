@@ -5,6 +5,8 @@
 
 from pathlib import Path
 
+import numpy as np
+
 from plopm.core.plopm import main
 
 mainpth: Path = Path(__file__).parents[1]
@@ -27,3 +29,78 @@ def test_difference(tmp_path):
         ]
     )
     assert (tmp_path / "difference.png").exists()
+
+
+def test_difference_time_alignment(tmp_path, write_reference):
+    """Pair the input steps with a reference with fewer steps by time"""
+    write_reference(tmp_path, [0, 2, 4])
+    for restart in ["2", "3", "4"]:
+        main(
+            [
+                "-o",
+                str(tmp_path),
+                "-i",
+                str(mainpth / "examples" / "SPE11B"),
+                "-v",
+                "pressure",
+                "-r",
+                restart,
+                "-m",
+                "csv",
+                "-save",
+                f"pressure{restart}",
+            ]
+        )
+    pres = {
+        restart: np.loadtxt(tmp_path / f"pressure{restart}.csv")
+        for restart in ["2", "3", "4"]
+    }
+    for mode, restart, expected in [
+        ("nearest", "4", np.zeros_like(pres["4"])),
+        ("nearest", "3", pres["3"] - pres["2"]),
+        ("interp", "3", pres["3"] - 0.5 * (pres["2"] + pres["4"])),
+    ]:
+        main(
+            [
+                "-o",
+                str(tmp_path),
+                "-i",
+                str(mainpth / "examples" / "SPE11B"),
+                "-v",
+                "pressure",
+                "-r",
+                restart,
+                "-m",
+                "csv",
+                "-diff",
+                str(tmp_path / "REF"),
+                "-diffmode",
+                mode,
+                "-save",
+                f"{mode}{restart}",
+            ]
+        )
+        assert np.allclose(np.loadtxt(tmp_path / f"{mode}{restart}.csv"), expected)
+
+
+def test_difference_several_inputs(tmp_path, write_reference):
+    """Compare two inputs with different number of steps against one reference"""
+    write_reference(tmp_path, [0, 2, 4])
+    main(
+        [
+            "-o",
+            str(tmp_path),
+            "-i",
+            f"{mainpth / 'examples' / 'SPE11B'} {tmp_path / 'REF'}",
+            "-v",
+            "pressure",
+            "-m",
+            "gif",
+            "-diff",
+            str(tmp_path / "REF"),
+            "-save",
+            "difference",
+        ]
+    )
+    assert (tmp_path / "difference_spe11b.gif").exists()
+    assert (tmp_path / "difference_ref.gif").exists()
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the follow mode"""
+
+import os
+
+from plopm.core.plopm import main
+from plopm.utils import follow
+
+
+def test_follow(tmp_path, write_reference, monkeypatch):
+    """The new report steps are written while the restart file grows"""
+    output = tmp_path / "output"
+    output.mkdir()
+    write_reference(tmp_path, [0, 1, 2])
+    static = {ext: (tmp_path / f"REF.{ext}").stat() for ext in ["EGRID", "INIT"]}
+    deck_sizes = follow.deck_sizes
+    simulated = []
+
+    def grow_after_first_update(names: list[str]) -> dict:
+        """The simulation writes two report steps after the first update"""
+        if (output / "REF.pvd").exists() and not simulated:
+            write_reference(tmp_path, [0, 1, 2, 3, 4])
+            for ext, stat in static.items():
+                os.utime(
+                    tmp_path / f"REF.{ext}", ns=(stat.st_atime_ns, stat.st_mtime_ns)
+                )
+            simulated.append(True)
+        return deck_sizes(names)
+
+    monkeypatch.setattr(follow, "deck_sizes", grow_after_first_update)
+    main(
+        [
+            "-i",
+            str(tmp_path / "REF"),
+            "-v",
+            "pressure",
+            "-m",
+            "vtk",
+            "-o",
+            str(output),
+            "-follow",
+            "0.05,0.5",
+        ]
+    )
+    assert simulated
+    pvd = (output / "REF.pvd").read_text()
+    assert "REF-0002.vtu" in pvd and "REF-0004.vtu" in pvd
+    assert not (output / "REF-0003.vtu").exists()
@@ -5,7 +5,13 @@
 
 from pathlib import Path
 
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import animation
+from PIL import Image
+
 from plopm.core.plopm import main
+from plopm.utils.write_video import get_gif_writer
 
 mainpth: Path = Path(__file__).parents[1]
 
@@ -37,3 +43,42 @@ def test_gif(tmp_path):
         ]
     )
     assert (tmp_path / "gif.gif").exists()
+
+
+def test_gif_writer(tmp_path):
+    """One palette from the colormap and only the changed region per frame"""
+    fig, axis = plt.subplots(figsize=(4, 3), dpi=50)
+    values = np.zeros((20, 30))
+    image = axis.imshow(values, cmap="viridis", vmin=0, vmax=1)
+
+    def update(t: int) -> None:
+        values[5:8, 10 + t] = 0.1 * t
+        image.set_data(values)
+
+    for lossy in ["0", "64"]:
+        ani = animation.FuncAnimation(fig, update, frames=range(6), interval=100)
+        ani.save(
+            tmp_path / f"lossy{lossy}.gif", writer=get_gif_writer(100, 1, int(lossy))
+        )
+    gif = Image.open(tmp_path / "lossy0.gif")
+    assert gif.n_frames == 6
+    assert gif.info["loop"] == 0
+    gif.seek(3)
+    assert gif.tile[0][1] != (0, 0) + gif.size
+    rgb = np.asarray(gif.convert("RGB"))
+    assert (rgb[0, 0] == 255).all()
+    assert (tmp_path / "lossy64.gif").stat().st_size <= (
+        tmp_path / "lossy0.gif"
+    ).stat().st_size
+
+
+def test_gif_palette_cache():
+    """The colors of the earlier frames stay in the cached lookup"""
+    writer = get_gif_writer(100, 1, 0)
+    writer.colors = np.array([[0, 0, 0], [255, 0, 0], [0, 0, 255]], dtype=np.int32)
+    red, blue, dark = 250, 250 << 16, 10
+    assert list(writer.palette_index(np.array([red, red, dark]))) == [1, 1, 0]
+    assert list(writer.palette_index(np.array([blue]))) == [2]
+    assert list(writer.keys) == [dark, red, blue]
+    assert list(writer.lookup) == [0, 1, 2]
+    assert list(writer.palette_index(np.array([blue, dark, red]))) == [2, 0, 1]
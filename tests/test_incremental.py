@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the incremental export"""
+
+import os
+from pathlib import Path
+
+from plopm.core.plopm import main
+
+
+def get_mtimes(path: Path) -> dict:
+    """Modification times of the files in the folder"""
+    return {file.name: file.stat().st_mtime_ns for file in path.iterdir()}
+
+
+def test_incremental_vtk(tmp_path, write_reference):
+    """Only the new report steps are written when the simulation advances"""
+    output = tmp_path / "output"
+    output.mkdir()
+    write_reference(tmp_path, [0, 1, 2, 3])
+    static = {ext: (tmp_path / f"REF.{ext}").stat() for ext in ["EGRID", "INIT"]}
+    args = ["-i", str(tmp_path / "REF"), "-v", "pressure", "-m", "vtk"]
+    args += ["-o", str(output), "-incremental", "1"]
+    main(args + ["-r", "0:3"])
+    mtimes = get_mtimes(output)
+    main(args + ["-r", "0:3"])
+    assert get_mtimes(output)["REF-0003.vtu"] == mtimes["REF-0003.vtu"]
+    write_reference(tmp_path, [0, 1, 2, 3, 4, 5])
+    for ext, stat in static.items():
+        os.utime(tmp_path / f"REF.{ext}", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    main(args + ["-r", "4:5"])
+    written = [
+        name for name, mtime in get_mtimes(output).items() if mtime != mtimes.get(name)
+    ]
+    assert sorted(written) == [
+        "REF-0004.vtu",
+        "REF-0005.vtu",
+        "REF.pvd",
+        "plopm-manifest.json",
+    ]
+    pvd = (output / "REF.pvd").read_text()
+    assert all(f"REF-000{i}.vtu" in pvd for i in range(6))
+
+
+def test_incremental_png(tmp_path, write_reference):
+    """Changing an option rewrites the maps"""
+    write_reference(tmp_path, [0, 1])
+    args = ["-i", str(tmp_path / "REF"), "-v", "pressure", "-r", "0:1"]
+    args += ["-o", str(tmp_path), "-incremental", "1"]
+    main(args)
+    mtimes = get_mtimes(tmp_path)
+    main(args)
+    maps = {name: mtime for name, mtime in mtimes.items() if name.endswith(".png")}
+    assert len(maps) == 2
+    assert maps.items() <= get_mtimes(tmp_path).items()
+    main(args + ["-c", "jet"])
+    assert (
+        get_mtimes(tmp_path)["ref_pressure_i,1,k_t1.png"]
+        != mtimes["ref_pressure_i,1,k_t1.png"]
+    )
+
+
+def test_incremental_csv_input(tmp_path):
+    """Editing the csv input rewrites the map"""
+    values = ["x,y,value", "1,1,1", "3,1,2", "5,1,3", "1,3,4", "3,3,5", "5,3,6"]
+    (tmp_path / "csvmap.csv").write_text("\n".join(values) + "\n", encoding="utf8")
+    args = ["-i", str(tmp_path / "csvmap"), "-csv", "1,2,3", "-v", "value"]
+    args += ["-o", str(tmp_path), "-incremental", "1", "-save", "csvmap"]
+    main(args)
+    mtime = (tmp_path / "csvmap.png").stat().st_mtime_ns
+    main(args)
+    assert (tmp_path / "csvmap.png").stat().st_mtime_ns == mtime
+    values[1] = "1,1,10"
+    (tmp_path / "csvmap.csv").write_text("\n".join(values) + "\n", encoding="utf8")
+    main(args)
+    assert (tmp_path / "csvmap.png").stat().st_mtime_ns != mtime
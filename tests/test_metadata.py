@@ -0,0 +1,49 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the index of the output files"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from opm.io.ecl import EclFile as OpmFile
+from opm.io.ecl import ERst as OpmRestart
+from opm.io.ecl import ESmry as OpmSummary
+
+from plopm.core.plopm import main
+from plopm.utils.metadata import METADATA, load_metadata
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_metadata(tmp_path):
+    """See examples/SPE11B"""
+    for ext in ["INIT", "EGRID", "UNRST", "SMSPEC", "UNSMRY"]:
+        shutil.copy(mainpth / "examples" / f"SPE11B.{ext}", tmp_path)
+    deck = str(tmp_path / "SPE11B")
+    unrst = OpmRestart(f"{deck}.UNRST")
+    size = (tmp_path / "SPE11B.UNRST").stat().st_size
+    data = (tmp_path / "SPE11B.UNRST").read_bytes()
+    (tmp_path / "SPE11B.UNRST").write_bytes(data[: size // 2])
+    meta = load_metadata(deck)
+    assert 0 < len(meta["UNRST"]["steps"]) < len(unrst.report_steps)
+    with open(tmp_path / "SPE11B.UNRST", "ab") as file:
+        file.write(data[size // 2 :])
+    meta = load_metadata(deck)
+    with open(f"{deck}.{METADATA}", encoding="utf8") as file:
+        assert json.load(file) == meta
+    assert meta["UNRST"]["end"] == size
+    assert meta["UNRST"]["steps"] == unrst.report_steps
+    assert meta["UNRST"]["times"] == [
+        unrst["DOUBHEAD", nrst][0] for nrst in unrst.report_steps
+    ]
+    assert meta["UNRST"]["dates"][1] == [2029, 12, 31]
+    assert meta["UNRST"]["counts"]["PRESSURE"] == len(unrst.report_steps)
+    init = OpmFile(f"{deck}.INIT")
+    assert list(meta["INIT"]["arrays"]) == [array[0] for array in init.arrays]
+    assert meta["INIT"]["arrays"]["PORV"] == ["REAL", init["PORV"].size]
+    assert meta["SMSPEC"]["keys"] == OpmSummary(f"{deck}.SMSPEC").keys()
+    with pytest.raises(SystemExit):
+        main(["-i", deck, "-v", "pressure", "-r", "9", "-o", str(tmp_path)])
@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the task graph of the maps"""
+
+import os
+from pathlib import Path
+
+from plopm.core.plopm import load_parser, main, write_outputs
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_plan(tmp_path, capsys):
+    """See examples/SPE11B"""
+    deck = f"{mainpth}/examples/SPE11B"
+    options = ["-i", deck, "-v", "sgas,pressure", "-m", "gif", "-o", str(tmp_path)]
+    main(options + ["-plan", "1"])
+    lines = capsys.readouterr().out.splitlines()
+    nodes = [line.rsplit(" x", 1)[0] for line in lines if line.startswith("  ")]
+    assert len(nodes) == len(set(nodes))
+    assert f"  slide    {deck} sgas restart 5 slide 0 <- 2 x2" in lines
+    assert "  range    pressure <- 6 x1" in lines
+    assert not os.listdir(tmp_path)
+    cfg = write_outputs(load_parser(options))
+    assert sorted(cfg.graph.slides) == sorted(
+        (deck, var, nrst, n, 0, str(cfg.slide[0]))
+        for n, var in enumerate(["sgas", "pressure"])
+        for nrst in range(6)
+    )
+    assert list(cfg.graph.readers) == [(deck, 0)]
+    assert os.path.isfile(tmp_path / "spe11b_sgas.gif")
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the memory of the computed quantities"""
+
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from plopm.api import Session
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def peak_quantity(precision: str, name: str) -> tuple[int, np.ndarray]:
+    """Peak of the traced memory computing the quantity in the last restart"""
+    session = Session(str(mainpth / "examples" / "SPE11B"), "-precision", precision)
+    session.read()
+    session.config("-v", name)
+    tracemalloc.start()
+    quan = session.values(name)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, quan
+
+
+def test_precision():
+    """See examples/SPE11B"""
+    for name in ["permx", "index_k", "co2m", "dism", "pressure - 0pressure"]:
+        peak64, quan64 = peak_quantity("float64", name)
+        peak32, quan32 = peak_quantity("float32", name)
+        assert quan32.dtype == np.float32
+        assert peak32 <= peak64
+        assert peak32 < 8 * quan32.nbytes
+        assert np.allclose(quan32, quan64, rtol=1e-5, atol=1e-12)
+        if quan64.dtype == np.float64:
+            assert peak32 < peak64
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the raster renderer for rectilinear slides"""
+
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from plopm.api import Session
+from plopm.config.config import ConfigPlopm
+from plopm.core.plopm import main
+from plopm.utils.mapping import decimate_slide, get_rectilinear_edges
+
+testpth: Path = Path(__file__).parent
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_raster(tmp_path):
+    """See tests/data/3dbox"""
+    for raster in ["0", "1"]:
+        main(
+            [
+                "-i",
+                str(testpth / "data" / "3dbox" / "3DBOX"),
+                "-v",
+                "pressure",
+                "-s",
+                ",,1",
+                "-raster",
+                raster,
+                "-o",
+                str(tmp_path),
+                "-save",
+                f"raster{raster}",
+            ]
+        )
+    pcolormesh = np.array(Image.open(tmp_path / "raster0.png"), dtype=float)
+    raster = np.array(Image.open(tmp_path / "raster1.png"), dtype=float)
+    assert pcolormesh.shape == raster.shape
+    assert np.abs(pcolormesh - raster).max() < 20
+
+
+def test_rectilinear_edges():
+    """Rectilinear meshes give the edges, rotated ones fall back to pcolormesh"""
+    doubled = np.repeat(np.array([0.0, 1.0, 3.0, 6.0]), 2)[1:-1]
+    xc, yc = np.meshgrid(doubled, doubled[::-1])
+    edges = get_rectilinear_edges(xc, yc, 1e-6, 1e-6)
+    assert edges is not None
+    assert np.allclose(edges[0], [0, 1, 3, 6])
+    assert np.allclose(edges[1], [6, 3, 1, 0])
+    angle = np.pi / 6
+    xr = xc * np.cos(angle) - yc * np.sin(angle)
+    yr = yc * np.cos(angle) + xc * np.sin(angle)
+    assert get_rectilinear_edges(xr, yr, 1e-6, 1e-6) is None
+
+
+def test_lod_decimation():
+    """Aggregate a 4x4 slide to a 2x2 pixel budget using the -how methods"""
+    cfg = ConfigPlopm(dimensions=["2", "2"], dpi=["1"], subfigs=[""])
+    doubled = np.repeat(np.arange(5.0), 2)[1:-1]
+    xc, yc = np.meshgrid(doubled, doubled)
+    quaa = np.full((7, 7), np.nan)
+    quaa[::2, ::2] = np.arange(16.0).reshape(4, 4)
+    quaa[0, 0] = np.nan
+    for how, expected in zip(
+        ["", "min", "max", "sum", "first", "last"],
+        [[3.3333, 4.5], [1, 2], [5, 7], [3.3333, 4.5], [1, 2], [5, 7]],
+    ):
+        cfg.how = [how]
+        coarse, xcc, ycc, mx, my = decimate_slide(
+            cfg, "sgas", quaa.ravel(), xc, yc, 7, 7, 0
+        )
+        assert (mx, my) == (3, 3)
+        assert np.allclose(coarse.reshape(3, 3)[0, ::2], expected, atol=1e-4)
+    assert np.allclose(xcc[0], [0, 2, 2, 4])
+    assert np.allclose(ycc[:, 0], [0, 2, 2, 4])
+
+
+def test_lod_color_range(tmp_path):
+    """The colorbar range of the aggregated maps does not depend on -dpi"""
+    session = Session(str(mainpth / "examples" / "SPE11B"))
+    for var in ["porv", "sgas"]:
+        ranges = []
+        for dpi in ["5", "300"]:
+            figure = session.figures(
+                "-v", var, "-r", "5", "-d", "4,3", "-dpi", dpi, "-o", str(tmp_path)
+            )[0]
+            ranges.append(figure.axes[0].get_children()[0].get_clim())
+        assert np.allclose(ranges[0], ranges[1])
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the region aggregation"""
+
+from pathlib import Path
+
+import numpy as np
+from opm.io.ecl import EclFile as OpmFile
+from opm.io.ecl import ERst as OpmRestart
+
+from plopm.core.plopm import main
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_regions(tmp_path):
+    """See examples/SPE11B"""
+    deck = mainpth / "examples" / "SPE11B"
+    main(["-i", str(deck), "-v", "pressure", "-regions", "fipnum", "-o", str(tmp_path)])
+    assert (tmp_path / "spe11b_pressure_fipnum.png").exists()
+    fipnum = np.array(OpmFile(f"{deck}.INIT")["FIPNUM"])
+    unrst = OpmRestart(f"{deck}.UNRST")
+    for stat in ["sum", "mean", "pvmean"]:
+        values = np.loadtxt(
+            tmp_path / f"spe11b_pressure_fipnum_{stat}.csv",
+            delimiter=",",
+            skiprows=1,
+        )
+        assert values.shape == (6, 1 + np.unique(fipnum).size)
+        assert np.allclose(values[:, 0], [0, 1825, 3650, 5475, 7300, 9125])
+    pressure = np.array(unrst["PRESSURE", 3])
+    assert np.isclose(values[3, 0], 5475)
+    mean = np.loadtxt(
+        tmp_path / "spe11b_pressure_fipnum_mean.csv", delimiter=",", skiprows=1
+    )
+    assert np.isclose(mean[3, 2], pressure[fipnum == 2].mean(), rtol=1e-6)
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the decoding of the saturation function tables"""
+
+from pathlib import Path
+
+import numpy as np
+
+from plopm.config.config import ConfigPlopm
+from plopm.core.plopm import main
+from plopm.utils import satfunc
+
+boxpth: Path = Path(__file__).parent / "data" / "3dbox" / "3DBOX"
+
+
+def test_satfunc(tmp_path, monkeypatch):
+    """See tests/data/3dbox/3DBOX.DATA"""
+    cfg = ConfigPlopm(vrs=["krow"])
+    tables = satfunc.get_tables(cfg, str(boxpth))
+    assert tables.regions == [1, 2, 3]
+    assert tables.imbibition == {1: 4, 2: 5, 3: 6}
+    assert len(tables.swfn) == len(tables.sgfn) == len(tables.sofn) == 6
+    sat, krow, label = satfunc.get_satfunc(cfg, str(boxpth), "krow4")
+    assert np.allclose(sat, [0.4, 0.6, 0.7, 1.0])
+    assert np.allclose(krow, [1.0, 0.6, 0.4, 0.0])
+    assert label == "s$_w$ [-]"
+    sat, krg, _ = satfunc.get_satfunc(cfg, str(boxpth), "krg1h")
+    assert np.allclose(sat, [0.0, 0.5, 1.0, 1.0, 0.6, 0.2])
+    assert np.allclose(krg, [0.0, 0.3, 1.0, 1.0, 0.2, 0.0])
+    calls = []
+    monkeypatch.setattr(
+        satfunc, "decode_tables", lambda deck: calls.append(deck) or tables
+    )
+    main(["-i", str(boxpth), "-v", "krw*,krg*h", "-o", str(tmp_path), "-save", "all"])
+    assert (tmp_path / "all.png").exists()
+    assert len(calls) == 1
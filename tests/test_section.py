@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the sections along polylines"""
+
+from pathlib import Path
+
+import numpy as np
+
+from plopm.core.plopm import load_parser, main
+from plopm.utils.initialization import check_restarts, ini_cfg, ini_properties
+from plopm.utils.write_twod import get_slide, prepare_maps
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def get_map(deck: str, options: list[str]) -> tuple:
+    """Coordinates and map of the last restart"""
+    cfg = ini_cfg(load_parser(["-i", deck, "-v", "sgas"] + options))
+    check_restarts(cfg)
+    ini_properties(cfg)
+    read, xc, yc, _, _, _, mx, my, _, _ = prepare_maps(cfg, deck, 0)
+    quaa = get_slide(cfg, deck, read, "sgas", read.restart[-1], 0, 0, mx, my)[2]
+    return read, xc, yc, quaa
+
+
+def test_section(tmp_path):
+    """See examples/SPE11B and tests/data/3dbox"""
+    deck = str(mainpth / "examples" / "SPE11B")
+    _, xc, yc, quaa = get_map(deck, ["-section", "0,0.5 8400,0.5"])
+    _, xcs, ycs, quas = get_map(deck, [])
+    assert np.allclose(xc, xcs)
+    assert np.allclose(yc, ycs)
+    assert np.allclose(quaa, quas, equal_nan=True)
+    box = str(mainpth / "tests" / "data" / "3dbox" / "3DBOX")
+    read, xc, _, _ = get_map(box, ["-section", "0,0 3,3 3,0"])
+    assert read.section is not None
+    assert list(read.section.cells[:6]) == [0, 4, 8, 8, 5, 2]
+    assert np.isclose(xc.max(), 3 * 2**0.5 + 3)
+    main(["-i", box, "-v", "pressure", "-section", "0,0 3,3", "-o", str(tmp_path)])
+    assert (tmp_path / "3dbox_pressure_section_t2.png").exists()
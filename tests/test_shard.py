@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the partial statistics of the ensemble shards and their merge"""
+
+from pathlib import Path
+
+import matplotlib.image as mpimg
+import numpy as np
+import pytest
+
+from plopm.core.plopm import main
+from plopm.utils.write_oned import merge_partials
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def partials(values: np.ndarray, names: list[str]) -> dict:
+    """Partial statistics of the given member values (one row per member)"""
+    count = np.sum(~np.isnan(values), axis=0)
+    means = np.nansum(values, axis=0) / count
+    sums = np.nansum(values, axis=1)
+    return {
+        "count_0_0": count,
+        "mean_0_0": means,
+        "m2_0_0": np.nansum((values - means) ** 2, axis=0),
+        "low_0_0": values[np.argmin(sums)],
+        "lowsum_0_0": sums.min(),
+        "lowname_0_0": names[np.argmin(sums)],
+        "high_0_0": values[np.argmax(sums)],
+        "highsum_0_0": sums.max(),
+        "highname_0_0": names[np.argmax(sums)],
+    }
+
+
+def test_merge_partials():
+    """Merged statistics against the ones of all members"""
+    values = np.random.default_rng(0).normal(1e3, 1.0, size=(7, 20))
+    values[2, 5:] = np.nan
+    names = [f"m{n}" for n in range(7)]
+    merged = merge_partials(
+        partials(values[::2], names[::2]), partials(values[1::2], names[1::2])
+    )
+    full = partials(values, names)
+    for key in ["count_0_0", "mean_0_0", "m2_0_0", "low_0_0", "high_0_0"]:
+        assert np.allclose(merged[key], full[key], equal_nan=True)
+    assert merged["lowname_0_0"] == full["lowname_0_0"]
+    assert merged["highname_0_0"] == full["highname_0_0"]
+
+
+def test_shard(tmp_path):
+    """Shards written to one folder per node with their own figure options"""
+    deck = str(mainpth / "examples" / "SPE11B")
+    for i in range(1, 3):
+        main(
+            [
+                "-i",
+                f"{deck} {deck} {deck}",
+                "-v",
+                "tcpu",
+                "-ensemble",
+                "3",
+                "-shard",
+                f"{i}/2",
+                "-o",
+                str(tmp_path / f"node{i}"),
+                "-dpi",
+                f"{100 * i}",
+            ]
+        )
+    main(
+        [
+            "merge",
+            str(tmp_path / "node2" / "ensemble_shard2of2.npz"),
+            str(tmp_path / "node1" / "ensemble_shard1of2.npz"),
+            "-o",
+            str(tmp_path / "merged"),
+        ]
+    )
+    main(
+        [
+            "-i",
+            f"{deck} {deck} {deck}",
+            "-v",
+            "tcpu",
+            "-ensemble",
+            "3",
+            "-o",
+            str(tmp_path / "direct"),
+            "-dpi",
+            "100",
+        ]
+    )
+    assert np.array_equal(
+        mpimg.imread(tmp_path / "merged" / "spe11b_tcpu.png"),
+        mpimg.imread(tmp_path / "direct" / "spe11b_tcpu.png"),
+    )
+    main(
+        [
+            "-i",
+            f"{deck} {deck} {deck}",
+            "-v",
+            "tcpuday",
+            "-ensemble",
+            "3",
+            "-shard",
+            "2/2",
+            "-o",
+            str(tmp_path / "other"),
+        ]
+    )
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "merge",
+                str(tmp_path / "node1" / "ensemble_shard1of2.npz"),
+                str(tmp_path / "other" / "ensemble_shard2of2.npz"),
+            ]
+        )
@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the pairwise similarity of the fields of the members"""
+
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from plopm.core.plopm import main
+from plopm.utils import write_similarity
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_pairwise_metric(monkeypatch):
+    """Chunked Gram terms against the direct computation"""
+    monkeypatch.setattr(write_similarity, "MEMORY", 16 * 5 * 7)
+    fields = 1e5 + np.random.default_rng(0).normal(size=(5, 60))
+    means = fields.mean(axis=1)
+    centered = fields - means[:, None]
+    rmse = np.sqrt(((fields[:, None] - fields[None]) ** 2).mean(axis=2))
+    assert np.allclose(write_similarity.pairwise_metric(centered, means, "rmse"), rmse)
+    corr = write_similarity.pairwise_metric(centered, means, "corr")
+    assert np.allclose(corr, np.corrcoef(fields))
+
+
+def test_similarity(tmp_path):
+    """See examples/SPE11B"""
+    deck = str(mainpth / "examples" / "SPE11B")
+    main(
+        ["-i", f"{deck} {deck}", "-v", "sgas", "-m", "similarity", "-o", str(tmp_path)]
+    )
+    with open(tmp_path / "similarity_sgas.csv", encoding="utf8") as file:
+        rows = list(csv.reader(file, quoting=csv.QUOTE_NONNUMERIC))
+    assert rows[0] == ["member", "spe11b", "spe11b"]
+    assert np.allclose(np.array([row[1:] for row in rows[1:]]), 0)
+    assert (tmp_path / "similarity_sgas.png").exists()
@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the statistics per restart"""
+
+import csv
+from pathlib import Path
+
+import numpy as np
+from opm.io.ecl import EclFile as OpmFile
+from opm.io.ecl import ERst as OpmRestart
+
+from plopm.core.plopm import main
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_stats(tmp_path):
+    """See examples/SPE11B"""
+    deck = mainpth / "examples" / "SPE11B"
+    main(
+        ["-i", str(deck), "-v", "pressure,sgas", "-m", "stats", "-how", "pvmean,p50"]
+        + ["-filter", "fipnum >= 3", "-o", str(tmp_path)]
+    )
+    assert (tmp_path / "stats_spe11b_pressure.png").exists()
+    with open(tmp_path / "stats.csv", encoding="utf8") as file:
+        rows = list(csv.DictReader(file))
+    stats = np.load(tmp_path / "stats.npz")
+    assert len(rows) == stats["time"].size == 12
+    assert list(stats["variable"][:7]) == ["pressure"] * 6 + ["sgas"]
+    fipnum = np.array(OpmFile(f"{deck}.INIT")["FIPNUM"])
+    pressure = np.array(OpmRestart(f"{deck}.UNRST")["PRESSURE", 3])[fipnum >= 3]
+    assert float(rows[3]["time"]) == 5475
+    assert np.isclose(float(rows[3]["max"]), pressure.max())
+    assert np.isclose(stats["p50"][3], np.median(pressure))
+    assert np.isclose(stats["mean"][3], pressure.mean())
@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the maps of several slides from one read"""
+
+from pathlib import Path
+
+import matplotlib.image as mpimg
+import numpy as np
+
+from plopm.core.plopm import main
+from plopm.utils import write_twod
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_sweep(tmp_path, monkeypatch):
+    """See examples/SPE11B"""
+    options = ["-i", str(mainpth / "examples" / "SPE11B"), "-v", "sgas"]
+    main(options + ["-s", ",,1:5:2-each", "-save", "sweep", "-o", str(tmp_path)])
+    main(options + ["-s", ",,3", "-save", "single", "-o", str(tmp_path)])
+    for k in [1, 3, 5]:
+        assert (tmp_path / f"sweep_k{k}.png").exists()
+    assert np.array_equal(
+        mpimg.imread(tmp_path / "sweep_k3.png"), mpimg.imread(tmp_path / "single.png")
+    )
+    monkeypatch.setattr(write_twod, "WORKERS", 2)
+    main(options + ["-s", "1:2-each,,", "-save", "pages", "-o", str(tmp_path)])
+    assert (tmp_path / "pages_i1.png").exists()
+    assert (tmp_path / "pages_i2.png").exists()
@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the variables as dense (time, k, j, i) tensors"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from opm.io.ecl import ERst as OpmRestart
+
+from plopm.core.plopm import main
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+def test_tensor(tmp_path):
+    """See examples/SPE11B"""
+    deck = str(mainpth / "examples" / "SPE11B")
+    main(["-i", deck, "-v", "sgas,poro", "-m", "tensor", "-o", str(tmp_path)])
+    with open(tmp_path / "tensor_spe11b.json", encoding="utf8") as file:
+        meta = json.load(file)
+    assert meta["shape"] == [6, 58, 1, 83]
+    assert meta["times"][-1] == 9125
+    sgas = np.load(tmp_path / meta["variables"]["sgas"]["file"], mmap_mode="r")
+    geometry = np.load(tmp_path / meta["geometry"])
+    active = geometry["ACTNUM"]
+    assert sgas.shape == tuple(meta["shape"])
+    assert np.all(np.isnan(sgas[:, ~active]))
+    assert np.array_equal(sgas[3][active], OpmRestart(f"{deck}.UNRST")["SGAS", 3])
+    poro = np.load(tmp_path / "tensor_spe11b_poro.npy")
+    assert np.array_equal(poro[0], geometry["PORO"], equal_nan=True)
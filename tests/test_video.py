@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the mp4 and webm outputs"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from plopm.core.plopm import main
+
+mainpth: Path = Path(__file__).parents[1]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_video(tmp_path):
+    """See examples/SPE11B"""
+    for mode, crf in zip(["mp4", "webm"], ["", "40"]):
+        main(
+            [
+                "-o",
+                str(tmp_path),
+                "-i",
+                str(mainpth / "examples" / "SPE11B"),
+                "-v",
+                "sgas",
+                "-m",
+                mode,
+                "-crf",
+                crf,
+                "-interval",
+                "250",
+                "-save",
+                f"sgas_{mode}",
+            ]
+        )
+        assert (tmp_path / f"sgas_{mode}.{mode}").stat().st_size > 0
+
+
+def test_video_options_only_for_videos(tmp_path):
+    """The codec options are rejected for the other modes"""
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "-o",
+                str(tmp_path),
+                "-i",
+                str(mainpth / "examples" / "SPE11B"),
+                "-v",
+                "sgas",
+                "-m",
+                "gif",
+                "-vcodec",
+                "libx265",
+            ]
+        )